@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for batched AI prompts.
+
+Documents synthetic Java getters and setters against a local fake provider
+(no network) and reports requests and estimated tokens per function with one
+prompt per function and with several functions packed into one prompt.
+
+Usage:
+    python benchmarks/bench_ai_batching.py --functions 400 --batch-size 8
+"""
+
+import argparse
+import json
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.ai_analyzer import AIAnalyzer
+from code_doc_gen.ai_engine import estimate_tokens
+from code_doc_gen.models import Function, Parameter
+
+
+FIELDS = ['name', 'age', 'email', 'address', 'balance', 'status', 'owner', 'count']
+
+
+class FakeProvider:
+    """Answers single and batched prompts and counts requests and tokens."""
+
+    def __init__(self):
+        self.requests = 0
+        self.tokens = 0
+
+    def __call__(self, prompt: str) -> str:
+        numbers = re.findall(r'### Function (\d+)', prompt)
+        if numbers:
+            response = json.dumps([
+                {"id": int(n), "description": "Accessor for a field", "parameters": [],
+                 "returns": "The field value", "exceptions": []}
+                for n in numbers
+            ])
+        else:
+            response = "/**\n * @brief Accessor for a field\n * @return The field value\n */"
+        self.requests += 1
+        self.tokens += estimate_tokens(prompt) + estimate_tokens(response)
+        return response
+
+
+def make_functions(count: int) -> list:
+    functions = []
+    for i in range(count):
+        field = FIELDS[i % len(FIELDS)]
+        if i % 2:
+            functions.append(Function(
+                name=f"set{field.capitalize()}{i}", return_type='void',
+                parameters=[Parameter(name=field, type='String')],
+                source_code=f"this.{field} = {field};"
+            ))
+        else:
+            functions.append(Function(
+                name=f"get{field.capitalize()}{i}", return_type='String', parameters=[],
+                source_code=f"return this.{field};"
+            ))
+    return functions
+
+
+def run(functions: list, batch_size: int, file_size: int) -> FakeProvider:
+    config = Config()
+    config.config['ai'].update({'enabled': True, 'groq_api_key': 'fake', 'batch_size': batch_size})
+    config.config['cache']['ai']['enabled'] = False
+
+    provider = FakeProvider()
+    analyzer = AIAnalyzer(config)
+    analyzer._get_providers = lambda: [('fake', provider)]
+    analyzer._should_analyze = lambda: True
+
+    # Batches never span files, as in a real run
+    for start in range(0, len(functions), file_size):
+        analyzer.analyze_functions(functions[start:start + file_size], 'java')
+    return provider
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', type=int, default=400, help='Number of synthetic functions')
+    parser.add_argument('--batch-size', type=int, default=8, help='Functions per batched prompt')
+    parser.add_argument('--file-size', type=int, default=20, help='Functions per source file')
+    args = parser.parse_args()
+
+    functions = make_functions(args.functions)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        Config.DEFAULT_CONFIG['cache']['directory'] = cache_dir
+        single = run(functions, 1, args.file_size)
+        batched = run(functions, args.batch_size, args.file_size)
+
+    print(f"functions: {args.functions} ({args.file_size} per file)")
+    for label, provider in (("one prompt per function", single), (f"batches of {args.batch_size}", batched)):
+        print(f"{label:24s} {provider.requests / args.functions:6.3f} requests/function "
+              f"{provider.tokens / args.functions:8.1f} tokens/function")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for shared AI provider clients.
+
+Serves OpenAI-compatible chat completions from a local HTTP/1.1 stand-in and
+compares building a new openai.OpenAI client for every request (as every new
+AIAnalyzer did) with the registry's shared keep-alive client: per-request
+latency and TCP connections opened. Most of a fresh client's cost is building
+its HTTP transport (SSL context and certificate loading), so it is reported
+separately. Against a real provider every saved
+connection also saves a TLS handshake, which this local stand-in does not
+have, so the savings here are a lower bound.
+
+Usage:
+    python benchmarks/bench_ai_clients.py --requests 200
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import openai
+
+from code_doc_gen.ai_clients import ClientRegistry
+
+
+COMPLETION = json.dumps({
+    'id': 'bench', 'object': 'chat.completion', 'created': 0, 'model': 'bench',
+    'choices': [{'index': 0, 'finish_reason': 'stop',
+                 'message': {'role': 'assistant', 'content': 'Returns the value.'}}],
+    'usage': {'prompt_tokens': 10, 'completion_tokens': 4, 'total_tokens': 14},
+}).encode()
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Avoid Nagle/delayed-ACK stalls on kept-alive connections
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        CompletionHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def complete(client) -> None:
+    client.chat.completions.create(
+        model='bench', messages=[{'role': 'user', 'content': 'Describe f.'}], max_tokens=16)
+
+
+def run(label: str, requests: int, get_client) -> None:
+    CompletionHandler.connections = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        complete(get_client())
+    elapsed = time.perf_counter() - start
+    print(f"{label:28s} {elapsed / requests * 1e3:7.3f} ms/request  "
+          f"{CompletionHandler.connections:4d} connections")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per variant')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CompletionHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    registry = ClientRegistry()
+    # Warm up imports and the server
+    complete(openai.OpenAI(api_key='bench', base_url=base_url))
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        openai.OpenAI(api_key='bench', base_url=base_url)
+    print(f"{'client construction only':28s} {(time.perf_counter() - start) / args.requests * 1e3:7.3f} ms/client")
+
+    run("new client per request", args.requests,
+        lambda: openai.OpenAI(api_key='bench', base_url=base_url))
+    run("shared registry client", args.requests,
+        lambda: registry.get('openai', openai.OpenAI, 'bench', base_url))
+
+    registry.clear()
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
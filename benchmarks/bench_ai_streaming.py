@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for streamed AI completions with early termination.
+
+Runs the mock provider with a per-token generation time and canned
+responses that, like real model output, often carry chatter after the
+docstring, and documents a set of functions three ways: full completions
+with the fixed 500-token limit, full completions with the per-function
+limit, and streamed completions that stop once the docstring is complete.
+Reports time-to-result per function and output tokens generated (billed).
+
+Usage:
+    python benchmarks/bench_ai_streaming.py --functions 30 --token-ms 5
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.ai_analyzer import AIAnalyzer
+from code_doc_gen.mock_provider import MockProviderServer
+from code_doc_gen.models import Function, Parameter, FunctionException
+
+
+DOCSTRING = (
+    "Loads the records of a table and indexes them by key.\n\n"
+    "Parameters:\n    path (str): Location of the table.\n    key (str): Column to index by.\n\n"
+    "Returns:\n    dict: Records by key.\n\nRaises:\n    ValueError: If the key column is missing."
+)
+CHATTER = (
+    "This docstring follows PEP 257 and describes the purpose, the parameters, the return value and the "
+    "exceptions of the function. Let me know if you would like a shorter version, examples, or type "
+    "annotations added to the signature as well. I hope this helps you document your codebase."
+) * 3
+RESPONSES = [
+    f"{DOCSTRING}\n\n{CHATTER}",
+    f'"""\n{DOCSTRING}\n"""\n\n{CHATTER}',
+    DOCSTRING,
+]
+
+
+class FixedLimitAnalyzer(AIAnalyzer):
+    """The response limit before per-function limits: always 500 tokens."""
+
+    def _max_response_tokens(self, function: Function) -> int:
+        return self.MAX_RESPONSE_TOKENS
+
+
+def make_functions(count: int) -> list:
+    functions = []
+    for i in range(count):
+        parameters = [Parameter(f"arg{j}", "str") for j in range(i % 4)]
+        exceptions = [FunctionException("ValueError")] if i % 3 == 0 else []
+        functions.append(Function(name=f"load_{i}", parameters=parameters, return_type="dict",
+                                  source_code=f"return index(read(arg0), {i})", exceptions=exceptions))
+    return functions
+
+
+def run(label: str, analyzer_class, streaming: bool, args) -> None:
+    server = MockProviderServer(latency_ms=args.latency_ms, token_ms=args.token_ms, responses=RESPONSES).start()
+    config = Config()
+    config.config['cache'].setdefault('ai', {})['enabled'] = False
+    config.config['ai'].update({
+        'enabled': True, 'provider': 'openai', 'fallback_providers': [], 'openai_api_key': 'mock-key',
+        'base_urls': {'openai': server.base_url('openai')}, 'models': {'openai': 'mock-model'},
+        'streaming': streaming,
+    })
+    analyzer = analyzer_class(config)
+
+    latencies = []
+    for function in make_functions(args.functions):
+        started = time.perf_counter()
+        analyzer.analyze_function(function, 'python')
+        latencies.append(time.perf_counter() - started)
+    # Let the server notice closed streams before reading its counters
+    time.sleep(0.2)
+    server.stop()
+
+    print(f"{label:36s} time-to-result p50 {statistics.median(latencies) * 1000:6.0f} ms  "
+          f"output tokens/function {server.stats['completion_tokens'] / args.functions:6.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', type=int, default=30, help='Functions to document per variant')
+    parser.add_argument('--latency-ms', type=float, default=100.0, help='Mock time to first token in milliseconds')
+    parser.add_argument('--token-ms', type=float, default=5.0, help='Mock generation time per output token')
+    args = parser.parse_args()
+
+    logging.getLogger('code_doc_gen').setLevel(logging.ERROR)
+
+    run("full completion, 500-token limit", FixedLimitAnalyzer, False, args)
+    run("full completion, per-function limit", AIAnalyzer, False, args)
+    run("streamed, stop after docstring", AIAnalyzer, True, args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
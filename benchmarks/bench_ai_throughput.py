@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+AI throughput benchmark against the local mock provider.
+
+Starts code_doc_gen.mock_provider with the given latency distribution, error
+rate and 429 rate, points an AIAnalyzer at it and sends one prompt per
+function through _get_ai_response from a pool of threads, once per
+concurrency level. Reports functions/sec, p50/p95 latency per function
+(including retries and backoff), retries and failed functions, so that
+concurrency, max_retries and retry_delay can be tuned offline.
+
+Usage:
+    python benchmarks/bench_ai_throughput.py --functions 200 --concurrency 1 4 8 16 \\
+        --latency-ms 300 --latency-sigma 0.5 --error-rate 0.02 --rate-limit-rate 0.05
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.ai_analyzer import AIAnalyzer
+from code_doc_gen.ai_health import get_health_tracker
+from code_doc_gen.mock_provider import MockProviderServer
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def make_analyzer(args, server: MockProviderServer) -> AIAnalyzer:
+    config = Config()
+    config.config['cache'].setdefault('ai', {})['enabled'] = False
+    config.config['ai'].update({
+        'enabled': True,
+        'provider': args.provider,
+        'fallback_providers': [],
+        f'{args.provider}_api_key': 'mock-key',
+        'base_urls': {args.provider: server.base_url(args.provider)},
+        'max_retries': args.max_retries,
+        'retry_delay': args.retry_delay,
+        'models': {'groq': ['mock-model'], 'openai': 'mock-model'},
+        'rate_limits': {},
+    })
+    return AIAnalyzer(config)
+
+
+def run_level(args, concurrency: int) -> dict:
+    server = MockProviderServer(
+        latency_ms=args.latency_ms, latency_sigma=args.latency_sigma, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, seed=args.seed
+    ).start()
+    get_health_tracker().reset()
+    analyzer = make_analyzer(args, server)
+    latencies = []
+
+    def one(index: int):
+        started = time.perf_counter()
+        response = analyzer._get_ai_response(f"Document function f{index}(x) returning x * {index}.")
+        latencies.append(time.perf_counter() - started)
+        return response
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        responses = list(pool.map(one, range(args.functions)))
+    elapsed = time.perf_counter() - start
+    server.stop()
+
+    health = get_health_tracker().get_stats().get(args.provider, {})
+    return {
+        'concurrency': concurrency,
+        'throughput': args.functions / elapsed,
+        'p50': statistics.median(latencies),
+        'p95': percentile(latencies, 0.95),
+        'retries': server.stats['requests'] - sum(1 for r in responses if r),
+        'failed': sum(1 for r in responses if not r),
+        'circuit_opens': health.get('circuit_opens', 0),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', type=int, default=200, help='Prompts per concurrency level')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8, 16], help='Concurrency levels')
+    parser.add_argument('--provider', choices=['groq', 'openai'], default='openai', help='SDK client to drive')
+    parser.add_argument('--latency-ms', type=float, default=100.0, help='Median mock latency in milliseconds')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Log-normal latency spread')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 500 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--retry-after', type=float, default=0.2, help='Retry-After seconds of a 429')
+    parser.add_argument('--max-retries', type=int, default=3, help='ai.max_retries')
+    parser.add_argument('--retry-delay', type=float, default=0.1, help='ai.retry_delay in seconds')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed of the mock')
+    args = parser.parse_args()
+
+    # Injected failures are expected; keep the table readable
+    logging.getLogger('code_doc_gen').setLevel(logging.ERROR)
+
+    print(f"{args.functions} functions via {args.provider}, mock latency {args.latency_ms:g} ms "
+          f"(sigma {args.latency_sigma:g}), errors {args.error_rate:.0%}, 429s {args.rate_limit_rate:.0%}")
+    print(f"{'concurrency':>11} {'functions/s':>11} {'p50 ms':>8} {'p95 ms':>8} {'retries':>8} {'failed':>7} {'opens':>6}")
+    for concurrency in args.concurrency:
+        result = run_level(args, concurrency)
+        print(f"{result['concurrency']:>11} {result['throughput']:>11.1f} {result['p50'] * 1000:>8.0f} "
+              f"{result['p95'] * 1000:>8.0f} {result['retries']:>8} {result['failed']:>7} {result['circuit_opens']:>6}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
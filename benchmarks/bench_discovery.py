@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for repository discovery.
+
+Generates a synthetic source tree and compares the original os.walk based
+scan (full list, per-file parser lookup) with the streaming os.scandir based
+RepositoryScanner.iter_repository: time to first path, total time and peak
+Python memory while discovering.
+
+Usage:
+    python benchmarks/bench_discovery.py --files 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.scanner import RepositoryScanner
+
+
+def make_tree(root: Path, file_count: int, per_dir: int = 200) -> None:
+    """Write file_count empty files spread over nested directories, a quarter of them non-source."""
+    for i in range(file_count):
+        directory = root / f"d{i // (per_dir * 50)}" / f"s{i // per_dir}"
+        if i % per_dir == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        suffix = ('.py', '.java', '.js', '.txt')[i % 4]
+        (directory / f"f{i}{suffix}").touch()
+
+
+def legacy_scan(scanner: RepositoryScanner, repo_path: Path) -> list:
+    """The pre-rework walk: builds the whole list and asks the parser factory per file."""
+    file_paths = []
+    ignored_directories = scanner.config.get_ignored_directories()
+    for root, dirs, filenames in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if d not in ignored_directories]
+        for filename in filenames:
+            file_path = Path(root) / filename
+            if scanner.config.should_ignore_file(file_path):
+                continue
+            try:
+                scanner.parser_factory.get_parser_for_file(file_path)
+                file_paths.append(file_path)
+            except ValueError:
+                continue
+    return file_paths
+
+
+def measure(label: str, paths_iterable_factory) -> int:
+    """Consume an iterable of paths and report timing and peak memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in paths_iterable_factory():
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<16} {count:8d} paths  first after {first * 1000:8.1f} ms  "
+          f"total {elapsed:6.2f}s  peak {peak / 1024 / 1024:7.1f} MiB")
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=200000, help='Number of synthetic files')
+    args = parser.parse_args()
+
+    scanner = RepositoryScanner(Config())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root, args.files)
+
+        # The legacy scan only yields once the list is complete
+        legacy_count = measure("legacy os.walk", lambda: legacy_scan(scanner, root))
+        streamed_count = measure("iter_repository", lambda: scanner.iter_repository(root))
+
+    assert legacy_count == streamed_count
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
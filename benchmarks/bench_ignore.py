@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for ignore matching.
+
+Builds an in-memory tree of synthetic paths (no filesystem access) and
+simulates a top-down walk with directory pruning, comparing the original
+per-file substring checks with the compiled IgnoreMatcher.
+
+Usage:
+    python benchmarks/bench_ignore.py --paths 500000
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.ignore import IgnoreMatcher
+
+
+LEGACY_IGNORE_DIRS = {
+    '.git', '.svn', '.hg', '.bzr', '__pycache__', '.pytest_cache', 'node_modules',
+    'bower_components', 'build', 'dist', 'target', '.idea', '.vscode', 'venv', 'env',
+    '.venv', '.env', 'codedocgen', 'vendor', 'deps', 'tmp', 'temp', 'cache', 'site-packages',
+}
+
+
+def legacy_should_ignore_file(file_path: Path) -> bool:
+    """The pre-rework Config.should_ignore_file."""
+    file_str = str(file_path)
+    if any(venv_dir in file_str for venv_dir in ['codedocgen/', 'venv/', 'env/', '.venv/', '.env/', 'site-packages/']):
+        return True
+    for pattern in ['node_modules', '__pycache__', 'build', 'dist', '.pyc', '.o', '.so', '.dll', '.exe']:
+        if pattern in file_str:
+            return True
+    return False
+
+
+def make_tree(path_count: int) -> dict:
+    """Map relative directory -> file names; roughly 10% of files sit under pruned directories."""
+    tree = defaultdict(list)
+    suffixes = ('.py', '.js', '.java', '.pyc', '.cpp')
+    for i in range(path_count):
+        top = ('src', 'lib', 'app', 'tests', 'tools', 'pkg', 'core', 'api', 'web', 'node_modules')[i % 10]
+        directory = f"{top}/m{i % 97}/sub{i % 13}"
+        tree[directory].append(f"file_{i}{suffixes[i % 5]}")
+    return tree
+
+
+def walk_legacy(root: Path, tree: dict) -> int:
+    kept = 0
+    for directory, names in tree.items():
+        if any(part in LEGACY_IGNORE_DIRS for part in directory.split('/')):
+            continue
+        base = root / directory
+        for name in names:
+            if not legacy_should_ignore_file(base / name):
+                kept += 1
+    return kept
+
+
+def walk_matcher(matcher: IgnoreMatcher, tree: dict) -> int:
+    kept = 0
+    pruned = set()
+    for directory, names in tree.items():
+        # Each directory is tested once, as during a real top-down walk
+        parts = directory.split('/')
+        skip = False
+        for i in range(1, len(parts) + 1):
+            prefix = '/'.join(parts[:i])
+            if prefix in pruned:
+                skip = True
+                break
+            if matcher.is_ignored_dir(prefix):
+                pruned.add(prefix)
+                skip = True
+                break
+        if skip:
+            continue
+        for name in names:
+            if not matcher.is_ignored_file(f"{directory}/{name}"):
+                kept += 1
+    return kept
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paths', type=int, default=500000, help='Number of synthetic paths')
+    args = parser.parse_args()
+
+    root = Path('/srv/checkout/project')
+    tree = make_tree(args.paths)
+    config = Config()
+
+    start = time.perf_counter()
+    legacy_kept = walk_legacy(root, tree)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = IgnoreMatcher.from_config(config, root)
+    matcher_kept = walk_matcher(matcher, tree)
+    matcher_elapsed = time.perf_counter() - start
+
+    print(f"paths: {args.paths}")
+    print(f"legacy substring checks: {legacy_elapsed:6.2f}s ({args.paths / legacy_elapsed:12.0f} paths/sec), kept {legacy_kept}")
+    print(f"compiled IgnoreMatcher:  {matcher_elapsed:6.2f}s ({args.paths / matcher_elapsed:12.0f} paths/sec), kept {matcher_kept}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
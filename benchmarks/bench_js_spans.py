@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark for JavaScript function spans.
+
+Generates a large bundle-like JavaScript file (function declarations, arrow
+functions and classes, with template literals and regex literals) and
+compares giving every function the whole file as source_code with the
+per-function spans: bytes of source per function and time spent in the
+analyzer's existing-documentation checks.
+
+Usage:
+    python benchmarks/bench_js_spans.py --functions 2000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.analyzer import IntelligentAnalyzer
+from code_doc_gen.parsers.javascript_parser import JavaScriptParser
+
+
+def make_bundle(count: int) -> str:
+    chunks = ["/* bundle */\n"]
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            chunks.append(
+                f"function handler{i}(req, res) {{\n"
+                f"  const path = `/api/${{req.id}}/item{i}`;\n"
+                f"  if (/^\\/api\\/\\d+/.test(path)) {{ res.send({{ ok: true, id: {i} }}); }}\n"
+                f"  return path;\n}}\n"
+            )
+        elif kind == 1:
+            chunks.append(f"const map{i} = (items) => items.map((x) => x * {i});\n")
+        elif kind == 2:
+            chunks.append(f"const format{i} = function (value) {{ return `${{value}}:{i}`; }};\n")
+        else:
+            chunks.append(
+                f"class Store{i} {{\n"
+                f"  get(key) {{ if (key) {{ return this.data[key]; }} return null; }}\n"
+                f"  set(key, value) {{ this.data[key] = value; }}\n}}\n"
+            )
+    return "".join(chunks)
+
+
+def check_docs(analyzer: IntelligentAnalyzer, functions: list) -> float:
+    start = time.perf_counter()
+    for function in functions:
+        analyzer._has_existing_documentation(function, 'javascript')
+        analyzer.has_existing_documentation(function.source_code, 'javascript')
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', type=int, default=2000, help='Number of top-level definitions in the bundle')
+    args = parser.parse_args()
+
+    config = Config()
+    analyzer = IntelligentAnalyzer(config)
+    source = make_bundle(args.functions)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bundle.js'
+        path.write_text(source)
+        start = time.perf_counter()
+        functions = JavaScriptParser(config).parse_file(path).functions
+        parse_elapsed = time.perf_counter() - start
+
+    spans_elapsed = check_docs(analyzer, functions)
+    span_bytes = sum(len(f.source_code) for f in functions) / len(functions)
+
+    for function in functions:
+        function.source_code = source
+    whole_elapsed = check_docs(analyzer, functions)
+
+    print(f"bundle: {len(source) / 1024:.0f} KiB, {len(functions)} functions, parsed in {parse_elapsed:.2f}s")
+    print(f"whole-file source_code: {len(source):10.0f} bytes/function, doc checks {whole_elapsed:7.2f}s")
+    print(f"per-function spans:     {span_bytes:10.0f} bytes/function, doc checks {spans_elapsed:7.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark for RepositoryScanner.parse_files_parallel.
+
+Generates a synthetic Python repository and compares files/sec of the
+original starmap-over-bound-method implementation with the per-worker
+initialized, streamed implementation.
+
+Usage:
+    python benchmarks/bench_parse_parallel.py --files 10000 --workers 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.scanner import RepositoryScanner
+
+
+def make_repo(root: Path, file_count: int) -> list:
+    """Write file_count small Python modules under root."""
+    paths = []
+    for i in range(file_count):
+        package = root / f"pkg{i // 500}"
+        package.mkdir(exist_ok=True)
+        path = package / f"module_{i}.py"
+        path.write_text(
+            f"def get_value_{i}(items: list, key: str) -> int:\n"
+            f"    total = 0\n"
+            f"    for item in items:\n"
+            f"        if item == key:\n"
+            f"            total += 1\n"
+            f"    return total\n\n"
+            f"def set_value_{i}(value: int) -> None:\n"
+            f"    print(value)\n"
+        )
+        paths.append(path)
+    return paths
+
+
+def legacy_parse_files_parallel(scanner: RepositoryScanner, file_paths, max_workers):
+    """The pre-rework implementation: pickles the scanner with every task chunk."""
+    args = [(file_path, None) for file_path in file_paths]
+    with Pool(processes=max_workers) as pool:
+        results = pool.starmap(scanner._parse_file_worker, args)
+    return dict(zip(file_paths, results))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=10000, help='Number of synthetic files')
+    parser.add_argument('--workers', type=int, default=cpu_count(), help='Worker processes')
+    parser.add_argument('--chunksize', type=int, default=None, help='Chunk size for the streamed pool')
+    args = parser.parse_args()
+
+    config = Config()
+    config.config['cache']['enabled'] = False
+    scanner = RepositoryScanner(config)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_repo(Path(tmp), args.files)
+
+        start = time.perf_counter()
+        legacy = legacy_parse_files_parallel(scanner, paths, args.workers)
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first_result = None
+        streamed = {}
+        for file_path, functions in scanner.iter_parse_files_parallel(paths, None, args.workers, args.chunksize):
+            if first_result is None:
+                first_result = time.perf_counter() - start
+            streamed[file_path] = functions
+        streamed_elapsed = time.perf_counter() - start
+
+    assert len(legacy) == len(streamed) == args.files
+
+    print(f"files: {args.files}, workers: {args.workers}")
+    print(f"legacy starmap:     {args.files / legacy_elapsed:10.1f} files/sec ({legacy_elapsed:.2f}s, "
+          f"first result after {legacy_elapsed:.2f}s)")
+    print(f"initialized stream: {args.files / streamed_elapsed:10.1f} files/sec ({streamed_elapsed:.2f}s, "
+          f"first result after {first_result:.2f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark for prompt compaction.
+
+Builds documentation prompts for every function of a Python source tree
+(CodeDocGen itself by default) and compares the fixed 2000-character body
+cut with the token-budgeted PromptCompactor: average prompt tokens, how many
+bodies lost their last line, and prompt build latency.
+
+Usage:
+    python benchmarks/bench_prompt_compaction.py --source code_doc_gen --budget 500
+"""
+
+import argparse
+import ast
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.ai_analyzer import AIAnalyzer
+from code_doc_gen.ai_engine import estimate_tokens
+from code_doc_gen.models import Function
+
+
+def load_functions(source: Path) -> list:
+    functions = []
+    for path in sorted(source.rglob('*.py')):
+        text = path.read_text(encoding='utf-8')
+        try:
+            tree = ast.parse(text)
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.body:
+                body = ast.get_source_segment(text, node, padded=True) or ''
+                # Drop the def line; prompts carry the signature separately
+                body = body.split('\n', 1)[1] if '\n' in body else ''
+                functions.append(Function(name=node.name, parameters=[], return_type='None', source_code=body))
+    return functions
+
+
+class TruncatingCompactor:
+    """The body handling before compaction: a fixed 2000-character cut."""
+
+    def compact(self, body: str, language: str, token_budget=None) -> str:
+        return body[:2000] + "..." if len(body) > 2000 else body
+
+
+def measure(functions: list, analyzer: AIAnalyzer) -> tuple:
+    tokens = []
+    body_tokens = []
+    start = time.perf_counter()
+    for function in functions:
+        tokens.append(estimate_tokens(analyzer._create_ai_prompt(function, 'python')))
+    elapsed = time.perf_counter() - start
+    for function in functions:
+        body_tokens.append(estimate_tokens(analyzer.compactor.compact(function.source_code, 'python', analyzer.prompt_token_budget)))
+    return statistics.mean(tokens), statistics.mean(body_tokens), max(tokens), elapsed / len(functions) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=str(Path(__file__).resolve().parent.parent / 'code_doc_gen'),
+                        help='Python source tree to build prompts for')
+    parser.add_argument('--budget', type=int, default=500, help='Prompt token budget for function code')
+    args = parser.parse_args()
+
+    config = Config()
+    config.config['ai']['prompt_token_budget'] = args.budget
+    analyzer = AIAnalyzer(config)
+    legacy = AIAnalyzer(config)
+    legacy.compactor = TruncatingCompactor()
+    functions = load_functions(Path(args.source))
+
+    def last_line(function):
+        lines = [line for line in function.source_code.splitlines() if line.strip()]
+        return lines[-1].strip() if lines else ''
+
+    truncated = [f for f in functions if len(f.source_code) > 2000]
+
+    print(f"functions: {len(functions)} ({len(truncated)} longer than 2000 characters)")
+    for label, candidate in (("2000-char truncation", legacy), (f"compactor ({args.budget} tokens)", analyzer)):
+        lost = sum(1 for f in truncated if last_line(f) not in candidate._create_ai_prompt(f, 'python'))
+        mean, body_mean, peak, latency = measure(functions, candidate)
+        print(f"{label:26s} avg {mean:6.1f} prompt / {body_mean:6.1f} code tokens  max {peak:4d}  "
+              f"build {latency:6.1f} us/prompt  last line lost in {lost}/{len(truncated)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the file reads of a run.
+
+Generates a tree of Python, JavaScript and C++ files and runs the parse ->
+generate -> write pipeline over it the way ``codedocgen --inplace`` (or
+``--diff``) does, with a fresh parse cache, counting:
+
+- opens of the repository's source files (from ``open`` audit events),
+- bytes read and read syscalls of the process (``rchar`` and ``syscr`` of
+  /proc/self/io, Linux only; these include the parse cache and journal).
+
+Parsing runs in-process (one job) so that every read is counted.
+
+Usage:
+    python benchmarks/bench_reads.py --files 500 --mode inplace
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.generator import DocumentationGenerator
+from code_doc_gen.pipeline import DocumentationPipeline
+from code_doc_gen.writer import TransactionalWriter
+
+
+SOURCES = {
+    '.py': (
+        "def load_{i}(path, strict=False):\n"
+        "    with open(path) as f:\n"
+        "        return [line for line in f if line or strict]\n\n\n"
+        "def save_{i}(path, rows):\n"
+        "    with open(path, 'w') as f:\n"
+        "        f.writelines(rows)\n"
+    ),
+    '.js': (
+        "function load{i}(path, strict) {{\n"
+        "    return read(path).filter(line => line || strict);\n"
+        "}}\n\n"
+        "const save{i} = (path, rows) => {{\n"
+        "    write(path, rows.join(''));\n"
+        "}};\n"
+    ),
+    '.cpp': (
+        "int load_{i}(const char* path, bool strict) {{\n"
+        "    return read(path, strict);\n"
+        "}}\n\n"
+        "void save_{i}(const char* path, int rows) {{\n"
+        "    write(path, rows);\n"
+        "}}\n"
+    ),
+}
+
+
+def make_tree(root: Path, count: int) -> None:
+    suffixes = list(SOURCES)
+    for i in range(count):
+        directory = root / f"pkg_{i % 20}"
+        directory.mkdir(exist_ok=True)
+        suffix = suffixes[i % len(suffixes)]
+        (directory / f"module_{i}{suffix}").write_text(SOURCES[suffix].format(i=i))
+
+
+def process_io() -> dict:
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return {key: int(fields[key]) for key in ('rchar', 'syscr')}
+    except OSError:
+        return {'rchar': 0, 'syscr': 0}
+
+
+def run(config: Config, root: Path, mode: str) -> None:
+    pipeline = DocumentationPipeline(config, jobs=1)
+    generator = DocumentationGenerator(config, pipeline.content)
+    file_writer = None
+    if mode == 'inplace':
+        file_writer = TransactionalWriter(config, root, generator, content_store=pipeline.content)
+    for result in pipeline.run(sorted(root.rglob('module_*'))):
+        if result.documentation and file_writer:
+            file_writer.stage(result.file_path, result.documentation, result.language, result.functions)
+            continue
+        if result.documentation:
+            generator.generate_diff(result.file_path, result.documentation, result.language, result.functions)
+        pipeline.content.release(result.file_path)
+    if file_writer:
+        file_writer.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=500, help='Number of source files')
+    parser.add_argument('--mode', choices=['inplace', 'diff'], default='inplace', help='Output mode of the run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'repo'
+        root.mkdir()
+        make_tree(root, args.files)
+        config = Config()
+        config.config['ai']['enabled'] = False
+        config.config.setdefault('cache', {})['directory'] = str(Path(tmp) / 'cache')
+
+        opens = []
+        prefix = str(root)
+
+        def audit(event, event_args):
+            if event == 'open' and isinstance(event_args[0], str) and event_args[0].startswith(prefix):
+                if '.codedocgen' not in event_args[0] and not event_args[0].endswith('.cdgtmp'):
+                    opens.append(event_args[0])
+
+        sys.addaudithook(audit)
+        before = process_io()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(config, root, args.mode)
+        seconds = time.perf_counter() - started
+        after = process_io()
+
+    print(f"mode:                {args.mode}")
+    print(f"files:               {args.files}")
+    print(f"source file opens:   {len(opens)} ({len(opens) / args.files:.2f} per file)")
+    print(f"bytes read:          {after['rchar'] - before['rchar']}")
+    print(f"read syscalls:       {after['syscr'] - before['syscr']}")
+    print(f"seconds:             {seconds:.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for IntelligentAnalyzer name analysis.
+
+Analyzes synthetic function names built from a small vocabulary (get, set,
+value, ...) and compares per-call NLTK tokenizing/tagging with the shared,
+memoized process-wide tagger.
+
+Usage:
+    python benchmarks/bench_tagging.py --names 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import nltk
+
+from code_doc_gen import nlp
+from code_doc_gen.config import Config
+from code_doc_gen.analyzer import IntelligentAnalyzer
+from code_doc_gen.models import Function, Parameter
+
+
+VERBS = ['get', 'set', 'update', 'load', 'save', 'compute', 'is', 'has', 'parse', 'build']
+NOUNS = ['value', 'user', 'data', 'item', 'config', 'name', 'index', 'count', 'file', 'node']
+
+
+class UncachedTagger(nlp.IdentifierTagger):
+    """Calls NLTK on every request, as the analyzer did before the shared tagger."""
+
+    def tokenize(self, text):
+        return tuple(nltk.word_tokenize(text))
+
+    def tag(self, words):
+        return tuple(nltk.pos_tag(list(words)))
+
+
+def make_functions(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    functions = []
+    for _ in range(count):
+        words = [rng.choice(VERBS)] + [rng.choice(NOUNS) for _ in range(rng.randint(1, 2))]
+        name = words[0] + ''.join(w.capitalize() for w in words[1:]) if rng.random() < 0.5 else '_'.join(words)
+        functions.append(Function(
+            name=name,
+            return_type=rng.choice(['int', 'bool', 'str', 'None']),
+            parameters=[Parameter(name=rng.choice(NOUNS), type='int')]
+        ))
+    return functions
+
+
+def run(analyzer: IntelligentAnalyzer, functions: list) -> float:
+    start = time.perf_counter()
+    for function in functions:
+        function.brief_description = ""
+        analyzer.analyze_function(function, 'python')
+        analyzer._describe_return_type(function)
+        for parameter in function.parameters:
+            parameter.description = ''
+            analyzer.analyze_parameter(parameter)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=100000, help='Number of synthetic function names')
+    args = parser.parse_args()
+
+    config = Config()
+    analyzer = IntelligentAnalyzer(config)
+    functions = make_functions(args.names)
+
+    nlp._tagger = UncachedTagger()
+    uncached = run(analyzer, functions)
+    uncached_descriptions = [f.brief_description for f in functions]
+
+    nlp._tagger = nlp.IdentifierTagger()
+    shared = run(analyzer, functions)
+    shared_descriptions = [f.brief_description for f in functions]
+
+    assert uncached_descriptions == shared_descriptions
+
+    stats = nlp.get_tagger().get_stats()
+    print(f"names: {args.names}")
+    print(f"per-call NLTK:  {args.names / uncached:10.0f} functions/sec ({uncached:.2f}s)")
+    print(f"shared tagger:  {args.names / shared:10.0f} functions/sec ({shared:.2f}s), "
+          f"{stats['hits']} hits / {stats['misses']} misses")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for documentation template rendering.
+
+Renders the documentation of generated functions (two parameters, a return
+value and, for every third one, an exception) with
+DocumentationGenerator._generate_function_documentation, the per-function
+rendering path, in every supported language, and reports the time per
+function. With --compare, also times rendering each template through a
+per-call configuration lookup with fallback, as the generator used to,
+against calling the renderer resolved once per run.
+
+Usage:
+    python benchmarks/bench_templates.py --functions 1000000 --compare
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from code_doc_gen.config import Config
+from code_doc_gen.generator import DocumentationGenerator
+from code_doc_gen.models import Function, Parameter, FunctionException
+from code_doc_gen.templates import FALLBACK_TEMPLATES
+
+LANGUAGES = ('c++', 'python', 'java', 'javascript')
+
+
+def make_functions(count: int) -> list:
+    functions = []
+    for i in range(min(count, 1000)):
+        functions.append(Function(
+            name=f"compute_total_{i}",
+            parameters=[
+                Parameter(name="values", type="list", description="Values to add"),
+                Parameter(name="start", type="int"),
+            ],
+            return_type="int",
+            brief_description=f"Computes total {i}",
+            exceptions=[FunctionException(name="ValueError", description="If a value is not a number")] if i % 3 == 0 else [],
+        ))
+    return functions
+
+
+def bench_generator(generator: DocumentationGenerator, functions: list, count: int, lang: str) -> float:
+    render = generator._generate_function_documentation
+    rounds, rest = divmod(count, len(functions))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for function in functions:
+            render(function, lang).get_full_documentation()
+    for function in functions[:rest]:
+        render(function, lang).get_full_documentation()
+    return time.perf_counter() - started
+
+
+def bench_renderers(config: Config, count: int) -> None:
+    renderers = config.get_template_renderers()
+    values = {
+        'brief': {'description': 'Computes the total'},
+        'param': {'name': 'values', 'description': 'Values to add'},
+        'return': {'description': 'Integer value'},
+        'throws': {'exception': 'ValueError', 'description': 'If a value is not a number'},
+    }
+    print(f"\n{'template':>16} {'lookup':>8} {'resolved':>9}   (ns per render)")
+    for template_type, fields in values.items():
+        fallback = FALLBACK_TEMPLATES['javascript'][template_type]
+        resolved = renderers.get('javascript', template_type)
+        started = time.perf_counter()
+        for _ in range(count):
+            (config.get_template('javascript', template_type) or fallback).format(**fields)
+        lookup_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(count):
+            resolved(**fields)
+        resolved_seconds = time.perf_counter() - started
+        print(f"{'js ' + template_type:>16} {lookup_seconds / count * 1e9:>8.0f} {resolved_seconds / count * 1e9:>9.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--functions', type=int, default=1000000, help='Functions rendered per language')
+    parser.add_argument('--compare', action='store_true', help='Also compare each template against str.format')
+    args = parser.parse_args()
+
+    config = Config()
+    generator = DocumentationGenerator(config)
+    functions = make_functions(args.functions)
+    print(f"{'language':>10} {'functions':>10} {'seconds':>8} {'us/function':>12}")
+    for lang in LANGUAGES:
+        seconds = bench_generator(generator, functions, args.functions, lang)
+        print(f"{lang:>10} {args.functions:>10} {seconds:>8.2f} {seconds / args.functions * 1e6:>12.2f}")
+    if args.compare:
+        bench_renderers(config, args.functions)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
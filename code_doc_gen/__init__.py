@@ -11,7 +11,9 @@ from pathlib import Path
 
 from .scanner import RepositoryScanner
 from .config import Config
+from .cache import cache_directory
 from .generator import DocumentationGenerator
+from .content import ContentStore
 
 __version__ = "1.2.0"
 __author__ = "Mohit Mishra"
@@ -52,8 +54,12 @@ def generate_docs(
         Dictionary mapping file paths to generated documentation strings
     """
     config = Config(config_path) if config_path else Config()
-    scanner = RepositoryScanner(config)
-    generator = DocumentationGenerator(config)
+    # Caches live in the scanned repository, whatever the working directory
+    config.config.setdefault('cache', {})['directory'] = str(cache_directory(config, Path(repo_path)))
+    # Each file is read once and shared by the parser and the generator
+    content = ContentStore()
+    scanner = RepositoryScanner(config, content)
+    generator = DocumentationGenerator(config, content)
     
     # Scan repository for files
     file_paths = scanner.scan_repository(repo_path, lang, files)
@@ -69,7 +75,7 @@ def generate_docs(
             
             if inplace:
                 # Modify file in place
-                generator.apply_documentation_inplace(file_path, doc_strings)
+                generator.apply_documentation_inplace(file_path, doc_strings, lang, functions)
             elif output_dir:
                 # Write to output directory
                 output_path = Path(output_dir) / Path(file_path).name
@@ -80,6 +86,8 @@ def generate_docs(
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
             continue
+        finally:
+            content.release(file_path)
     
     return results
 
@@ -11,7 +11,7 @@ import time
 import re
 import uuid
 import requests
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Callable, Tuple
 from pathlib import Path
 
 try:
@@ -28,11 +28,57 @@ except ImportError:
 
 from .models import Function, Parameter
 from .config import Config
+from .ai_engine import AIRequestEngine, Prompt, get_retry_after, is_rate_limit_error
+from .cache import AIResponseCache
+from .prompt_compactor import PromptCompactor
+from .ai_clients import get_client_registry
+from .ai_health import get_health_tracker, CLOSED
+
+
+# A comment wrapped in its markers (or a code fence), complete once the closing marker arrives
+_CLOSED_COMMENT = re.compile(
+    r'\s*(?:```[^\n]*\n[\s\S]*?```|"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|/\*[\s\S]*?\*/)'
+)
+
+# Chatter after bare comment content: a blank line, then a remark about the answer
+_TRAILING_CHATTER = re.compile(
+    r'\n[ \t]*\n[ \t]*(?:Note that|This (?:docstring|comment|documentation)|Explanation|Here (?:is|are)|'
+    r'I (?:have|hope|\'ve)|Let me|The above|Feel free|Hope this)\b'
+)
+
+
+def find_comment_end(text: str) -> Optional[int]:
+    """
+    Find where the comment block of a (partial) AI response is complete.
+    
+    Args:
+        text: Response text received so far
+        
+    Returns:
+        Index just past the comment block, or None while it may still continue
+    """
+    if text.lstrip().startswith(('```', '"""', "'''", '/*')):
+        closed = _CLOSED_COMMENT.match(text)
+        return closed.end() if closed else None
+    chatter = _TRAILING_CHATTER.search(text)
+    return chatter.start() if chatter else None
 
 
 class AIAnalyzer:
     """AI-powered analyzer for generating intelligent function comments."""
     
+    # Bump when the prompt templates change so cached responses are not reused
+    PROMPT_TEMPLATE_VERSION = 2
+    
+    # Smallest code budget of a function in a batched prompt
+    MIN_FUNCTION_TOKENS = 64
+    
+    # Response token limits: the default, and the per-function estimate for comment prompts
+    MAX_RESPONSE_TOKENS = 500
+    BASE_RESPONSE_TOKENS = 160
+    RESPONSE_TOKENS_PER_PARAMETER = 40
+    RESPONSE_TOKENS_PER_EXCEPTION = 30
+    
     def __init__(self, config: Config):
         """
         Initialize the AI analyzer.
@@ -52,26 +98,58 @@ class AIAnalyzer:
         self.fallback_providers = ai_config.get('fallback_providers', ['openai'])
         self.max_retries = ai_config.get('max_retries', 5)
         self.retry_delay = ai_config.get('retry_delay', 1.0)
+        self.concurrency = ai_config.get('concurrency', 8)
+        self.batch_size = max(1, int(ai_config.get('batch_size', 1)))
+        self.prompt_token_budget = int(ai_config.get('prompt_token_budget', 500))
+        self.streaming = ai_config.get('streaming', False)
+        self.compactor = PromptCompactor()
+        self.rate_limits = ai_config.get('rate_limits', {})
+        # Endpoint overrides, e.g. a local mock provider
+        self.base_urls = ai_config.get('base_urls', {})
         self.models = ai_config.get('models', {
             'groq': ['llama3-8b-8192', 'llama3.1-8b-instant', 'llama3-70b-8192'],
             'openai': 'gpt-4o-mini'
         })
         
-        # Initialize clients
-        self.groq_client = None
-        self.openai_client = None
+        # Provider clients are shared per process and built on first use
+        self.client_registry = get_client_registry()
         
-        if GROQ_AVAILABLE and self.groq_api_key:
-            try:
-                self.groq_client = groq.Groq(api_key=self.groq_api_key)
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize Groq client: {e}")
+        # Circuit breakers and latencies, shared by all analyzers of a process
+        health_config = ai_config.get('health', {})
+        self.health = get_health_tracker()
+        self.health.configure(
+            failure_threshold=health_config.get('failure_threshold', 3),
+            cooldown=health_config.get('cooldown_seconds', 60),
+            window=health_config.get('latency_window', 20)
+        )
         
-        if OPENAI_AVAILABLE and self.openai_api_key:
-            try:
-                self.openai_client = openai.OpenAI(api_key=self.openai_api_key)
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize OpenAI client: {e}")
+        # Concurrent request engine, created on first batch
+        self._engine: Optional[AIRequestEngine] = None
+        
+        # Responses of earlier runs, so unchanged functions skip the network
+        self.response_cache = AIResponseCache(config)
+    
+    @property
+    def groq_client(self):
+        """The shared Groq client, or None if it cannot be built."""
+        if not (GROQ_AVAILABLE and self.groq_api_key):
+            return None
+        try:
+            return self.client_registry.get('groq', groq.Groq, self.groq_api_key, self.base_urls.get('groq') or None)
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize Groq client: {e}")
+            return None
+    
+    @property
+    def openai_client(self):
+        """The shared OpenAI client, or None if it cannot be built."""
+        if not (OPENAI_AVAILABLE and self.openai_api_key):
+            return None
+        try:
+            return self.client_registry.get('openai', openai.OpenAI, self.openai_api_key, self.base_urls.get('openai') or None)
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize OpenAI client: {e}")
+            return None
     
     def analyze_function(self, function: Function, language: str) -> Optional[str]:
         """
@@ -79,16 +157,7 @@ class AIAnalyzer:
         Matches test expectations: returns None when disabled; otherwise returns
         the parsed provider output for the given language.
         """
-        if not self.ai_enabled:
-            return None
-        # Double-check live config in case it was mutated after init
-        if not self.config.get_ai_config().get('enabled', False):
-            return None
-        # If no API keys configured for supported providers, do not attempt AI
-        if not (self.groq_api_key or self.openai_api_key):
-            return None
-        # If AI is enabled but no provider is actually available (no API key, etc.), return None
-        if not self.is_available():
+        if not self._should_analyze():
             return None
 
         try:
@@ -102,6 +171,248 @@ class AIAnalyzer:
             self.logger.warning(f"AI analysis failed for function {function.name}: {e}")
             return None
     
+    def analyze_functions(
+        self,
+        functions: List[Function],
+        language: str,
+        on_result: Optional[Callable[[Function, Optional[str]], None]] = None
+    ) -> List[Optional[str]]:
+        """
+        Analyze many functions with concurrent AI requests.
+        
+        Requests run through an AIRequestEngine, which keeps up to
+        ``ai.concurrency`` requests in flight within the per-provider
+        ``ai.rate_limits`` and backs off on rate-limit responses without
+        holding up the other requests. With ``ai.batch_size`` above 1,
+        functions are packed into shared extraction prompts (see
+        _analyze_batched).
+        
+        Args:
+            functions: Functions to analyze
+            language: Programming language
+            on_result: Called with (function, comment) as each function completes
+            
+        Returns:
+            Parsed comments in input order (None where AI analysis failed)
+        """
+        comments: List[Optional[str]] = [None] * len(functions)
+        if not functions or not self._should_analyze():
+            return comments
+        
+        def report(index: int, comment: Optional[str]) -> None:
+            comments[index] = comment
+            if on_result is not None:
+                on_result(functions[index], comment)
+        
+        indices = list(range(len(functions)))
+        if self.batch_size > 1 and len(functions) > 1:
+            indices = self._analyze_batched(functions, language, report)
+        
+        def collect(index: int, raw_response: Optional[str]) -> None:
+            comment = None
+            if raw_response:
+                try:
+                    comment = self._parse_ai_response(raw_response, language)
+                except Exception as e:
+                    self.logger.warning(f"AI analysis failed for function {functions[index].name}: {e}")
+            report(index, comment)
+        
+        prompts = []
+        for index in indices:
+            try:
+                prompts.append((index, self._create_ai_prompt(functions[index], language)))
+            except Exception as e:
+                self.logger.warning(f"AI analysis failed for function {functions[index].name}: {e}")
+                report(index, None)
+        
+        self._run_prompts(prompts, collect)
+        return comments
+    
+    def _analyze_batched(
+        self,
+        functions: List[Function],
+        language: str,
+        report: Callable[[int, Optional[str]], None]
+    ) -> List[int]:
+        """
+        Analyze functions ``ai.batch_size`` at a time with shared extraction prompts.
+        
+        Each request carries the instructions once and asks for a JSON array
+        with one entry per function id. Batches whose response covers only
+        some of their functions are bisected and the uncovered functions are
+        requested again; a function that still fails on its own is handed back
+        for a regular single-function request.
+        
+        Args:
+            functions: Functions to analyze
+            language: Programming language
+            report: Called with (index, comment) for each documented function
+            
+        Returns:
+            Indices of functions that need a single-function request
+        """
+        pending = [list(range(start, min(start + self.batch_size, len(functions))))
+                   for start in range(0, len(functions), self.batch_size)]
+        singles: List[int] = []
+        
+        while pending:
+            retry: List[List[int]] = []
+            
+            def collect(batch: int, response: Optional[str]) -> None:
+                indices = pending[batch]
+                if not response:
+                    # The providers failed outright; bisecting would only repeat that
+                    for index in indices:
+                        report(index, None)
+                    return
+                
+                infos = self._parse_batch_extraction_response(response, len(indices))
+                missing = []
+                for number, index in enumerate(indices, 1):
+                    info = infos.get(number)
+                    if info is not None:
+                        report(index, self._apply_template(info, language))
+                    else:
+                        missing.append(index)
+                
+                if len(missing) > 1:
+                    self.logger.debug(f"Batch response covered {len(indices) - len(missing)}/{len(indices)} functions, bisecting")
+                    middle = len(missing) // 2
+                    retry.extend([missing[:middle], missing[middle:]])
+                else:
+                    singles.extend(missing)
+            
+            prompts = []
+            for batch, indices in enumerate(pending):
+                if len(indices) == 1:
+                    singles.extend(indices)
+                else:
+                    prompts.append((batch, self._create_batch_extraction_prompt([functions[i] for i in indices], language)))
+            
+            self._run_prompts(prompts, collect)
+            pending = retry
+        
+        return singles
+    
+    def _run_prompts(self, prompts: List[Tuple[Any, str]], collect: Callable[[Any, Optional[str]], None]) -> None:
+        """
+        Answer prompts from the response cache or with concurrent requests.
+        
+        Args:
+            prompts: (key, prompt) pairs
+            collect: Called with (key, raw response) as each prompt completes
+        """
+        misses = []
+        for key, prompt in prompts:
+            cached = self._get_cached_response(prompt)
+            if cached:
+                collect(key, cached)
+            else:
+                misses.append((key, prompt))
+        
+        if misses:
+            self._get_engine().run(misses, on_result=collect)
+    
+    def _should_analyze(self) -> bool:
+        """
+        Check whether AI analysis should be attempted at all.
+        
+        Returns:
+            True if AI is enabled and a provider is usable
+        """
+        if not self.ai_enabled:
+            return False
+        # Double-check live config in case it was mutated after init
+        if not self.config.get_ai_config().get('enabled', False):
+            return False
+        # If no API keys configured for supported providers, do not attempt AI
+        if not (self.groq_api_key or self.openai_api_key):
+            return False
+        # If AI is enabled but no provider is actually available (no API key, etc.), skip
+        return self.is_available()
+    
+    def _get_engine(self) -> AIRequestEngine:
+        """
+        Get the concurrent request engine, creating it on first use.
+        
+        Returns:
+            AIRequestEngine over the usable providers
+        """
+        if self._engine is None:
+            self._engine = AIRequestEngine(
+                [(name, self._with_response_cache(name, call)) for name, call in self._get_providers()],
+                concurrency=self.concurrency,
+                rate_limits=self.rate_limits,
+                max_retries=self.max_retries,
+                retry_delay=self.retry_delay,
+                health=self.health
+            )
+        return self._engine
+    
+    def _response_cache_key(self, provider: str, prompt: str) -> str:
+        """
+        Build the response cache key of a prompt for one provider.
+        
+        Args:
+            provider: Provider name
+            prompt: Prompt text
+            
+        Returns:
+            Cache key
+        """
+        return AIResponseCache.make_key(provider, self.models.get(provider), self.PROMPT_TEMPLATE_VERSION, prompt)
+    
+    def _get_cached_response(self, prompt: str) -> Optional[str]:
+        """
+        Look up a cached response from any usable provider, in fallback order.
+        
+        Args:
+            prompt: Prompt text
+            
+        Returns:
+            Cached response or None
+        """
+        for provider, _ in self._get_providers():
+            response = self.response_cache.get(self._response_cache_key(provider, prompt))
+            if response:
+                self.logger.debug(f"Using cached {provider} response")
+                return response
+        return None
+    
+    def _with_response_cache(self, provider: str, call: Callable[[str], Optional[str]]) -> Callable[[str], Optional[str]]:
+        """
+        Wrap a provider call so that its responses are stored in the response cache.
+        
+        Args:
+            provider: Provider name
+            call: Provider call
+            
+        Returns:
+            Wrapped provider call
+        """
+        def cached_call(prompt: str) -> Optional[str]:
+            response = call(prompt)
+            if response:
+                self.response_cache.put(self._response_cache_key(provider, prompt), response)
+            return response
+        return cached_call
+    
+    def _get_providers(self) -> List[Tuple[str, Callable[[str], Optional[str]]]]:
+        """
+        Get the usable providers in fallback order.
+        
+        Returns:
+            List of (provider name, call) pairs, primary provider first
+        """
+        providers = []
+        providers_to_try = [self.ai_provider] + [p for p in self.fallback_providers if p != self.ai_provider]
+        for provider in providers_to_try:
+            if provider == 'groq' and GROQ_AVAILABLE and self.groq_api_key:
+                providers.append(('groq', self._call_groq))
+            elif provider == 'openai' and OPENAI_AVAILABLE and self.openai_api_key:
+                providers.append(('openai', self._call_openai))
+        return providers
+    
     def _generate_template_based_comment(self, function: Function, language: str) -> str:
         """
         Generate comments using AI + template approach for reliable formatting.
@@ -176,7 +487,7 @@ class AIAnalyzer:
     def _create_extraction_prompt(self, function: Function, language: str) -> str:
         """Create a prompt for extracting function information."""
         signature = self._get_function_signature(function, language)
-        body = function.source_code[:1000] if function.source_code else ""
+        body = self.compactor.compact(function.source_code or "", language, self.prompt_token_budget)
         
         return f"""Analyze this {language} function and extract key information.
 
@@ -233,6 +544,84 @@ Return ONLY the JSON object, no other text."""
             self.logger.warning(f"Failed to parse extraction response: {e}")
             return None
     
+    def _create_batch_extraction_prompt(self, functions: List[Function], language: str) -> str:
+        """Create one extraction prompt for several functions, numbered from 1."""
+        # The functions of a batch share one budget
+        budget = max(self.MIN_FUNCTION_TOKENS, self.prompt_token_budget // len(functions))
+        sections = []
+        for number, function in enumerate(functions, 1):
+            signature = self._get_function_signature(function, language)
+            body = self.compactor.compact(function.source_code or "", language, budget)
+            sections.append(f"### Function {number}\nFunction: {signature}\nBody: {body}")
+        functions_text = "\n\n".join(sections)
+        
+        return f"""Analyze these {len(functions)} {language} functions and extract key information for each.
+
+{functions_text}
+
+Return ONLY a JSON array with one object per function, in any order. Each object has these fields:
+- "id": The function number from its ### heading
+- "description": Brief description of what the function does
+- "parameters": List of parameter descriptions [{{"name": "param_name", "description": "param_desc"}}]
+- "returns": Description of return value
+- "exceptions": List of exceptions that might be raised [{{"type": "ExceptionType", "description": "when raised"}}]
+
+Example output:
+[
+  {{
+    "id": 1,
+    "description": "Returns the user's name",
+    "parameters": [],
+    "returns": "The name of the user",
+    "exceptions": []
+  }}
+]
+
+Return ONLY the JSON array, no other text."""
+    
+    def _parse_batch_extraction_response(self, response: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Split a batched extraction response into per-function information.
+        
+        Entries that are missing, malformed or carry an unknown id are left
+        out, so the caller can retry just those functions.
+        
+        Args:
+            response: Raw AI response
+            count: Number of functions in the batch
+            
+        Returns:
+            Dictionary mapping function numbers (1-based) to extracted information
+        """
+        json_match = re.search(r'\[.*\]', response, re.DOTALL)
+        if not json_match:
+            return {}
+        try:
+            entries = json.loads(json_match.group(0))
+        except ValueError as e:
+            self.logger.debug(f"Failed to parse batch extraction response: {e}")
+            return {}
+        
+        infos = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict) or not isinstance(entry.get("description"), str):
+                continue
+            try:
+                number = int(entry.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if not 1 <= number <= count:
+                continue
+            
+            parameters = entry.get("parameters") or []
+            exceptions = entry.get("exceptions") or []
+            if not all(isinstance(p, dict) and 'name' in p and 'description' in p for p in parameters):
+                continue
+            if not all(isinstance(e, dict) and 'type' in e and 'description' in e for e in exceptions):
+                continue
+            infos[number] = entry
+        return infos
+    
     def _extract_info_manually(self, response: str, language: str) -> Dict[str, Any]:
         """Extract information manually from AI response."""
         self.logger.debug(f"=== Manual extraction ===")
@@ -394,7 +783,7 @@ Return ONLY the JSON object, no other text."""
             language: Programming language
             
         Returns:
-            Formatted prompt string
+            Formatted prompt, with a response token limit sized for the function
         """
         # Extract function signature and body
         signature = self._get_function_signature(function, language)
@@ -402,17 +791,32 @@ Return ONLY the JSON object, no other text."""
         
         # Create language-specific prompt
         if language == 'python':
-            return self._create_python_prompt(signature, body)
+            text = self._create_python_prompt(signature, body)
         elif language in ['c++', 'java']:
-            return self._create_cpp_java_prompt(signature, body, language)
+            text = self._create_cpp_java_prompt(signature, body, language)
         else:
-            return self._create_generic_prompt(signature, body, language)
+            text = self._create_generic_prompt(signature, body, language)
+        return Prompt(text, max_tokens=self._max_response_tokens(function), stop_after_comment=True)
+    
+    def _max_response_tokens(self, function: Function) -> int:
+        """
+        Estimate the response tokens a function's comment needs.
+        
+        Args:
+            function: Function to document
+            
+        Returns:
+            Token limit, growing with the parameters and exceptions to describe
+        """
+        tokens = (self.BASE_RESPONSE_TOKENS
+                  + self.RESPONSE_TOKENS_PER_PARAMETER * len(function.parameters)
+                  + self.RESPONSE_TOKENS_PER_EXCEPTION * len(function.exceptions))
+        return min(tokens, self.MAX_RESPONSE_TOKENS)
     
     def _create_python_prompt(self, signature: str, body: str) -> str:
         """Create a Python-specific prompt."""
-        # Truncate body if too long
-        if len(body) > 2000:
-            body = body[:2000] + "..."
+        # Fit the body into the prompt token budget
+        body = self.compactor.compact(body, 'python', self.prompt_token_budget)
         
         return f"""Generate a concise, professional PEP 257 docstring for this Python function.
 Focus on the function's intent, key operations, and make it context-aware.
@@ -458,9 +862,8 @@ Returns:
         comment_style = "Doxygen-style" if language == 'c++' else "Javadoc-style"
         tag_prefix = "\\" if language == 'c++' else "@"
         
-        # Truncate body if too long
-        if len(body) > 2000:
-            body = body[:2000] + "..."
+        # Fit the body into the prompt token budget
+        body = self.compactor.compact(body, language, self.prompt_token_budget)
         
         return f"""Generate a concise, professional {comment_style} comment for this {language.upper()} function.
 Focus on the function's intent, key operations, and make it context-aware.
@@ -495,9 +898,8 @@ Example output (without comment markers):
 
     def _create_generic_prompt(self, signature: str, body: str, language: str) -> str:
         """Create a generic prompt for other languages."""
-        # Truncate body if too long
-        if len(body) > 2000:
-            body = body[:2000] + "..."
+        # Fit the body into the prompt token budget
+        body = self.compactor.compact(body, language, self.prompt_token_budget)
         
         return f"""Generate a concise, professional comment for this {language} function.
 Include a brief description, parameter details, return value, and exceptions if applicable.
@@ -547,23 +949,18 @@ Do NOT include introductory text like "Here is the comment:" or similar."""
         Returns:
             AI response string or None if failed
         """
-        # Define provider order: primary + fallbacks
-        providers_to_try = [self.ai_provider] + [p for p in self.fallback_providers if p != self.ai_provider]
-        
-        for provider in providers_to_try:
-            if provider == 'groq' and GROQ_AVAILABLE and self.groq_api_key:
-                self.logger.info(f"Trying Groq as {'primary' if provider == self.ai_provider else 'fallback'}...")
-                response = self._try_provider_with_retries('groq', self._call_groq, prompt)
-                if response:
-                    self.logger.debug(f"Groq response: {repr(response)}")
-                    return response
-                    
-            elif provider == 'openai' and OPENAI_AVAILABLE and self.openai_api_key:
-                self.logger.info(f"Trying OpenAI as {'primary' if provider == self.ai_provider else 'fallback'}...")
-                response = self._try_provider_with_retries('openai', self._call_openai, prompt)
-                if response:
-                    self.logger.debug(f"OpenAI response: {repr(response)}")
-                    return response
+        cached = self._get_cached_response(prompt)
+        if cached:
+            return cached
+        
+        # Healthy providers, fastest first; open circuits are skipped
+        providers = dict(self._get_providers())
+        for provider in self.health.order(providers):
+            self.logger.info(f"Trying {provider} as {'primary' if provider == self.ai_provider else 'fallback'}...")
+            response = self._try_provider_with_retries(provider, self._with_response_cache(provider, providers[provider]), prompt)
+            if response:
+                self.logger.debug(f"{provider} response: {repr(response)}")
+                return response
         
         self.logger.warning("All AI providers failed")
         return None
@@ -581,15 +978,24 @@ Do NOT include introductory text like "Here is the comment:" or similar."""
             Response or None if all retries fail
         """
         for attempt in range(self.max_retries):
+            if not self.health.allow(provider_name):
+                # The circuit is open; fall back instead of backing off
+                break
+            started = time.monotonic()
             try:
                 response = provider_func(prompt)
                 if response:
+                    self.health.record_success(provider_name, time.monotonic() - started)
                     return response
+                self.health.record_failure(provider_name)
             except Exception as e:
+                self.health.record_failure(provider_name)
                 self.logger.warning(f"{provider_name} call attempt {attempt + 1} failed: {e}")
-                if attempt < self.max_retries - 1:
-                    # Exponential backoff
-                    delay = self.retry_delay * (2 ** attempt)
+                if attempt < self.max_retries - 1 and self.health.state(provider_name) == CLOSED:
+                    # Honor the provider's Retry-After, else exponential backoff
+                    delay = get_retry_after(e)
+                    if delay is None:
+                        delay = self.retry_delay * (2 ** attempt)
                     time.sleep(delay)
         
         return None
@@ -606,48 +1012,44 @@ Do NOT include introductory text like "Here is the comment:" or similar."""
         Returns:
             Response string or None if failed
         """
-        if not self.groq_client:
-            # Try to initialize the client if we have an API key
-            if self.groq_api_key:
-                try:
-                    self.groq_client = groq.Groq(api_key=self.groq_api_key)
-                except Exception as e:
-                    self.logger.warning(f"Failed to initialize Groq client: {e}")
-                    return None
-            else:
-                self.logger.warning("Groq client not available")
-                return None
+        client = self.groq_client
+        if client is None:
+            self.logger.warning("Groq client not available")
+            return None
         
         # Get Groq models - handle both string and list formats
         groq_models = self.models.get('groq', ['llama3-8b-8192', 'llama3.1-8b-instant', 'llama3-70b-8192'])
         if isinstance(groq_models, str):
             groq_models = [groq_models]
         
-        # Try each model in order
-        for model in groq_models:
+        # Try healthy models, fastest first; Groq rate limits are per model
+        rate_limit_error = None
+        targets = {f"groq/{model}": model for model in groq_models}
+        for target in self.health.order(targets):
+            model = targets[target]
+            if not self.health.allow(target):
+                continue
+            started = time.monotonic()
             try:
                 self.logger.debug(f"Trying Groq model: {model}")
-                response = self.groq_client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=500,
-                    temperature=0.3
-                )
-                
-                if response.choices and len(response.choices) > 0:
+                content = self._create_completion(client, model, prompt)
+                if content is not None:
+                    self.health.record_success(target, time.monotonic() - started)
                     self.logger.debug(f"Groq model {model} succeeded")
-                    return response.choices[0].message.content.strip()
+                    return content
+                self.health.record_failure(target)
                 
             except Exception as e:
+                self.health.record_failure(target)
                 self.logger.warning(f"Groq model {model} failed: {e}")
+                if is_rate_limit_error(e):
+                    rate_limit_error = e
                 continue
         
         self.logger.warning("All Groq models failed")
+        if rate_limit_error is not None:
+            # Let the caller back off instead of treating this as a plain failure
+            raise rate_limit_error
         return None
     
     def _call_openai(self, prompt: str) -> Optional[str]:
@@ -660,39 +1062,113 @@ Do NOT include introductory text like "Here is the comment:" or similar."""
         Returns:
             Response string or None if failed
         """
-        if not self.openai_client:
-            # Try to initialize the client if we have an API key
-            if self.openai_api_key:
-                try:
-                    self.openai_client = openai.OpenAI(api_key=self.openai_api_key)
-                except Exception as e:
-                    self.logger.warning(f"Failed to initialize OpenAI client: {e}")
-                    return None
-            else:
-                self.logger.warning("OpenAI client not available")
-                return None
+        client = self.openai_client
+        if client is None:
+            self.logger.warning("OpenAI client not available")
+            return None
         
+        model = self.models.get('openai', 'gpt-4o-mini')
+        target = f"openai/{model}"
+        started = time.monotonic()
         try:
-            response = self.openai_client.chat.completions.create(
-                model=self.models.get('openai', 'gpt-4o-mini'),
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=500,
-                temperature=0.3
-            )
-            
-            if response.choices and len(response.choices) > 0:
-                return response.choices[0].message.content.strip()
+            content = self._create_completion(client, model, prompt)
+            if content is not None:
+                self.health.record_success(target, time.monotonic() - started)
+                return content
+            self.health.record_failure(target)
             
         except Exception as e:
+            self.health.record_failure(target)
             self.logger.warning(f"OpenAI API call failed: {e}")
+            if is_rate_limit_error(e):
+                # Let the caller back off instead of treating this as a plain failure
+                raise
         
         return None
     
+    def _completion_request(self, model: str, prompt: str) -> Dict[str, Any]:
+        """
+        Build the body of a chat completion request.
+        
+        Args:
+            model: Model name
+            prompt: Prompt text (a Prompt may carry max_tokens)
+            
+        Returns:
+            Request parameters, as sent to the provider
+        """
+        return {
+            'model': model,
+            'messages': [
+                {
+                    "role": "user",
+                    "content": str(prompt)
+                }
+            ],
+            'max_tokens': getattr(prompt, 'max_tokens', None) or self.MAX_RESPONSE_TOKENS,
+            'temperature': 0.3
+        }
+    
+    def _create_completion(self, client: Any, model: str, prompt: str) -> Optional[str]:
+        """
+        Send a chat completion request, streamed if ai.streaming is enabled.
+        
+        Args:
+            client: Groq or OpenAI client
+            model: Model name
+            prompt: Prompt text (a Prompt may carry max_tokens and stop_after_comment)
+            
+        Returns:
+            Response text, or None if the provider returned no choices
+        """
+        request = self._completion_request(model, prompt)
+        
+        if not self.streaming:
+            response = client.chat.completions.create(**request)
+            if response.choices and len(response.choices) > 0:
+                return response.choices[0].message.content.strip()
+            return None
+        
+        stream = client.chat.completions.create(stream=True, **request)
+        return self._read_stream(stream, getattr(prompt, 'stop_after_comment', False))
+    
+    def _read_stream(self, stream: Any, stop_after_comment: bool) -> Optional[str]:
+        """
+        Collect a streamed completion, closing the stream early once the comment is complete.
+        
+        Closing the stream ends generation on the provider side, so chatter
+        after the comment is neither waited for nor billed.
+        
+        Args:
+            stream: Iterator of chat completion chunks
+            stop_after_comment: Whether to stop at the end of the comment block
+            
+        Returns:
+            Response text, or None if nothing was received
+        """
+        parts: List[str] = []
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                if stop_after_comment:
+                    text = ''.join(parts)
+                    end = find_comment_end(text)
+                    if end is not None:
+                        self.logger.debug(f"Stopped stream after {len(parts)} chunks")
+                        return text[:end].strip()
+        finally:
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+        
+        text = ''.join(parts).strip()
+        return text or None
+    
     def _remove_boundary_markers(self, response: str, language: str) -> str:
         """
         Remove boundary markers from AI response.
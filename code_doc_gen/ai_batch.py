@@ -0,0 +1,241 @@
+"""
+Offline batch mode for CodeDocGen's AI comments.
+
+Interactive per-function requests are the slowest and most expensive way to
+document a whole repository. For nightly runs the prompts can instead be
+exported to a JSONL file in the batch format of the OpenAI and Groq batch
+APIs, submitted as one batch job, and the job's result file ingested by a
+second run that applies the comments without any network calls.
+
+Every request carries a stable custom id derived from the file, the function
+and the prompt, so a result only applies to the exact function it was
+generated for; functions changed since the export are left alone.
+"""
+
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable
+
+from .models import Function
+from .config import Config
+from .ai_analyzer import AIAnalyzer
+from .analyzer import IntelligentAnalyzer
+
+
+# Endpoint of every request line; both providers' batch APIs accept it
+BATCH_ENDPOINT = '/v1/chat/completions'
+
+
+def batch_custom_id(relative_path: str, function: Function, prompt: str) -> str:
+    """
+    Compute the custom id of a function's batch request.
+
+    Args:
+        relative_path: Path of the function's file relative to the repository
+        function: Function being documented
+        prompt: Prompt sent for the function
+
+    Returns:
+        Id that is equal across runs as long as the file path, the function's
+        name and its prompt (signature and body) are unchanged
+    """
+    digest = hashlib.sha1()
+    for part in (relative_path, function.get_full_name(), str(prompt)):
+        digest.update(part.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return f"cdg-{digest.hexdigest()}"
+
+
+class _BatchMode:
+    """Shared prompt construction of the exporter and the ingester."""
+
+    def __init__(self, config: Config, repo_root: Path):
+        """
+        Initialize the batch mode.
+
+        Args:
+            config: Configuration object
+            repo_root: Repository root, against which custom ids are computed
+        """
+        self.config = config
+        self.repo_root = Path(repo_root).resolve()
+        self.ai_analyzer = AIAnalyzer(config)
+        self.logger = logging.getLogger(__name__)
+
+    def _relative_path(self, file_path: Path) -> str:
+        try:
+            return Path(file_path).resolve().relative_to(self.repo_root).as_posix()
+        except ValueError:
+            return Path(file_path).as_posix()
+
+    def _custom_id(self, file_path: Path, function: Function, language: str) -> str:
+        prompt = self.ai_analyzer._create_ai_prompt(function, language)
+        return batch_custom_id(self._relative_path(file_path), function, prompt)
+
+
+class AIBatchExporter(_BatchMode):
+    """Writes the AI prompts of a run as a provider batch input file."""
+
+    def __init__(self, config: Config, repo_root: Path, output_path: Path):
+        """
+        Initialize the exporter.
+
+        Args:
+            config: Configuration object
+            repo_root: Repository root
+            output_path: JSONL file to write the batch requests to
+        """
+        super().__init__(config, repo_root)
+        self.analyzer = IntelligentAnalyzer(config)
+        self.output_path = Path(output_path)
+        self.model = self._batch_model()
+        self.exported = 0
+        self._ids = set()
+        self._file = None
+
+    def _batch_model(self) -> str:
+        """The model of the configured provider; the first one for a Groq model list."""
+        models = self.ai_analyzer.models
+        default = 'gpt-4o-mini' if self.ai_analyzer.ai_provider == 'openai' else 'llama3-8b-8192'
+        model = models.get(self.ai_analyzer.ai_provider, default)
+        if isinstance(model, list):
+            model = model[0] if model else default
+        return model
+
+    def add(self, file_path: Path, functions: List[Function], language: str) -> int:
+        """
+        Export the prompts of a file's undocumented functions.
+
+        Args:
+            file_path: Path to the file
+            functions: Parsed functions of the file
+            language: Programming language
+
+        Returns:
+            Number of requests written
+        """
+        if self._file is None:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.output_path, 'w', encoding='utf-8')
+
+        relative_path = self._relative_path(file_path)
+        written = 0
+        for function in functions:
+            if self.analyzer._is_documented(function, language):
+                continue
+            prompt = self.ai_analyzer._create_ai_prompt(function, language)
+            custom_id = batch_custom_id(relative_path, function, prompt)
+            if custom_id in self._ids:
+                continue
+            self._ids.add(custom_id)
+            request = {
+                'custom_id': custom_id,
+                'method': 'POST',
+                'url': BATCH_ENDPOINT,
+                'body': self.ai_analyzer._completion_request(self.model, prompt),
+            }
+            self._file.write(json.dumps(request, ensure_ascii=False) + '\n')
+            written += 1
+
+        self.exported += written
+        return written
+
+    def close(self) -> None:
+        """Finish the batch file (an empty file if nothing was pending)."""
+        if self._file is None:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            self.output_path.write_text('', encoding='utf-8')
+            return
+        self._file.close()
+        self._file = None
+
+
+class AIBatchIngester(_BatchMode):
+    """Applies the comments of a provider batch result file."""
+
+    def __init__(self, config: Config, repo_root: Path, result_path: Path):
+        """
+        Initialize the ingester and read the result file.
+
+        Args:
+            config: Configuration object
+            repo_root: Repository root
+            result_path: JSONL batch output file of the provider
+        """
+        super().__init__(config, repo_root)
+        self.stats: Dict[str, int] = {'results': 0, 'failed': 0, 'applied': 0}
+        self.responses = self._load(Path(result_path))
+
+    def _load(self, result_path: Path) -> Dict[str, str]:
+        """
+        Read the successful responses of a result file.
+
+        Args:
+            result_path: JSONL batch output file
+
+        Returns:
+            Dictionary mapping custom ids to response texts
+        """
+        responses = {}
+        with open(result_path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                self.stats['results'] += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if not isinstance(entry, dict):
+                    self.logger.warning(f"{result_path}:{line_number}: not a JSON object, skipping")
+                    self.stats['failed'] += 1
+                    continue
+                content = self._response_content(entry)
+                if content is None:
+                    self.logger.warning(f"Batch request {entry.get('custom_id')} failed: {entry.get('error')}")
+                    self.stats['failed'] += 1
+                    continue
+                responses[entry.get('custom_id')] = content
+        return responses
+
+    @staticmethod
+    def _response_content(entry: Dict[str, Any]) -> Optional[str]:
+        """Extract the completion text of a result line, or None for a failed request."""
+        if entry.get('error'):
+            return None
+        try:
+            response = entry.get('response') or {}
+            if response.get('status_code', 200) != 200:
+                return None
+            choices = (response.get('body') or {}).get('choices') or []
+            content = (choices[0].get('message') or {}).get('content') if choices else None
+        except (AttributeError, IndexError, KeyError, TypeError):
+            # Not shaped like a provider result
+            return None
+        if not isinstance(content, str) or not content.strip():
+            return None
+        return content.strip()
+
+    def apply(self, file_path: Path, functions: Iterable[Function], language: str) -> List[str]:
+        """
+        Store the batch comments of a file's functions on them.
+
+        Args:
+            file_path: Path to the file
+            functions: Parsed functions of the file
+            language: Programming language
+
+        Returns:
+            Full names of the functions that received a comment
+        """
+        applied = []
+        for function in functions:
+            response = self.responses.get(self._custom_id(file_path, function, language))
+            if response is None:
+                continue
+            function.brief_description = self.ai_analyzer._parse_ai_response(response, language)
+            applied.append(function.get_full_name())
+        self.stats['applied'] += len(applied)
+        return applied
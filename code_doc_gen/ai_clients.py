@@ -0,0 +1,130 @@
+"""
+Process-wide AI provider clients for CodeDocGen.
+
+Every AIAnalyzer used to build its own Groq/OpenAI client, and with it a new
+HTTP connection pool: one for the CLI's provider check, one per
+IntelligentAnalyzer and one per worker process. The registry builds each
+client lazily on first use and shares it, with a keep-alive connection pool,
+across all analyzers of a process. Clients are never shared across a fork;
+a worker process builds its own on first use.
+"""
+
+import os
+import threading
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+class ClientRegistry:
+    """Lazily built, shared provider clients keyed per process."""
+
+    def __init__(self, max_connections: int = 16, keepalive_expiry: float = 30.0):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Connection pool size of each client
+            keepalive_expiry: Seconds an idle connection is kept open
+        """
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._clients: Dict[Tuple, Any] = {}
+        self._http_clients = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, provider: str, client_class: Any, api_key: str, base_url: Optional[str] = None) -> Any:
+        """
+        Get the shared client for a provider, building it on first use.
+
+        Args:
+            provider: Provider name
+            client_class: SDK client class, e.g. groq.Groq or openai.OpenAI
+            api_key: API key
+            base_url: Optional API endpoint override
+
+        Returns:
+            Client instance
+
+        Raises:
+            Exception: Whatever the SDK raises when the client cannot be built
+        """
+        key = (provider, client_class, api_key, base_url, os.getpid())
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._build(client_class, api_key, base_url)
+                self._clients[key] = client
+                self.created += 1
+        return client
+
+    def _build(self, client_class: Any, api_key: str, base_url: Optional[str]) -> Any:
+        """Build a client with a keep-alive connection pool."""
+        # Retries, backoff and Retry-After are handled by CodeDocGen itself;
+        # SDK-level retries would hide failures from the circuit breakers
+        kwargs: Dict[str, Any] = {'api_key': api_key, 'max_retries': 0}
+        if base_url:
+            kwargs['base_url'] = base_url
+        if HTTPX_AVAILABLE:
+            http_client = httpx.Client(limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ))
+            self._http_clients.append(http_client)
+            kwargs['http_client'] = http_client
+        return client_class(**kwargs)
+
+    def clear(self) -> None:
+        """Drop all clients and close their connection pools."""
+        with self._lock:
+            for http_client in self._http_clients:
+                try:
+                    http_client.close()
+                except Exception as e:
+                    self.logger.debug(f"Failed to close HTTP client: {e}")
+            self._clients.clear()
+            self._http_clients = []
+
+    def _reset_after_fork(self) -> None:
+        # The parent's sockets and lock state must not be used by the child
+        self._clients = {}
+        self._http_clients = []
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get registry statistics for this process.
+
+        Returns:
+            Dictionary with the number of live and built clients
+        """
+        return {'clients': len(self._clients), 'created': self.created}
+
+
+_registry = ClientRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_registry._reset_after_fork)
+
+
+def get_client_registry() -> ClientRegistry:
+    """
+    Get the process-wide client registry.
+
+    Returns:
+        ClientRegistry instance
+    """
+    return _registry
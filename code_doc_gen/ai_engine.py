@@ -0,0 +1,393 @@
+"""
+Concurrent AI request engine for CodeDocGen.
+
+Runs many prompts against the configured AI providers at once on an asyncio
+event loop, with a cap on in-flight requests, per-provider token-bucket rate
+limits (requests and tokens per minute), Retry-After handling and backoff that
+never blocks other requests. Providers are tried fastest first and skipped
+while their circuit breaker is open.
+"""
+
+import time
+import asyncio
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Callable, AsyncIterator
+
+from .ai_health import HealthTracker, CLOSED
+
+
+# A provider call takes a prompt and returns the response text (or None).
+# It may be a coroutine function or a plain blocking function.
+ProviderCall = Callable[[str], Any]
+
+# Marks the end of the result stream
+_DONE = object()
+
+
+class Prompt(str):
+    """
+    Prompt text carrying per-request completion options.
+
+    Behaves as a plain string everywhere (cache keys, logging), so providers
+    that do not know about the options simply ignore them.
+    """
+
+    def __new__(cls, text: str, max_tokens: Optional[int] = None, stop_after_comment: bool = False):
+        """
+        Create a prompt.
+
+        Args:
+            text: Prompt text
+            max_tokens: Response token limit for this request (None for the provider default)
+            stop_after_comment: Whether a streamed response may be cut off once
+                its comment block is complete
+        """
+        prompt = super().__new__(cls, text)
+        prompt.max_tokens = max_tokens
+        prompt.stop_after_comment = stop_after_comment
+        return prompt
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text (about four characters per token).
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    return max(1, len(text) // 4)
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Extract a Retry-After delay from a provider error.
+
+    Understands a ``retry_after`` attribute as well as the ``retry-after-ms``
+    and ``retry-after`` headers of an HTTP response attached to the error
+    (as raised by the Groq and OpenAI SDKs).
+
+    Args:
+        error: Exception raised by a provider call
+
+    Returns:
+        Delay in seconds, or None if the error carries no hint
+    """
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            return None
+
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    try:
+        value = headers.get('retry-after-ms')
+        if value is not None:
+            return max(0.0, float(value) / 1000.0)
+
+        value = headers.get('retry-after')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            # HTTP-date form
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether a provider error is a rate-limit (HTTP 429) response.
+
+    Args:
+        error: Exception raised by a provider call
+
+    Returns:
+        True if the provider asked us to slow down
+    """
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status == 429 or getattr(error, 'retry_after', None) is not None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            per_minute: Tokens added per minute (also the bucket capacity)
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Wait until the requested amount is available and take it.
+
+        Args:
+            amount: Number of tokens to take (capped at the capacity)
+        """
+        amount = min(float(amount), self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class ProviderLimiter:
+    """Request and token rate limits plus Retry-After pauses for one provider."""
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget (None or 0 for unlimited)
+            tokens_per_minute: Token budget (None or 0 for unlimited)
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.blocked_until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back all requests to this provider for a while.
+
+        Args:
+            seconds: Pause length
+        """
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self, token_cost: int) -> None:
+        """
+        Wait for a pause to end and for request and token budget.
+
+        Args:
+            token_cost: Estimated tokens used by the request
+        """
+        delay = self.blocked_until - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.blocked_until - time.monotonic()
+
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            await self.tokens.acquire(token_cost)
+
+
+class AIRequestEngine:
+    """Runs prompts concurrently against an ordered list of providers."""
+
+    def __init__(
+        self,
+        providers: List[Tuple[str, ProviderCall]],
+        concurrency: int = 8,
+        rate_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        max_response_tokens: int = 500,
+        health: Optional[HealthTracker] = None
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            providers: (name, call) pairs, primary provider first
+            concurrency: Maximum number of requests in flight
+            rate_limits: Per-provider {"requests_per_minute": ..., "tokens_per_minute": ...}
+            max_retries: Attempts per provider before falling back to the next one
+            retry_delay: Base delay of the exponential backoff in seconds
+            max_response_tokens: Response tokens counted against the token budget
+            health: Circuit breakers and latencies shared with other engines
+                (default: a tracker of this engine only)
+        """
+        self.providers = providers
+        self.concurrency = max(1, int(concurrency))
+        self.max_retries = max(1, int(max_retries))
+        self.retry_delay = retry_delay
+        self.max_response_tokens = max_response_tokens
+        self.health = health if health is not None else HealthTracker()
+
+        rate_limits = rate_limits or {}
+        self.limiters = {
+            name: ProviderLimiter(
+                rate_limits.get(name, {}).get('requests_per_minute'),
+                rate_limits.get(name, {}).get('tokens_per_minute')
+            )
+            for name, _ in providers
+        }
+
+        # Blocking provider calls run here so they never stall the event loop
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    async def _invoke(self, call: ProviderCall, prompt: str) -> Optional[str]:
+        """Run a provider call, off the event loop if it is blocking."""
+        if inspect.iscoroutinefunction(call):
+            return await call(prompt)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='codedocgen-ai')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call, prompt)
+
+    async def _try_provider(self, name: str, call: ProviderCall, prompt: str) -> Optional[str]:
+        """
+        Try one provider with retries and non-blocking backoff.
+
+        Args:
+            name: Provider name
+            call: Provider call
+            prompt: Prompt to send
+
+        Returns:
+            Response or None if all attempts fail
+        """
+        limiter = self.limiters[name]
+        token_cost = estimate_tokens(prompt) + (getattr(prompt, 'max_tokens', None) or self.max_response_tokens)
+
+        for attempt in range(self.max_retries):
+            await limiter.acquire(token_cost)
+            if not self.health.allow(name):
+                # The circuit opened meanwhile; fall back instead of waiting
+                break
+            started = time.monotonic()
+            try:
+                response = await self._invoke(call, prompt)
+                if response:
+                    self.health.record_success(name, time.monotonic() - started)
+                    return response
+                self.health.record_failure(name)
+            except Exception as e:
+                self.health.record_failure(name)
+                self.logger.warning(f"{name} call attempt {attempt + 1} failed: {e}")
+                if attempt >= self.max_retries - 1 or self.health.state(name) != CLOSED:
+                    break
+
+                retry_after = get_retry_after(e)
+                if retry_after is not None:
+                    # The provider is throttling everyone, not just this request
+                    limiter.pause(retry_after)
+                else:
+                    await asyncio.sleep(self.retry_delay * (2 ** attempt))
+
+        return None
+
+    async def complete(self, prompt: str) -> Optional[str]:
+        """
+        Get a response for one prompt, falling back across providers.
+
+        Args:
+            prompt: Prompt to send
+
+        Returns:
+            Response string or None if every provider failed
+        """
+        calls = dict(self.providers)
+        for name in self.health.order(calls):
+            response = await self._try_provider(name, calls[name], prompt)
+            if response:
+                return response
+
+        self.logger.warning("All AI providers failed")
+        return None
+
+    async def as_completed(self, items: Iterable[Tuple[Any, str]]) -> AsyncIterator[Tuple[Any, Optional[str]]]:
+        """
+        Run many prompts and yield results as each one finishes.
+
+        Prompts are pulled from ``items`` lazily, so at most ``concurrency``
+        requests exist at any time however many items there are.
+
+        Args:
+            items: (key, prompt) pairs
+
+        Yields:
+            (key, response) pairs in completion order
+        """
+        results: "asyncio.Queue" = asyncio.Queue()
+        iterator = iter(items)
+
+        async def worker() -> None:
+            for key, prompt in iterator:
+                await results.put((key, await self.complete(prompt)))
+
+        async def supervise() -> None:
+            try:
+                await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            finally:
+                await results.put(_DONE)
+
+        supervisor = asyncio.ensure_future(supervise())
+        try:
+            while True:
+                item = await results.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            if not supervisor.done():
+                supervisor.cancel()
+            try:
+                await supervisor
+            except asyncio.CancelledError:
+                pass
+
+    def run(
+        self,
+        items: Iterable[Tuple[Any, str]],
+        on_result: Optional[Callable[[Any, Optional[str]], None]] = None
+    ) -> Dict[Any, Optional[str]]:
+        """
+        Run many prompts to completion from synchronous code.
+
+        Args:
+            items: (key, prompt) pairs
+            on_result: Called with (key, response) as each prompt finishes
+
+        Returns:
+            Dictionary mapping keys to responses
+        """
+        async def collect() -> Dict[Any, Optional[str]]:
+            collected = {}
+            async for key, response in self.as_completed(items):
+                collected[key] = response
+                if on_result is not None:
+                    on_result(key, response)
+            return collected
+
+        return asyncio.run(collect())
+
+    def close(self) -> None:
+        """Release the worker threads used for blocking provider calls."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
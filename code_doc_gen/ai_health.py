@@ -0,0 +1,256 @@
+"""
+Provider and model health tracking for CodeDocGen.
+
+Keeps a circuit breaker and a window of recent latencies for every AI
+provider ("groq") and model ("groq/llama3-8b-8192"). After a run of
+consecutive failures a target is skipped for a cooldown window instead of
+being retried with backoff for every function; afterwards a single probe
+request decides whether it is healthy again. Healthy targets are tried in
+order of their recent median latency.
+"""
+
+import os
+import time
+import threading
+import statistics
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterable
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class TargetHealth:
+    """Health record of one provider or model."""
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.circuit_opens = 0
+        self.skipped = 0
+        self.open_until = 0.0
+        self.probe_started: Optional[float] = None
+
+    def p50(self) -> Optional[float]:
+        return statistics.median(self.latencies) if self.latencies else None
+
+
+class HealthTracker:
+    """Circuit breakers and latency-aware ordering of AI targets."""
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0, window: int = 20):
+        """
+        Initialize the tracker.
+
+        Args:
+            failure_threshold: Consecutive failures that open a target's circuit
+            cooldown: Seconds an open circuit skips its target
+            window: Recent latencies kept per target for the median
+        """
+        self._lock = threading.Lock()
+        self._targets: Dict[str, TargetHealth] = {}
+        self.configure(failure_threshold, cooldown, window)
+
+    def configure(self, failure_threshold: int = 3, cooldown: float = 60.0, window: int = 20) -> None:
+        """
+        Change the breaker settings; recorded health is kept.
+
+        Args:
+            failure_threshold: Consecutive failures that open a target's circuit
+            cooldown: Seconds an open circuit skips its target
+            window: Recent latencies kept per target for the median
+        """
+        with self._lock:
+            self.failure_threshold = max(1, int(failure_threshold))
+            self.cooldown = float(cooldown)
+            self.window = max(1, int(window))
+
+    def _get(self, target: str) -> TargetHealth:
+        health = self._targets.get(target)
+        if health is None:
+            health = self._targets[target] = TargetHealth(self.window)
+        return health
+
+    def _state(self, health: TargetHealth, now: float) -> str:
+        if health.consecutive_failures < self.failure_threshold:
+            return CLOSED
+        return OPEN if now < health.open_until else HALF_OPEN
+
+    def state(self, target: str) -> str:
+        """
+        Get the circuit state of a target.
+
+        Args:
+            target: Provider or "provider/model" name
+
+        Returns:
+            'closed', 'open' or 'half-open'
+        """
+        with self._lock:
+            return self._state(self._get(target), time.monotonic())
+
+    def order(self, targets: Iterable[str]) -> List[str]:
+        """
+        Order targets for a request: open circuits are left out, the rest sorted by recent median latency.
+
+        Targets without latency samples yet sort first, in the given order, so
+        every target gets measured.
+
+        Args:
+            targets: Candidate targets in configured preference order
+
+        Returns:
+            Targets to try, fastest first
+        """
+        now = time.monotonic()
+        ranked = []
+        with self._lock:
+            for index, target in enumerate(targets):
+                health = self._get(target)
+                if self._state(health, now) == OPEN:
+                    health.skipped += 1
+                    continue
+                ranked.append((health.p50() or 0.0, index, target))
+        ranked.sort()
+        return [target for _, _, target in ranked]
+
+    def allow(self, target: str) -> bool:
+        """
+        Check whether a request may be sent to a target now.
+
+        A half-open target admits one probe request at a time.
+
+        Args:
+            target: Provider or "provider/model" name
+
+        Returns:
+            True if the request may be sent
+        """
+        now = time.monotonic()
+        with self._lock:
+            health = self._get(target)
+            state = self._state(health, now)
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and (health.probe_started is None or now - health.probe_started > self.cooldown):
+                health.probe_started = now
+                return True
+            health.skipped += 1
+            return False
+
+    def record_success(self, target: str, latency: float) -> None:
+        """
+        Record a successful request; closes the target's circuit.
+
+        Args:
+            target: Provider or "provider/model" name
+            latency: Request latency in seconds
+        """
+        with self._lock:
+            health = self._get(target)
+            health.requests += 1
+            health.latencies.append(latency)
+            health.consecutive_failures = 0
+            health.probe_started = None
+
+    def record_failure(self, target: str) -> None:
+        """
+        Record a failed request; opens the target's circuit at the failure threshold.
+
+        Args:
+            target: Provider or "provider/model" name
+        """
+        now = time.monotonic()
+        with self._lock:
+            health = self._get(target)
+            was_open = self._state(health, now) == OPEN
+            health.requests += 1
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.probe_started = None
+            if health.consecutive_failures >= self.failure_threshold:
+                if not was_open:
+                    health.circuit_opens += 1
+                health.open_until = now + self.cooldown
+
+    def reset(self) -> None:
+        """Forget all recorded health."""
+        with self._lock:
+            self._targets = {}
+
+    def _reset_after_fork(self) -> None:
+        # Each worker reports its own requests, so start from a clean record
+        self._lock = threading.Lock()
+        self._targets = {}
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get health statistics of every target.
+
+        Returns:
+            Dictionary mapping targets to requests, failures, circuit state and
+            opens, skipped requests and recent latencies (seconds)
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                target: {
+                    'requests': health.requests,
+                    'failures': health.failures,
+                    'circuit_opens': health.circuit_opens,
+                    'skipped': health.skipped,
+                    'state': self._state(health, now),
+                    'latencies': list(health.latencies),
+                }
+                for target, health in self._targets.items()
+            }
+
+
+def merge_health_stats(snapshots: Iterable[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Combine the health statistics of several processes.
+
+    Args:
+        snapshots: HealthTracker.get_stats() results
+
+    Returns:
+        Dictionary mapping targets to summed counters, the worst circuit state
+        and the median latency 'p50' in seconds (None without samples)
+    """
+    severity = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for target, stats in snapshot.items():
+            entry = merged.setdefault(target, {
+                'requests': 0, 'failures': 0, 'circuit_opens': 0, 'skipped': 0, 'state': CLOSED, 'latencies': [],
+            })
+            for counter in ('requests', 'failures', 'circuit_opens', 'skipped'):
+                entry[counter] += stats[counter]
+            if severity[stats['state']] > severity[entry['state']]:
+                entry['state'] = stats['state']
+            entry['latencies'].extend(stats['latencies'])
+
+    for entry in merged.values():
+        latencies = entry.pop('latencies')
+        entry['p50'] = statistics.median(latencies) if latencies else None
+    return merged
+
+
+_tracker = HealthTracker()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_tracker._reset_after_fork)
+
+
+def get_health_tracker() -> HealthTracker:
+    """
+    Get the process-wide health tracker.
+
+    Returns:
+        HealthTracker instance
+    """
+    return _tracker
@@ -0,0 +1,254 @@
+"""
+Budgeted, priority-ordered AI scheduling for CodeDocGen.
+
+Without a budget, AI analysis runs file by file in discovery order until the
+repository is done. With one, the whole repository is parsed and analyzed
+with NLTK first; the undocumented functions are then ranked by value (public
+API, cyclomatic complexity, size and call fan-in) and only the top ones, as
+many as the request or token budget allows, are sent to the AI providers.
+The rest keep their NLTK documentation, so a budgeted run finishes in
+predictable time and cost.
+"""
+
+import re
+import math
+import logging
+from collections import Counter
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
+
+from .models import Function
+from .config import Config
+from .ai_analyzer import AIAnalyzer
+from .ai_engine import estimate_tokens
+from .analyzer import IntelligentAnalyzer
+from .generator import DocumentationGenerator
+from .fingerprint import fingerprint_function
+from .prompt_compactor import strip_comments
+
+
+REQUESTS = 'requests'
+TOKENS = 'tokens'
+
+# Identifiers followed by an opening parenthesis: calls (and definitions)
+_CALL = re.compile(r'\b([A-Za-z_$][\w$]*)\s*\(')
+
+# Branch points of C-family and JavaScript code, for languages without a complexity score
+_BRANCH = re.compile(r'\b(?:if|for|while|case|catch)\b|&&|\|\||\?')
+
+# Access modifiers before a function name
+_PRIVATE = re.compile(r'\b(?:private|static)\b')
+
+
+class _Candidate:
+    """An undocumented function, with the duplicates that share its analysis."""
+
+    def __init__(self, function: Function, language: str, fingerprint: Optional[str]):
+        self.function = function
+        self.language = language
+        self.fingerprint = fingerprint
+        self.duplicates: List[Function] = []
+        self.score = 0.0
+        self.cost = 1
+
+
+class AIScheduler:
+    """Sends the most valuable undocumented functions of a run to AI, within a budget."""
+
+    def __init__(self, config: Config, budget: int, unit: str = REQUESTS):
+        """
+        Initialize the scheduler.
+
+        Args:
+            config: Configuration object with the AI settings to use for scheduled functions
+            budget: Number of AI requests, or estimated tokens (prompt plus response limit), to spend
+            unit: 'requests' or 'tokens'
+        """
+        if unit not in (REQUESTS, TOKENS):
+            raise ValueError(f"Unknown budget unit: {unit}")
+        self.config = config
+        self.budget = max(0, int(budget))
+        self.unit = unit
+        self.logger = logging.getLogger(__name__)
+
+        weights = config.get_ai_config().get('scheduling', {})
+        self.public_weight = weights.get('public_weight', 3.0)
+        self.complexity_weight = weights.get('complexity_weight', 1.0)
+        self.size_weight = weights.get('size_weight', 1.0)
+        self.fan_in_weight = weights.get('fan_in_weight', 2.0)
+
+        self.analyzer = IntelligentAnalyzer(config)
+        self.ai_analyzer = AIAnalyzer(config)
+        self.generator = DocumentationGenerator(config)
+        self.stats: Dict[str, int] = {
+            'candidates': 0, 'scheduled': 0, 'cached': 0, 'documented': 0, 'fallback': 0, 'spent': 0,
+        }
+
+    def run(self, results: Iterable[Any]) -> Iterator[Any]:
+        """
+        Apply AI comments to the top-ranked functions of a run's results.
+
+        The results must come from a run without AI analysis; all of them are
+        collected before the first one is yielded.
+
+        Args:
+            results: FileResult objects of the run
+
+        Yields:
+            The same FileResult objects, with regenerated documentation where
+            functions received AI comments
+        """
+        results = list(results)
+        candidates = self._collect(results)
+        scheduled = self.select(candidates)
+
+        by_language: Dict[str, List[_Candidate]] = {}
+        for candidate in scheduled:
+            by_language.setdefault(candidate.language, []).append(candidate)
+
+        documented = set()
+        for language, group in by_language.items():
+            comments = self.ai_analyzer.analyze_functions([c.function for c in group], language)
+            for candidate, comment in zip(group, comments):
+                if not comment:
+                    continue
+                for function in [candidate.function] + candidate.duplicates:
+                    function.brief_description = comment
+                    documented.add(id(function))
+                self.stats['documented'] += 1
+
+        self.stats['fallback'] = self.stats['candidates'] - self.stats['documented']
+        for result in results:
+            if result.language and any(id(f) in documented for f in result.functions):
+                result.documentation = self.generator.generate_documentation(result.functions, result.language)
+            yield result
+
+    def _collect(self, results: List[Any]) -> List[_Candidate]:
+        """
+        Gather the undocumented functions of a run, merging identical ones, and score them.
+
+        Args:
+            results: FileResult objects
+
+        Returns:
+            Candidates, one per distinct function
+        """
+        calls = Counter()
+        for result in results:
+            for function in result.functions:
+                calls.update(_CALL.findall(function.source_code or ''))
+
+        candidates: List[_Candidate] = []
+        by_fingerprint: Dict[str, _Candidate] = {}
+        for result in results:
+            if not result.language:
+                continue
+            for function in result.functions:
+                if self.analyzer._is_documented(function, result.language):
+                    continue
+                fingerprint = fingerprint_function(function, result.language)
+                if fingerprint is not None and fingerprint in by_fingerprint:
+                    by_fingerprint[fingerprint].duplicates.append(function)
+                    continue
+                candidate = _Candidate(function, result.language, fingerprint)
+                if fingerprint is not None:
+                    by_fingerprint[fingerprint] = candidate
+                candidates.append(candidate)
+
+        for candidate in candidates:
+            function = candidate.function
+            own_calls = _CALL.findall(function.source_code or '').count(function.name)
+            fan_in = calls[function.name] - own_calls
+            candidate.score = self.score(function, candidate.language, fan_in)
+
+        self.stats['candidates'] = len(candidates)
+        return candidates
+
+    def score(self, function: Function, language: str, fan_in: int = 0) -> float:
+        """
+        Score how much a function gains from an AI comment.
+
+        Args:
+            function: Function to score
+            language: Programming language
+            fan_in: Call sites of the function's name elsewhere in the repository
+
+        Returns:
+            Weighted sum of public API, log2 complexity, log2 size and log2 fan-in
+        """
+        lines = function.source_code.count('\n') + 1 if function.source_code else 1
+        return (self.public_weight * self._is_public(function, language)
+                + self.complexity_weight * math.log2(1 + self._complexity(function, language))
+                + self.size_weight * math.log2(1 + lines)
+                + self.fan_in_weight * math.log2(1 + max(0, fan_in)))
+
+    @staticmethod
+    def _is_public(function: Function, language: str) -> bool:
+        """Whether a function is part of its module's public API."""
+        name = function.name
+        # Free functions have no class; libclang leaves class_name None for them
+        if (function.class_name or '').startswith('_'):
+            return False
+        if name.startswith('__') and name.endswith('__'):
+            return True
+        if name.startswith(('_', '#')):
+            return False
+        if language in ('java', 'c++'):
+            head = (function.source_code or '').split('(', 1)[0]
+            return not _PRIVATE.search(head)
+        return True
+
+    @staticmethod
+    def _complexity(function: Function, language: str) -> int:
+        """Cyclomatic complexity: the parser's score if it computed one, otherwise counted branch points."""
+        score = getattr(function.body, 'complexity_score', None)
+        if score is not None:
+            return score
+        return 1 + len(_BRANCH.findall(strip_comments(function.source_code or '', language)))
+
+    def _cost(self, candidate: _Candidate) -> Tuple[int, bool]:
+        """
+        Estimate what analyzing a candidate spends of the budget.
+
+        Returns:
+            Tuple of (cost in budget units, whether the response is cached and so free)
+        """
+        prompt = self.ai_analyzer._create_ai_prompt(candidate.function, candidate.language)
+        if self.ai_analyzer._get_cached_response(prompt):
+            return 0, True
+        if self.unit == REQUESTS:
+            return 1, False
+        return estimate_tokens(prompt) + (getattr(prompt, 'max_tokens', None) or self.ai_analyzer.MAX_RESPONSE_TOKENS), False
+
+    def select(self, candidates: List[_Candidate]) -> List[_Candidate]:
+        """
+        Pick the highest scoring candidates that fit the budget.
+
+        Candidates too expensive for the remaining budget are passed over in
+        favor of cheaper, lower scoring ones.
+
+        Args:
+            candidates: Scored candidates
+
+        Returns:
+            Candidates to analyze with AI, highest score first
+        """
+        ranked = sorted(candidates, key=lambda c: -c.score)
+        selected = []
+        remaining = self.budget
+        for candidate in ranked:
+            cost, cached = self._cost(candidate)
+            if cost > remaining:
+                continue
+            remaining -= cost
+            candidate.cost = cost
+            selected.append(candidate)
+            if cached:
+                self.stats['cached'] += 1
+
+        self.stats['scheduled'] = len(selected)
+        self.stats['spent'] = self.budget - remaining
+        self.logger.info(
+            f"AI budget: {len(selected)} of {len(candidates)} undocumented functions scheduled, "
+            f"{self.budget - remaining} of {self.budget} {self.unit}"
+        )
+        return selected
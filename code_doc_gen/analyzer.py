@@ -9,19 +9,26 @@ import re
 import ast
 import nltk
 from typing import List, Dict, Optional, Tuple
-from nltk.tokenize import word_tokenize
 from nltk.corpus import wordnet
-from nltk import pos_tag
 from .models import Function, Parameter, FunctionBody, FunctionException
 from .config import Config
 from .ast_analyzer import ASTAnalyzer
 from .ai_analyzer import AIAnalyzer
+from .nlp import ensure_nltk_resources, tokenize, tag_identifier, tag_identifiers
+from .fingerprint import fingerprint_function
+from .parsers.spans import documentation_precedes
 import logging
 
 
 class IntelligentAnalyzer:
     """Intelligent analyzer that uses AI, NLTK, and regex-based analysis."""
     
+    # Functions tagged per batch; keeps primed tags well inside the tagger's LRU
+    BATCH_SIZE = 1024
+    
+    # Analysis results remembered by fingerprint, across files of a run
+    MAX_FINGERPRINTS = 100000
+    
     def __init__(self, config: Config):
         self.config = config
         self.logger = logging.getLogger(__name__)
@@ -32,21 +39,203 @@ class IntelligentAnalyzer:
         # Initialize AST analyzer
         self.ast_analyzer = ASTAnalyzer()
         
+        # Fingerprint -> (brief, detailed, parameter descriptions) of analyzed functions
+        self._analyses: Dict[str, Tuple[Optional[str], Optional[str], List[Optional[str]]]] = {}
+        self.dedup_stats = {'functions': 0, 'duplicates': 0}
+        
         # Ensure NLTK resources are available
         self._ensure_nltk_resources()
         
         # Patterns for function name analysis
         self.camel_case_pattern = re.compile(r'([A-Z][a-z0-9]+)')
         self.snake_case_pattern = re.compile(r'_([a-z0-9])')
+        self.name_split_pattern = re.compile(r'_|(?=[A-Z])')
     
     def _ensure_nltk_resources(self) -> None:
-        """Download required NLTK resources for intelligent analysis."""
-        resources = ['punkt', 'averaged_perceptron_tagger', 'wordnet']
-        for resource in resources:
-            try:
-                nltk.data.find(resource)
-            except LookupError:
-                nltk.download(resource, quiet=True)
+        """Download required NLTK resources for intelligent analysis (checked once per process)."""
+        ensure_nltk_resources(self.config.get_nltk_config().get('download_data', True))
+    
+    def analyze_functions(self, functions: List[Function], language: str = "python",
+                          lines: Optional[List[str]] = None) -> None:
+        """
+        Analyze many functions, with their parameters and exceptions, as a batch.
+        
+        The identifier words of all functions and parameters in a batch are
+        POS-tagged in a single nltk.pos_tag_sents pass first, so the per-function
+        analysis only reads memoized tags. With AI enabled, the AI requests of
+        the undocumented functions in a batch run concurrently instead.
+        
+        Undocumented functions with the same fingerprint (name, signature and
+        normalized body) are analyzed once, before any AI or NLTK work, and
+        share the result, also with earlier files of the run.
+        
+        Args:
+            functions: Functions to analyze
+            language: Programming language for AI analysis
+            lines: Lines of the file the functions were parsed from; functions whose
+                recorded definition line follows a documentation comment are skipped
+        """
+        if lines is not None:
+            for function in functions:
+                if function.line_number is not None:
+                    function.preceded_by_documentation = documentation_precedes(lines, function.line_number - 1)
+        
+        for start in range(0, len(functions), self.BATCH_SIZE):
+            batch = functions[start:start + self.BATCH_SIZE]
+            
+            pending = [f for f in batch if not self._is_documented(f, language)]
+            unique, duplicates = self._deduplicate(pending, language)
+            
+            if self.ai_analyzer is None:
+                self._prime_tagger([function for _, function in unique])
+                comments = [None] * len(unique)
+            else:
+                # With AI enabled most functions never reach the NLTK fallback;
+                # their AI requests run concurrently instead
+                comments = self.ai_analyzer.analyze_functions([function for _, function in unique], language)
+            
+            for (fingerprint, function), comment in zip(unique, comments):
+                self._apply_analysis(function, comment)
+                self._remember_analysis(fingerprint, function)
+            
+            for fingerprint, function in duplicates:
+                self._reuse_analysis(fingerprint, function, language)
+            
+            for function in batch:
+                for parameter in function.parameters:
+                    self.analyze_parameter(parameter)
+                
+                for exception in function.exceptions:
+                    self.analyze_exception(exception)
+    
+    def _deduplicate(
+        self,
+        functions: List[Function],
+        language: str
+    ) -> Tuple[List[Tuple[Optional[str], Function]], List[Tuple[str, Function]]]:
+        """
+        Split functions into the ones to analyze and the ones that can reuse an analysis.
+        
+        Args:
+            functions: Undocumented functions
+            language: Programming language
+            
+        Returns:
+            Tuple of (unique, duplicates), each a list of (fingerprint, function);
+            duplicates repeat a unique function or one analyzed earlier.
+            Functions without a fingerprint are always unique.
+        """
+        unique = []
+        duplicates = []
+        seen = set(self._analyses)
+        for function in functions:
+            fingerprint = fingerprint_function(function, language)
+            if fingerprint is not None and fingerprint in seen:
+                duplicates.append((fingerprint, function))
+            else:
+                seen.add(fingerprint)
+                unique.append((fingerprint, function))
+        
+        self.dedup_stats['functions'] += len(functions)
+        self.dedup_stats['duplicates'] += len(duplicates)
+        return unique, duplicates
+    
+    def _remember_analysis(self, fingerprint: Optional[str], function: Function) -> None:
+        """Keep the analysis result of a function for functions with the same fingerprint."""
+        if fingerprint is not None and len(self._analyses) < self.MAX_FINGERPRINTS:
+            self._analyses[fingerprint] = (
+                function.brief_description,
+                function.detailed_description,
+                [parameter.description for parameter in function.parameters],
+            )
+    
+    def _reuse_analysis(self, fingerprint: str, function: Function, language: str) -> None:
+        """Copy a remembered analysis result onto a function with the same fingerprint."""
+        analysis = self._analyses.get(fingerprint)
+        if analysis is None:
+            # Not remembered (table full); analyze it after all
+            ai_comment = self.ai_analyzer.analyze_function(function, language) if self.ai_analyzer else None
+            self._apply_analysis(function, ai_comment)
+            return
+        brief, detailed, parameter_descriptions = analysis
+        function.brief_description = brief
+        function.detailed_description = detailed
+        for parameter, description in zip(function.parameters, parameter_descriptions):
+            if description:
+                parameter.description = description
+    
+    def _prime_tagger(self, functions: List[Function]) -> None:
+        """
+        Tag the identifier words of functions and parameters in one NLTK call.
+        
+        Args:
+            functions: Functions about to be analyzed
+        """
+        sentences = []
+        for function in functions:
+            # The same sequences the per-function analysis tags, so it only reads memoized tags
+            sentences.append(self._split_function_name(function.name))
+            builders = [(self._sentence_tokens, function.name), (self._lowercase_tokens, function.name)]
+            builders += [(self._lowercase_tokens, parameter.name) for parameter in function.parameters]
+            for build, identifier in builders:
+                try:
+                    sentences.append(build(identifier))
+                except (LookupError, OSError, ImportError):
+                    continue
+        
+        try:
+            tag_identifiers(sentences)
+        except (LookupError, OSError, ImportError):
+            # Per-function analysis takes its own fallbacks
+            pass
+    
+    def _split_function_name(self, name: str) -> List[str]:
+        """
+        Split a snake_case or camelCase function name into words.
+        
+        Args:
+            name: Function name
+            
+        Returns:
+            List of words
+        """
+        return self.name_split_pattern.split(name)
+    
+    def _name_words(self, name: str) -> List[str]:
+        """
+        Split a camelCase, or else snake_case, name into words.
+        
+        Args:
+            name: Function name
+            
+        Returns:
+            List of words
+        """
+        return self.camel_case_pattern.findall(name) or name.split('_')
+    
+    def _sentence_tokens(self, name: str) -> Tuple[str, ...]:
+        """
+        Tokenize the words of a name as a sentence, for _name_to_sentence.
+        
+        Args:
+            name: Function name
+            
+        Returns:
+            Tuple of tokens
+        """
+        return tokenize(' '.join(self._name_words(name)))
+    
+    def _lowercase_tokens(self, identifier: str) -> Tuple[str, ...]:
+        """
+        Tokenize a lowercased identifier, for return type and parameter descriptions.
+        
+        Args:
+            identifier: Function or parameter name
+            
+        Returns:
+            Tuple of tokens
+        """
+        return tokenize(identifier.lower())
     
     def analyze_function(self, function: Function, language: str = "python") -> None:
         """
@@ -57,20 +246,53 @@ class IntelligentAnalyzer:
             language: Programming language for AI analysis
         """
         # Check if function already has documentation using enhanced detection
-        if self._has_existing_documentation(function, language) or self.has_existing_documentation(function.source_code, language):
-            self.logger.debug(f"Function {function.name} already has documentation, skipping")
+        if self._is_documented(function, language):
             return  # Skip if already documented
         
         self.logger.debug(f"=== Analyzing function: {function.name} ===")
         
+        # Reuse the analysis of an identical function
+        unique, duplicates = self._deduplicate([function], language)
+        if duplicates:
+            self._reuse_analysis(duplicates[0][0], function, language)
+            return
+        
         # Try AI analysis first if enabled
+        ai_comment = None
         if self.ai_analyzer:
             ai_comment = self.ai_analyzer.analyze_function(function, language)
+        
+        self._apply_analysis(function, ai_comment)
+        self._remember_analysis(unique[0][0], function)
+    
+    def _is_documented(self, function: Function, language: str) -> bool:
+        """
+        Check whether a function already has documentation.
+        
+        Args:
+            function: Function to check
+            language: Programming language
             
-            if ai_comment:
-                self.logger.debug(f"AI generated comment for {function.name}: {ai_comment}")
-                function.brief_description = ai_comment
-                return
+        Returns:
+            True if the function should be skipped
+        """
+        if self._has_existing_documentation(function, language) or self.has_existing_documentation(function.source_code, language):
+            self.logger.debug(f"Function {function.name} already has documentation, skipping")
+            return True
+        return False
+    
+    def _apply_analysis(self, function: Function, ai_comment: Optional[str]) -> None:
+        """
+        Store an AI comment on a function, or fall back to NLTK analysis.
+        
+        Args:
+            function: Function being analyzed
+            ai_comment: Comment returned by the AI analyzer, if any
+        """
+        if ai_comment:
+            self.logger.debug(f"AI generated comment for {function.name}: {ai_comment}")
+            function.brief_description = ai_comment
+            return
         
         self.logger.debug(f"AI analysis failed for {function.name}, falling back to NLTK")
         
@@ -139,6 +361,12 @@ class IntelligentAnalyzer:
         if not function.source_code:
             return False
         
+        # Parsers that record a function's line start its source at the
+        # definition line, so no comment of its own can precede it there; the
+        # file's lines before it are checked by analyze_functions instead
+        if function.line_number is not None:
+            return bool(function.preceded_by_documentation)
+        
         # Get the lines before the function definition
         lines = function.source_code.split('\n')
         function_line_idx = -1
@@ -226,13 +454,13 @@ class IntelligentAnalyzer:
             Tuple of (verb, object)
         """
         # Split snake_case or camelCase
-        words = re.split(r'_|(?=[A-Z])', name)
+        words = self._split_function_name(name)
         if not words:
             return "processes", "data"
         
         try:
             # Use NLTK for POS tagging
-            tagged = pos_tag(words)
+            tagged = tag_identifier(words)
             
             # Find best verb candidate with more specific mapping
             verbs = [word for word, pos in tagged if pos.startswith('VB')]
@@ -447,11 +675,8 @@ class IntelligentAnalyzer:
         if name.lower() == 'main':
             return "Entry point of the program."
         
-        # Convert camelCase to words
-        words = self.camel_case_pattern.findall(name)
-        if not words:
-            # Convert snake_case to words
-            words = name.split('_')
+        # Convert camelCase, or else snake_case, to words
+        words = self._name_words(name)
         
         if not words:
             return f"Performs {name} operation."
@@ -459,8 +684,8 @@ class IntelligentAnalyzer:
         # Use NLTK for intelligent analysis
         try:
             # Tokenize the words
-            tokens = nltk.word_tokenize(' '.join(words))
-            pos_tags = nltk.pos_tag(tokens)
+            tokens = self._sentence_tokens(name)
+            pos_tags = tag_identifier(tokens)
             
             # Analyze the structure
             verbs = [word for word, tag in pos_tags if tag.startswith('VB')]
@@ -601,8 +826,8 @@ class IntelligentAnalyzer:
         
         try:
             # Use NLTK to understand function purpose and return type
-            tokens = word_tokenize(func_name)
-            pos_tags = pos_tag(tokens)
+            tokens = self._lowercase_tokens(function.name)
+            pos_tags = tag_identifier(tokens)
             
             verbs = [word for word, tag in pos_tags if tag.startswith('VB')]
             nouns = [word for word, tag in pos_tags if tag.startswith('NN')]
@@ -737,8 +962,8 @@ class IntelligentAnalyzer:
         
         try:
             # Use NLTK to understand parameter meaning
-            tokens = word_tokenize(param_name)
-            pos_tags = pos_tag(tokens)
+            tokens = self._lowercase_tokens(parameter.name)
+            pos_tags = tag_identifier(tokens)
             
             # Analyze parameter name structure
             if len(tokens) == 1:
@@ -0,0 +1,541 @@
+"""
+Persistent caches for CodeDocGen.
+
+Stores parsed and analyzed functions in a content-addressed SQLite database so
+that unchanged files skip parsing and analysis on subsequent runs, and AI
+responses keyed by prompt so that unchanged functions skip the network.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from .models import Function, FunctionType, Parameter, FunctionException, FunctionBody
+from .content import FileContent
+from .config import Config
+
+
+def cache_directory(config: Config, repo_root: Path) -> Path:
+    """
+    Get the directory holding the caches of a repository.
+
+    Args:
+        config: Configuration object
+        repo_root: Repository root
+
+    Returns:
+        Cache directory (relative settings are resolved against the repository)
+    """
+    directory = Path(config.get_cache_config().get('directory', '.codedocgen-cache'))
+    return directory if directory.is_absolute() else Path(repo_root) / directory
+
+
+class SQLiteStore:
+    """Size-capped on-disk key/value store with LRU eviction and optional TTL."""
+
+    # How many stores to accept between two size checks
+    _EVICTION_CHECK_INTERVAL = 32
+
+    def __init__(self, db_path: Path, max_size_bytes: int, enabled: bool = True, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite database file
+            max_size_bytes: Size cap enforced by LRU eviction
+            enabled: Whether the store is used at all
+            ttl_seconds: Maximum entry age (None or 0 for no expiry)
+        """
+        self.enabled = enabled
+        self.db_path = Path(db_path)
+        self.directory = self.db_path.parent
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds or None
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        self._stores_since_check = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # SQLite connections cannot cross process boundaries
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        state['_connection_pid'] = None
+        return state
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """
+        Open (or reuse) the SQLite connection for the current process.
+
+        Returns:
+            SQLite connection or None if the store cannot be opened
+        """
+        if self._connection is not None and self._connection_pid == os.getpid():
+            return self._connection
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Worker threads of the AI engine share the connection
+            connection = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL,"
+                " created REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(entries)")}
+            if 'created' not in columns:
+                # Databases written before entries expired
+                connection.execute("ALTER TABLE entries ADD COLUMN created REAL NOT NULL DEFAULT 0")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)")
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"Cache disabled, could not open {self.db_path}: {e}")
+            self.enabled = False
+            return None
+
+        self._connection = connection
+        self._connection_pid = os.getpid()
+        return connection
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """
+        Look up a raw entry, dropping it if it has expired.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Stored bytes, or None on a miss
+        """
+        payload = self._read(key)
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return payload
+
+    def _read(self, key: str) -> Optional[bytes]:
+        """
+        Read a raw entry without counting the lookup, dropping it if it has expired.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Stored bytes, or None if there is no usable entry
+        """
+        connection = self._connect() if self.enabled else None
+        if connection is None:
+            return None
+
+        try:
+            row = connection.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                return None
+            connection.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            self.logger.debug(f"Cache read failed for {key}: {e}")
+            return None
+
+        return row[0]
+
+    def put_bytes(self, key: str, payload: bytes) -> None:
+        """
+        Store a raw entry.
+
+        Args:
+            key: Entry key
+            payload: Bytes to store
+        """
+        connection = self._connect() if self.enabled else None
+        if connection is None or len(payload) > self.max_size_bytes:
+            return
+
+        now = time.time()
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access, created) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now)
+            )
+        except sqlite3.Error as e:
+            self.logger.debug(f"Cache write failed for {key}: {e}")
+            return
+
+        self.stores += 1
+        self._stores_since_check += 1
+        if self._stores_since_check >= self._EVICTION_CHECK_INTERVAL:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Drop expired entries, then evict least recently used entries until the
+        store fits its size cap.
+
+        Returns:
+            Number of evicted entries
+        """
+        self._stores_since_check = 0
+        connection = self._connect() if self.enabled else None
+        if connection is None:
+            return 0
+
+        try:
+            expired = 0
+            if self.ttl_seconds:
+                expired = connection.execute(
+                    "DELETE FROM entries WHERE created < ?", (time.time() - self.ttl_seconds,)
+                ).rowcount
+
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            doomed = []
+            if total > self.max_size_bytes:
+                # Trim to 90% of the cap so that eviction does not run on every store
+                target = int(self.max_size_bytes * 0.9)
+                for key, size in connection.execute("SELECT key, size FROM entries ORDER BY last_access ASC"):
+                    if total <= target:
+                        break
+                    doomed.append((key,))
+                    total -= size
+
+                connection.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        except sqlite3.Error as e:
+            self.logger.debug(f"Cache eviction failed: {e}")
+            return 0
+
+        self.evictions += expired + len(doomed)
+        return expired + len(doomed)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        connection = self._connect() if self.enabled else None
+        if connection is not None:
+            connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Enforce the size cap and close the database connection."""
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self.evict()
+            self._connection.close()
+        self._connection = None
+        self._connection_pid = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss statistics for this process.
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+# Types of the plain Function attributes stored in the parse cache
+_TEXT = (str, type(None))
+_LINE = (int, type(None))
+_FUNCTION_FIELDS: Dict[str, tuple] = {
+    'name': (str,),
+    'return_type': _TEXT,
+    'class_name': _TEXT,
+    'brief_description': _TEXT,
+    'detailed_description': _TEXT,
+    'source_code': _TEXT,
+    'start_offset': _LINE,
+    'end_offset': _LINE,
+    'line_number': _LINE,
+    'end_line': _LINE,
+    'preceded_by_documentation': (bool, type(None)),
+}
+
+# Values a FunctionBody attribute may hold; parsers add counters beyond the defaults
+_BODY_VALUE = (bool, int, float, str, type(None))
+
+
+def _function_to_dict(function: Function) -> Dict[str, Any]:
+    """
+    Convert an analyzed function to JSON-serializable data.
+
+    The AST node is not stored: it is only used while analyzing.
+
+    Args:
+        function: Analyzed Function object
+
+    Returns:
+        Dictionary of plain values
+    """
+    data = {field: getattr(function, field) for field in _FUNCTION_FIELDS}
+    data['function_type'] = function.function_type.value
+    data['parameters'] = [[p.name, p.type, p.description] for p in function.parameters]
+    data['exceptions'] = [[e.name, e.description] for e in function.exceptions]
+    data['body'] = {
+        name: value for name, value in vars(function.body).items()
+        if isinstance(value, _BODY_VALUE)
+    }
+    return data
+
+
+def _check(value: Any, types: tuple) -> Any:
+    """Return value if it has one of the types, else raise TypeError."""
+    if not isinstance(value, types):
+        raise TypeError(f"unexpected {type(value).__name__} value")
+    return value
+
+
+def _function_from_dict(data: Dict[str, Any]) -> Function:
+    """
+    Rebuild a function from data written by _function_to_dict.
+
+    Args:
+        data: Dictionary of plain values
+
+    Returns:
+        Function object
+
+    Raises:
+        KeyError, TypeError, ValueError: If the data is not a stored function
+    """
+    _check(data, (dict,))
+    body = FunctionBody()
+    for name, value in _check(data['body'], (dict,)).items():
+        # Only data attributes; methods of the class cannot be shadowed
+        if name.startswith('_') or hasattr(FunctionBody, name):
+            raise ValueError(f"unexpected body attribute {name!r}")
+        setattr(body, name, _check(value, _BODY_VALUE))
+
+    function = Function(
+        name=data['name'],
+        parameters=[
+            Parameter(_check(name, (str,)), _check(type_, _TEXT), _check(description, _TEXT))
+            for name, type_, description in _check(data['parameters'], (list,))
+        ],
+        return_type=data['return_type'],
+        function_type=FunctionType(data['function_type']),
+        exceptions=[
+            FunctionException(_check(name, (str,)), _check(description, _TEXT))
+            for name, description in _check(data['exceptions'], (list,))
+        ],
+        body=body,
+    )
+    for field, types in _FUNCTION_FIELDS.items():
+        setattr(function, field, _check(data[field], types))
+    return function
+
+
+class ParseCache(SQLiteStore):
+    """Content-addressed, size-capped on-disk cache of parse results."""
+
+    # Bump when the stored payload layout changes
+    SCHEMA_VERSION = 5
+
+    # Configuration sections that never influence parse or analysis output
+    _IGNORED_CONFIG_SECTIONS = ('cache', 'logging', 'ignore_patterns', 'ignore_directories', 'respect_gitignore', 'writer')
+
+    # AI settings that change how requests are sent, never what the analysis produces
+    _IGNORED_AI_SETTINGS = ('max_retries', 'retry_delay', 'concurrency', 'rate_limits', 'health', 'base_urls',
+                            'scheduling')
+
+    # AI settings hashed only by whether they are set, so that keys stay out of the
+    # cache and rotating one keeps existing entries
+    _SECRET_AI_SETTINGS = ('groq_api_key', 'openai_api_key')
+
+    def __init__(self, config: Config):
+        """
+        Initialize the parse cache.
+
+        Args:
+            config: Configuration object
+        """
+        from . import __version__
+
+        cache_config = config.get_cache_config()
+        super().__init__(
+            Path(cache_config.get('directory', '.codedocgen-cache')) / 'parse_cache.sqlite3',
+            int(float(cache_config.get('max_size_mb', 256)) * 1024 * 1024),
+            enabled=bool(cache_config.get('enabled', True))
+        )
+
+        self.tool_version = __version__
+        self.config_hash = self._hash_config(config)
+
+    def _hash_config(self, config: Config) -> str:
+        """
+        Hash the parts of the configuration that affect parse and analysis output.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Hex digest of the effective configuration
+        """
+        effective = {
+            key: value for key, value in config.config.items()
+            if key not in self._IGNORED_CONFIG_SECTIONS
+        }
+        if isinstance(effective.get('ai'), dict):
+            effective['ai'] = {
+                key: bool(value) if key in self._SECRET_AI_SETTINGS else value
+                for key, value in effective['ai'].items()
+                if key not in self._IGNORED_AI_SETTINGS
+            }
+        serialized = json.dumps(effective, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def make_key(self, file_path: Path, parser_name: str, lang: str,
+                 content: Optional[FileContent] = None) -> Optional[str]:
+        """
+        Build the cache key for a file.
+
+        Args:
+            file_path: Path to the source file
+            parser_name: Class name of the parser handling the file
+            lang: Language used for analysis
+            content: The file's content if it has already been read
+
+        Returns:
+            Cache key, or None if the file cannot be read
+        """
+        try:
+            if content is None:
+                content = FileContent.read(file_path)
+            content_hash = content.sha256
+        except OSError:
+            return None
+
+        parts = [
+            str(self.SCHEMA_VERSION),
+            self.tool_version,
+            parser_name,
+            lang or '',
+            self.config_hash,
+            content_hash,
+        ]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Function]]:
+        """
+        Look up cached functions.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            List of Function objects, or None on a miss
+        """
+        payload = self._read(key)
+        functions = None
+        if payload is not None:
+            # The database lives in the scanned repository, so entries are
+            # plain JSON, checked field by field, never executable data
+            try:
+                functions = [_function_from_dict(data) for data in _check(json.loads(payload), (list,))]
+            except (KeyError, TypeError, ValueError, RecursionError) as e:
+                self.logger.debug(f"Parse cache ignored unreadable entry {key}: {e}")
+
+        if functions is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return functions
+
+    def put(self, key: str, functions: List[Function]) -> None:
+        """
+        Store analyzed functions.
+
+        Args:
+            key: Cache key from make_key
+            functions: Analyzed Function objects
+        """
+        try:
+            payload = json.dumps([_function_to_dict(function) for function in functions]).encode('utf-8')
+        except (TypeError, ValueError, AttributeError) as e:
+            self.logger.debug(f"Parse cache could not serialize entry {key}: {e}")
+            return
+
+        self.put_bytes(key, payload)
+
+
+class AIResponseCache(SQLiteStore):
+    """On-disk cache of raw AI responses keyed by provider, model and prompt."""
+
+    def __init__(self, config: Config):
+        """
+        Initialize the AI response cache.
+
+        Args:
+            config: Configuration object
+        """
+        cache_config = config.get_cache_config()
+        ai_cache_config = cache_config.get('ai', {})
+        super().__init__(
+            Path(cache_config.get('directory', '.codedocgen-cache')) / 'ai_cache.sqlite3',
+            int(float(ai_cache_config.get('max_size_mb', 64)) * 1024 * 1024),
+            enabled=bool(ai_cache_config.get('enabled', True)),
+            ttl_seconds=float(ai_cache_config.get('ttl_hours', 720)) * 3600
+        )
+
+    @staticmethod
+    def make_key(provider: str, model: Any, template_version: int, prompt: str) -> str:
+        """
+        Build the cache key for a prompt.
+
+        Args:
+            provider: Provider name
+            model: Configured model (or list of fallback models)
+            template_version: Version of the prompt templates
+            prompt: Full prompt text
+
+        Returns:
+            Cache key
+        """
+        parts = [provider, json.dumps(model, sort_keys=True), str(template_version), prompt]
+        return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Response text, or None on a miss
+        """
+        payload = self.get_bytes(key)
+        return payload.decode('utf-8') if payload is not None else None
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key from make_key
+            response: Raw provider response
+        """
+        self.put_bytes(key, response.encode('utf-8'))
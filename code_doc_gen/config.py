@@ -8,7 +8,10 @@ import os
 import copy
 import yaml
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, FrozenSet
+
+from .ignore import IgnoreMatcher, DEFAULT_IGNORED_DIRECTORIES
+from .templates import TemplateRenderers, validate_templates
 
 # Load environment variables from .env file if it exists
 try:
@@ -146,6 +149,8 @@ class Config:
             "*/bin/*",
             "*/obj/*"
         ],
+        "ignore_directories": [],
+        "respect_gitignore": True,
         "nltk": {
             "download_data": True,
             "corpora": ["punkt", "averaged_perceptron_tagger"]
@@ -160,7 +165,46 @@ class Config:
             "groq_api_key": "",  # Will be loaded from environment variable
             "openai_api_key": "",  # Will be loaded from environment variable
             "max_retries": 3,
-            "retry_delay": 1.0
+            "retry_delay": 1.0,
+            "concurrency": 8,  # Maximum AI requests in flight
+            "batch_size": 1,  # Functions per request; above 1 packs small functions into one prompt
+            "prompt_token_budget": 500,  # Estimated tokens of function code per request
+            "streaming": False,  # Stream completions and stop once the comment block is complete
+            "base_urls": {  # Endpoint overrides, e.g. a local mock provider; empty means the provider's API
+                "groq": "",
+                "openai": ""
+            },
+            "rate_limits": {  # Per-provider budgets; 0 means unlimited
+                "groq": {"requests_per_minute": 30, "tokens_per_minute": 0},
+                "openai": {"requests_per_minute": 500, "tokens_per_minute": 200000}
+            },
+            "health": {  # Per provider and model circuit breaker and latency routing
+                "failure_threshold": 3,  # Consecutive failures that open the circuit
+                "cooldown_seconds": 60,  # How long an open circuit skips its provider/model
+                "latency_window": 20  # Recent requests the p50 latency is taken over
+            },
+            "scheduling": {  # Ranking of functions for a budgeted run (--ai-budget)
+                "public_weight": 3.0,  # Public API (no leading underscore, not private)
+                "complexity_weight": 1.0,  # log2 of cyclomatic complexity
+                "size_weight": 1.0,  # log2 of source lines
+                "fan_in_weight": 2.0  # log2 of call sites elsewhere in the repository
+            }
+        },
+        "cache": {
+            "enabled": True,
+            "directory": ".codedocgen-cache",  # Relative to the repository
+            "max_size_mb": 256,
+            "ai": {  # Raw AI responses, keyed by provider, model and prompt
+                "enabled": True,
+                "max_size_mb": 64,
+                "ttl_hours": 720
+            }
+        },
+        "writer": {  # In-place writes (--inplace)
+            "jobs": 8,  # Threads rendering files into temporary files
+            "journal": True,  # Record the original files of a run for --rollback
+            "journal_directory": ".codedocgen-cache/journal",  # Relative to the repository
+            "keep_runs": 5  # Journals of older runs are deleted
         }
     }
     
@@ -173,6 +217,7 @@ class Config:
         """
         # Use deep copy to avoid cross-test/shared-mutation of nested dicts
         self.config = copy.deepcopy(self.DEFAULT_CONFIG)
+        self._ignore_matchers: Dict[Path, IgnoreMatcher] = {}
         
         if config_path and config_path.exists():
             self.load_config(config_path)
@@ -186,11 +231,26 @@ class Config:
         
         Args:
             config_path: Path to configuration file
+            
+        Raises:
+            ValueError: If the file configures an invalid template
         """
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
                 custom_config = yaml.safe_load(f)
-            
+        except Exception as e:
+            print(f"Warning: Could not load configuration from {config_path}: {e}")
+            return
+        
+        # An invalid template fails the run rather than being rendered into every
+        # function or silently replaced by a default
+        if isinstance(custom_config, dict) and custom_config.get("templates"):
+            try:
+                validate_templates(custom_config["templates"])
+            except ValueError as e:
+                raise ValueError(f"Invalid template in {config_path}: {e}") from None
+        
+        try:
             # Merge custom configuration with defaults
             self._merge_config(self.config, custom_config)
             
@@ -224,6 +284,21 @@ class Config:
         """
         return self.config["templates"].get(lang, {}).get(template_type, "")
     
+    def get_template_renderers(self) -> TemplateRenderers:
+        """
+        Compile the templates of every language.
+        
+        Callers build them once and keep them, so rendering a template is a call
+        to a prebuilt function instead of a lookup and a format string parse.
+        
+        Returns:
+            TemplateRenderers with the configured templates and the fallbacks
+            
+        Raises:
+            ValueError: If a configured template is invalid
+        """
+        return TemplateRenderers(self.config["templates"])
+    
     def get_rules(self) -> List[Dict[str, Any]]:
         """
         Get inference rules sorted by priority.
@@ -246,6 +321,22 @@ class Config:
         """
         return self.config["file_extensions"].get(lang, [])
     
+    def get_language_index(self) -> Dict[str, str]:
+        """
+        Build the file suffix to language lookup table.
+        
+        Callers build it once and keep it, so per-file detection is a dict lookup.
+        When a suffix is listed for several languages the first one wins.
+        
+        Returns:
+            Dictionary mapping lowercase suffixes (with the dot) to language names
+        """
+        index = {}
+        for lang, extensions in self.config["file_extensions"].items():
+            for ext in extensions:
+                index.setdefault(ext.lower(), lang)
+        return index
+    
     def get_ignore_patterns(self) -> List[str]:
         """
         Get patterns to ignore during scanning.
@@ -255,40 +346,46 @@ class Config:
         """
         return self.config.get("ignore_patterns", [])
     
-    def should_ignore_file(self, file_path: Path) -> bool:
+    def get_ignored_directories(self) -> FrozenSet[str]:
+        """
+        Get directory names that are never scanned.
+        
+        Returns:
+            Set of directory names
+        """
+        return DEFAULT_IGNORED_DIRECTORIES | frozenset(self.config.get("ignore_directories", []))
+    
+    def get_ignore_matcher(self, root: Optional[Path] = None) -> IgnoreMatcher:
+        """
+        Get the compiled ignore matcher for a repository root.
+        
+        Matchers are built once per root and reused.
+        
+        Args:
+            root: Repository root (default: current working directory)
+            
+        Returns:
+            IgnoreMatcher instance
+        """
+        root = Path(root) if root is not None else Path.cwd()
+        matcher = self._ignore_matchers.get(root)
+        if matcher is None:
+            matcher = IgnoreMatcher.from_config(self, root)
+            self._ignore_matchers[root] = matcher
+        return matcher
+    
+    def should_ignore_file(self, file_path: Path, root: Optional[Path] = None) -> bool:
         """
         Check if a file should be ignored based on patterns.
         
         Args:
             file_path: Path to file
+            root: Repository root the path belongs to (default: current working directory)
             
         Returns:
             True if file should be ignored
         """
-        file_str = str(file_path)
-        
-        # Check for virtual environment directories
-        if any(venv_dir in file_str for venv_dir in ['codedocgen/', 'venv/', 'env/', '.venv/', '.env/', 'site-packages/']):
-            return True
-        
-        # Check for other common ignore patterns
-        ignore_patterns = [
-            'node_modules',
-            '__pycache__',
-            'build',
-            'dist',
-            '.pyc',
-            '.o',
-            '.so',
-            '.dll',
-            '.exe'
-        ]
-        
-        for pattern in ignore_patterns:
-            if pattern in file_str:
-                return True
-        
-        return False
+        return self.get_ignore_matcher(root).is_ignored(file_path)
     
     def get_nltk_config(self) -> Dict[str, Any]:
         """
@@ -317,6 +414,24 @@ class Config:
         """
         return self.config.get("ai", {}) 
     
+    def get_cache_config(self) -> Dict[str, Any]:
+        """
+        Get parse cache configuration.
+        
+        Returns:
+            Cache configuration dictionary
+        """
+        return self.config.get("cache", {})
+    
+    def get_writer_config(self) -> Dict[str, Any]:
+        """
+        Get in-place writer configuration.
+        
+        Returns:
+            Writer configuration dictionary
+        """
+        return self.config.get("writer", {})
+    
     def _load_env_api_keys(self) -> None:
         """Load API keys from environment variables."""
         # Environment variables take precedence over config file values
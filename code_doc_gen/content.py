@@ -0,0 +1,196 @@
+"""
+Per-run file content store for CodeDocGen.
+
+Every stage of a run used to read the files it needed on its own: the parse
+cache hashed the file, the parser read it again (and libclang source
+extraction once more per function), and the diff or in-place writer read it
+a last time. The content store reads each file once, as bytes (memory-mapped
+above a size threshold), and hands the same decoded text, lines and line
+index to every stage of the process until the file is released.
+"""
+
+import os
+import mmap
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .parsers.spans import LineIndex
+
+
+# Files at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class FileContent:
+    """The contents of one file, read once, with derived views computed on first use."""
+
+    def __init__(self, path: Path, data: Union[bytes, mmap.mmap], stat: os.stat_result):
+        """
+        Initialize the file content.
+
+        Args:
+            path: Path the content was read from
+            data: Raw bytes of the file, or a read-only memory map of it
+            stat: Status of the file when it was read
+        """
+        self.path = path
+        self.data = data
+        self.stat = stat
+        self._text: Optional[str] = None
+        self._lines: Optional[List[str]] = None
+        self._line_index: Optional[LineIndex] = None
+        self._sha256: Optional[str] = None
+
+    @classmethod
+    def read(cls, file_path: Path, mmap_threshold: int = MMAP_THRESHOLD) -> "FileContent":
+        """
+        Read a file.
+
+        Args:
+            file_path: Path to the file
+            mmap_threshold: Size from which the file is memory-mapped
+
+        Returns:
+            FileContent of the file
+        """
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size and stat.st_size >= mmap_threshold:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+        return cls(Path(file_path), data, stat)
+
+    @property
+    def mapped(self) -> bool:
+        """Whether the content is memory-mapped."""
+        return isinstance(self.data, mmap.mmap)
+
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        return len(self.data)
+
+    @property
+    def text(self) -> str:
+        """
+        The file decoded as UTF-8 with universal newlines, exactly as a text mode read returns it.
+
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        if self._text is None:
+            text = str(self.data, 'utf-8')
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            self._text = text
+        return self._text
+
+    @property
+    def lines(self) -> List[str]:
+        """Lines of the text with their line endings, as readlines() returns them."""
+        if self._lines is None:
+            parts = self.text.split('\n')
+            lines = [part + '\n' for part in parts[:-1]]
+            if parts[-1]:
+                lines.append(parts[-1])
+            self._lines = lines
+        return self._lines
+
+    @property
+    def line_index(self) -> LineIndex:
+        """Line index of the text, for offset and line number lookups."""
+        if self._line_index is None:
+            self._line_index = LineIndex(self.text)
+        return self._line_index
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 hex digest of the raw bytes."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+
+    def close(self) -> None:
+        """Unmap a memory-mapped file; the decoded views stay usable."""
+        if self.mapped and not self.data.closed:
+            self.data.close()
+
+
+class ContentStore:
+    """Thread-safe cache of file contents for the duration of their trip through a run."""
+
+    def __init__(self, mmap_threshold: int = MMAP_THRESHOLD):
+        """
+        Initialize the store.
+
+        Args:
+            mmap_threshold: Size from which files are memory-mapped
+        """
+        self.mmap_threshold = mmap_threshold
+        self._files: Dict[str, FileContent] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {'reads': 0, 'hits': 0, 'bytes_read': 0, 'mapped': 0, 'released': 0}
+
+    @staticmethod
+    def _key(file_path: Union[str, Path]) -> str:
+        return os.path.abspath(file_path)
+
+    def get(self, file_path: Union[str, Path]) -> FileContent:
+        """
+        Get a file's content, reading it on first use.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            FileContent shared by every caller until the file is released
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = self._key(file_path)
+        with self._lock:
+            content = self._files.get(key)
+            if content is not None:
+                self.stats['hits'] += 1
+                return content
+
+        content = FileContent.read(Path(file_path), self.mmap_threshold)
+        with self._lock:
+            existing = self._files.get(key)
+            if existing is not None:
+                # Another thread read it meanwhile; keep one copy
+                content.close()
+                self.stats['hits'] += 1
+                return existing
+            self._files[key] = content
+            self.stats['reads'] += 1
+            self.stats['bytes_read'] += content.size
+            self.stats['mapped'] += content.mapped
+        return content
+
+    def release(self, file_path: Union[str, Path]) -> None:
+        """
+        Drop a file's content once it has left the pipeline.
+
+        Args:
+            file_path: Path to the file
+        """
+        with self._lock:
+            content = self._files.pop(self._key(file_path), None)
+        if content is not None:
+            content.close()
+            self.stats['released'] += 1
+
+    def clear(self) -> None:
+        """Release every file."""
+        with self._lock:
+            files, self._files = self._files, {}
+        for content in files.values():
+            content.close()
+
+    def __len__(self) -> int:
+        return len(self._files)
@@ -0,0 +1,125 @@
+"""
+Function fingerprints for CodeDocGen.
+
+Vendored copies, generated overloads and copy-pasted helpers give many
+functions identical signatures and bodies. A fingerprint hashes a function's
+name, signature and normalized body, so that such functions are analyzed
+once and share the result. Normalization drops comments, docstrings and
+whitespace; for Python the body is compared as an AST with local variable
+names abstracted, so renamed locals and reformatting do not matter.
+"""
+
+import ast
+import re
+import hashlib
+import textwrap
+from typing import Dict, Optional
+
+from .models import Function
+from .prompt_compactor import strip_comments
+
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class _LocalNameAbstractor(ast.NodeTransformer):
+    """Renames local variables to positional placeholders."""
+
+    def __init__(self, local_names: set):
+        self.local_names = local_names
+        self.placeholders: Dict[str, str] = {}
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        if node.id in self.local_names:
+            placeholder = self.placeholders.setdefault(node.id, f"_v{len(self.placeholders)}")
+            return ast.copy_location(ast.Name(id=placeholder, ctx=node.ctx), node)
+        return node
+
+
+def _local_names(node: ast.AST) -> set:
+    """Names assigned inside a function, minus those declared global or nonlocal."""
+    assigned = set()
+    declared = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and isinstance(child.ctx, (ast.Store, ast.Del)):
+            assigned.add(child.id)
+        elif isinstance(child, ast.ExceptHandler) and child.name:
+            assigned.add(child.name)
+        elif isinstance(child, (ast.Global, ast.Nonlocal)):
+            declared.update(child.names)
+    return assigned - declared
+
+
+def _normalize_python(source: str) -> Optional[str]:
+    """
+    Normalize a Python function definition to an AST dump.
+
+    Args:
+        source: Source of one function definition
+
+    Returns:
+        Canonical form of the decorators, arguments and body, or None if the
+        source does not parse as a function definition
+    """
+    try:
+        tree = ast.parse(textwrap.dedent(source))
+    except (SyntaxError, ValueError):
+        return None
+
+    node = next((n for n in tree.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))), None)
+    if node is None:
+        return None
+
+    body = list(node.body)
+    if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], 'value', None), ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        body = body[1:]
+
+    abstractor = _LocalNameAbstractor(_local_names(node))
+    body = [abstractor.visit(statement) for statement in body]
+    parts = [ast.dump(decorator) for decorator in node.decorator_list]
+    parts.append(ast.dump(node.args))
+    parts.extend(ast.dump(statement) for statement in body)
+    return '\n'.join(parts)
+
+
+def normalize_source(source: str, language: str) -> str:
+    """
+    Normalize function source for fingerprinting.
+
+    Args:
+        source: Function source code
+        language: Programming language
+
+    Returns:
+        Source without comments and whitespace differences (an AST dump with
+        abstracted local names for Python)
+    """
+    if language == 'python':
+        normalized = _normalize_python(source)
+        if normalized is not None:
+            return normalized
+    return _WHITESPACE.sub(' ', strip_comments(source, language)).strip()
+
+
+def fingerprint_function(function: Function, language: str) -> Optional[str]:
+    """
+    Fingerprint a function by its name, signature and normalized body.
+
+    Args:
+        function: Function to fingerprint
+        language: Programming language
+
+    Returns:
+        Hex digest, equal for functions that can share one analysis; None for
+        a function without source code, whose body cannot be compared
+    """
+    if not (function.source_code or '').strip():
+        return None
+    signature = ','.join(f"{p.name}:{p.type}" for p in function.parameters)
+    digest = hashlib.sha1()
+    for part in (language, function.name, signature, function.return_type or '',
+                 normalize_source(function.source_code, language)):
+        digest.update(part.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
@@ -8,24 +8,50 @@ in various programming languages.
 import re
 import shutil
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from difflib import unified_diff
 
-from .models import Function, DocumentationResult, FunctionType
+from .models import Function, DocumentationResult
 from .config import Config
+from .content import ContentStore, FileContent
+from .templates import compile_template
+from .parsers.spans import documentation_precedes
+
+
+# Names directly followed by an opening parenthesis on a line
+_CALLED_NAME = re.compile(r'(\w+)\s*\(')
+
+# Names bound by a JavaScript const/let/var declaration
+_JS_BINDING = re.compile(r'(?:const|let|var)\s+([^\s=]+)\s*=')
+
+# Trailing identifier of a (possibly qualified) function name; a line defining
+# the function has it in _CALLED_NAME or _JS_BINDING
+_TRAILING_NAME = re.compile(r'(\w+)$')
+
+# Detailed layouts of C++ and Python, which put each section on its own line
+# whatever the configured template
+_CPP_DETAILED = compile_template("/**\n * \\brief {description}{params}{returns}{throws}\n */", 'detailed')
+_PYTHON_DETAILED = compile_template('"""\n    {description}{params}{returns}{raises}\n"""', 'detailed')
 
 
 class DocumentationGenerator:
     """Generates documentation comments for functions."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, content_store: Optional[ContentStore] = None):
         """
         Initialize the documentation generator.
         
         Args:
             config: Configuration object
+            content_store: Store holding the contents already read this run
         """
         self.config = config
+        self.content = content_store
+        # Templates are compiled once; rendering only calls them
+        self._templates = config.get_template_renderers()
+        self._languages = config.get_language_index()
+        # (function name, language) -> (unqualified name, compiled definition-line matcher)
+        self._line_patterns: Dict[Tuple[str, str], Tuple[str, Callable[[str], Any]]] = {}
     
     """
         Generates the documentation based on self, functions, lang. Function iterates over data, conditionally processes input, has side effects. Takes self, functions and lang as input. Returns a dict[(str, str)] value.
@@ -91,9 +117,6 @@ class DocumentationGenerator:
         # Generate brief documentation
         brief_doc = self._generate_brief_documentation(function, lang)
         
-        # Generate detailed documentation
-        detailed_doc = self._generate_detailed_documentation(function, lang)
-        
         # Generate parameter documentation
         param_docs = self._generate_parameter_documentation(function, lang)
         
@@ -103,6 +126,13 @@ class DocumentationGenerator:
         # Generate exception documentation
         exception_docs = self._generate_exception_documentation(function, lang)
         
+        # Generate detailed documentation from the sections rendered above
+        detailed_doc = self._generate_detailed_documentation(function, lang, sections=(
+            "\n".join(param_docs.values()),
+            return_doc or "",
+            "\n".join(exception_docs.values())
+        ))
+        
         return DocumentationResult(
             function=function,
             brief_doc=brief_doc,
@@ -123,120 +153,61 @@ class DocumentationGenerator:
         Returns:
             Brief documentation string
         """
-        template = self.config.get_template(lang, "brief")
-        
-        if not template:
-            # Fallback templates
-            if lang == "c++":
-                template = "/**\n * \\brief {description}\n */"
-            elif lang == "python":
-                template = '""" {description} """'
-            elif lang == "java":
-                template = "/**\n * {description}\n */"
-            elif lang == "javascript":
-                template = "/**\n * {description}\n */"
-            else:
-                template = "/** {description} */"
-        
         description = function.brief_description or function.detailed_description or f"Function {function.name}"
         
-        return template.format(description=description)
+        return self._templates.get(lang, "brief")(description=description)
     
-    def _generate_detailed_documentation(self, function: Function, lang: str) -> str:
+    def _generate_detailed_documentation(
+        self,
+        function: Function,
+        lang: str,
+        sections: Optional[Tuple[str, str, str]] = None
+    ) -> str:
         """
         Generate detailed documentation for a function.
         
         Args:
             function: Function to document
             lang: Programming language
+            sections: Parameter, return and exception documentation text already
+                rendered for the function (if None, rendered here)
             
         Returns:
             Detailed documentation string
         """
-        template = self.config.get_template(lang, "detailed")
-        
-        if not template:
-            # Fallback templates
-            if lang == "c++":
-                template = "/**\n * \\brief {description}{params}{returns}{throws}\n */"
-            elif lang == "python":
-                template = '"""\n    {description}\n{params}{returns}{raises}\n    """'
-            elif lang == "java":
-                template = "/**\n * {description}\n *\n{params}{returns}{throws}\n */"
-            elif lang == "javascript":
-                template = "/**\n * {description}\n *\n{params}{returns}{throws}\n */"
-            else:
-                template = "/**\n * {description}\n *\n{params}{returns}{throws}\n */"
-        
-        # Generate parameter documentation
-        params_doc = self._generate_parameter_documentation_text(function, lang)
-        
-        # Generate return documentation
-        returns_doc = self._generate_return_documentation_text(function, lang)
-        
-        # Generate exception documentation
-        throws_doc = self._generate_exception_documentation_text(function, lang)
+        if sections is not None:
+            params_doc, returns_doc, throws_doc = sections
+        else:
+            # Generate parameter documentation
+            params_doc = self._generate_parameter_documentation_text(function, lang)
+            
+            # Generate return documentation
+            returns_doc = self._generate_return_documentation_text(function, lang)
+            
+            # Generate exception documentation
+            throws_doc = self._generate_exception_documentation_text(function, lang)
         
         description = function.detailed_description or function.brief_description or f"Function {function.name}"
         
-        if lang == "c++":
+        if lang in ("c++", "python"):
             # Only add newlines if the section is non-empty
             params_doc = ("\n" + params_doc) if params_doc else ""
             returns_doc = ("\n" + returns_doc) if returns_doc else ""
             throws_doc = ("\n" + throws_doc) if throws_doc else ""
-            template = "/**\n * \\brief {description}{params}{returns}{throws}\n */"
-            return template.format(
-                description=description,
-                params=params_doc,
-                returns=returns_doc,
-                throws=throws_doc,
-                raises=throws_doc  # For Python compatibility
-            )
-        elif lang == "python":
-            # Check if we have any sections before processing
-            has_sections = any([params_doc, returns_doc, throws_doc])
-            
-            # Determine if this is a class method
-            is_class_method = function.function_type in [FunctionType.METHOD, FunctionType.CONSTRUCTOR, FunctionType.DESTRUCTOR] or function.class_name is not None
-            
-            if has_sections:
-                # Add newlines for sections
-                params_doc = ("\n" + params_doc) if params_doc else ""
-                returns_doc = ("\n" + returns_doc) if returns_doc else ""
-                throws_doc = ("\n" + throws_doc) if throws_doc else ""
-                
-                if is_class_method:
-                    template = '"""\n    {description}{params}{returns}{raises}\n"""'
-                else:
-                    template = '"""\n    {description}{params}{returns}{raises}\n"""'
-            else:
-                # No sections, no extra newlines
-                if is_class_method:
-                    template = '"""\n    {description}\n"""'
-                else:
-                    template = '"""\n    {description}\n"""'
-            
-            return template.format(
-                description=description,
-                params=params_doc,
-                returns=returns_doc,
-                throws=throws_doc,
-                raises=throws_doc  # For Python compatibility
-            )
+            render = _CPP_DETAILED if lang == "c++" else _PYTHON_DETAILED
         else:
             # For Java/JavaScript and other languages using JSDoc/Javadoc style,
             # the template already includes a single blank line after the description (" *\n").
             # So do NOT prepend extra newlines here to avoid double spacing before @param.
-            params_doc = params_doc or ""
-            returns_doc = returns_doc or ""
-            throws_doc = throws_doc or ""
-            return template.format(
-                description=description,
-                params=params_doc,
-                returns=returns_doc,
-                throws=throws_doc,
-                raises=throws_doc  # For Python compatibility
-            )
+            render = self._templates.get(lang, "detailed")
+        
+        return render(
+            description=description,
+            params=params_doc,
+            returns=returns_doc,
+            throws=throws_doc,
+            raises=throws_doc  # For Python compatibility
+        )
     
     def _generate_parameter_documentation(self, function: Function, lang: str) -> Dict[str, str]:
         """
@@ -251,25 +222,12 @@ class DocumentationGenerator:
         """
         param_docs = {}
         
+        render = self._templates.get(lang, "param")
+        
         for parameter in function.parameters:
-            template = self.config.get_template(lang, "param")
-            
-            if not template:
-                # Fallback templates
-                if lang == "c++":
-                    template = " * \\param {name} {description}"
-                elif lang == "python":
-                    template = "    :param {name}: {description}"
-                elif lang == "java":
-                    template = " * @param {name} {description}"
-                elif lang == "javascript":
-                    template = " * @param {name} {description}"
-                else:
-                    template = " * @param {name} {description}"
-            
             description = parameter.description or f"Parameter {parameter.name}"
             
-            param_docs[parameter.name] = template.format(
+            param_docs[parameter.name] = render(
                 name=parameter.name,
                 description=description
             )
@@ -309,25 +267,10 @@ class DocumentationGenerator:
         if function.return_type.lower() == "void":
             return None
         
-        template = self.config.get_template(lang, "return")
-        
-        if not template:
-            # Fallback templates
-            if lang == "c++":
-                template = " * \\return {description}"
-            elif lang == "python":
-                template = "    :return: {description}"
-            elif lang == "java":
-                template = " * @return {description}"
-            elif lang == "javascript":
-                template = " * @returns {description}"
-            else:
-                template = " * @return {description}"
-        
         # Generate return description based on type
         description = self._generate_return_description(function)
         
-        return template.format(description=description)
+        return self._templates.get(lang, "return")(description=description)
     
     def _generate_return_documentation_text(self, function: Function, lang: str) -> str:
         """
@@ -387,25 +330,12 @@ class DocumentationGenerator:
         """
         exception_docs = {}
         
+        render = self._templates.get(lang, "throws")
+        
         for exception in function.exceptions:
-            template = self.config.get_template(lang, "throws")
-            
-            if not template:
-                # Fallback templates
-                if lang == "c++":
-                    template = " * \\throws {exception} {description}"
-                elif lang == "python":
-                    template = "    :raises {exception}: {description}"
-                elif lang == "java":
-                    template = " * @throws {exception} {description}"
-                elif lang == "javascript":
-                    template = " * @throws {exception} {description}"
-                else:
-                    template = " * @throws {exception} {description}"
-            
             description = exception.description or f"Thrown when {exception.name.lower()} occurs"
             
-            exception_docs[exception.name] = template.format(
+            exception_docs[exception.name] = render(
                 exception=exception.name,
                 description=description
             )
@@ -431,13 +361,22 @@ class DocumentationGenerator:
         # Join exception documentation with newlines
         return "\n".join(exception_docs.values())
     
-    def apply_documentation_inplace(self, file_path: Path, documentation: Dict[str, str]) -> None:
+    def apply_documentation_inplace(
+        self,
+        file_path: Path,
+        documentation: Dict[str, str],
+        lang: Optional[str] = None,
+        functions: Optional[List[Function]] = None
+    ) -> None:
         """
         Apply documentation to a file in place.
         
         Args:
             file_path: Path to the file to modify
             documentation: Dictionary mapping function names to documentation strings
+            lang: Language of the file (if None, inferred from the extension)
+            functions: Parsed functions of the file; their recorded line numbers
+                are used instead of searching the file for their signatures
         """
         # Create backup
         backup_path = file_path.with_suffix(file_path.suffix + '.bak')
@@ -445,18 +384,20 @@ class DocumentationGenerator:
         
         try:
             # Read the original file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            lines = self._read_lines(file_path)
             
             # Infer language from file extension
-            lang = self._infer_language_from_extension(file_path)
+            if not lang:
+                lang = self._infer_language_from_extension(file_path)
             
             # Apply documentation
-            modified_lines = self._insert_documentation(lines, documentation, lang)
+            modified_lines = self._insert_documentation(lines, documentation, lang, self._function_locations(functions))
             
             # Write the modified file
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.writelines(modified_lines)
+            if self.content is not None:
+                self.content.release(file_path)
             
             print(f"Applied documentation to {file_path}")
             
@@ -465,6 +406,20 @@ class DocumentationGenerator:
             shutil.copy2(backup_path, file_path)
             raise e
     
+    def _read_lines(self, file_path: Path) -> List[str]:
+        """
+        Get the lines of a file, from the content store when there is one.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Lines of the file with their line endings
+        """
+        if self.content is not None:
+            return self.content.get(file_path).lines
+        return FileContent.read(file_path).lines
+    
     def _infer_language_from_extension(self, file_path: Path) -> str:
         """
         Infer programming language from file extension.
@@ -475,103 +430,220 @@ class DocumentationGenerator:
         Returns:
             Language string ('python', 'c++', 'java', or 'unknown')
         """
-        ext = file_path.suffix.lower()
-        if ext == '.py':
-            return 'python'
-        elif ext in ['.cpp', '.cc', '.cxx', '.h', '.hpp', '.hxx']:
-            return 'c++'
-        elif ext == '.java':
-            return 'java'
-        elif ext in ['.js', '.mjs', '.cjs', '.ts', '.tsx']:
-            return 'javascript'
-        else:  # Fallback for other languages
-            return 'unknown'
+        return self._languages.get(file_path.suffix.lower(), 'unknown')
+    
+    def _function_locations(self, functions: Optional[List[Function]]) -> Dict[str, int]:
+        """
+        Collect the definition lines recorded by the parser.
+        
+        Args:
+            functions: Parsed functions of a file
+            
+        Returns:
+            Dictionary mapping function names to the 0-based index of their
+            first definition line, for functions with a known line number
+        """
+        locations: Dict[str, int] = {}
+        for function in functions or ():
+            if function.line_number is None:
+                continue
+            name = function.get_full_name()
+            line_index = function.line_number - 1
+            if name not in locations or line_index < locations[name]:
+                locations[name] = line_index
+        return locations
     
-    def _insert_documentation(self, lines: List[str], documentation: Dict[str, str], lang: str) -> List[str]:
+    def _insert_documentation(
+        self,
+        lines: List[str],
+        documentation: Dict[str, str],
+        lang: str,
+        locations: Optional[Dict[str, int]] = None
+    ) -> List[str]:
         """
         Insert documentation into file lines.
+        
+        Insertion points are located first, then spliced into the file in a
+        single pass, so the cost grows with the file size plus the number of
+        functions rather than their product.
+        
+        Args:
+            lines: Lines of the file
+            documentation: Dictionary mapping function names to documentation strings
+            lang: Programming language
+            locations: Line indices of function definitions recorded by the parser,
+                by function name; other functions are located by their signature
+            
+        Returns:
+            Lines with the documentation inserted
+        """
+        insertions = self._locate_insertions(lines, documentation, lang, locations or {})
+        return self._splice_documentation(lines, insertions)
+    
+    def _locate_insertions(
+        self,
+        lines: List[str],
+        documentation: Dict[str, str],
+        lang: str,
+        locations: Dict[str, int]
+    ) -> List[Tuple[int, str, Optional[str]]]:
+        """
+        Find where each function's documentation goes.
+        
+        Functions with a recorded location are placed directly. The others
+        are found by their signature pattern, compiled once per function. Each line is tokenized once and
+        only the patterns of functions named on it are tried; the first
+        function (in documentation order) whose pattern matches a line claims
+        it. Functions whose names are not plain identifiers are tried on
+        every line.
+        
+        Args:
+            lines: Lines of the file
+            documentation: Dictionary mapping function names to documentation strings
+            lang: Programming language
+            locations: Line indices of function definitions, by function name
+            
+        Returns:
+            List of (line index, indentation, documentation) insertion points;
+            documentation is None where the function is already documented
+        """
+        insertions = []
+        # Trailing identifier -> (order, name, matcher) of functions still to be found
+        by_name: Dict[str, List[Tuple[int, str, Callable[[str], Any]]]] = {}
+        unindexed: List[Tuple[int, str, Callable[[str], Any]]] = []
+        
+        for order, qualified_name in enumerate(documentation):
+            line_index = locations.get(qualified_name)
+            # A recorded location is trusted only while the line still names the function
+            if (line_index is not None and 0 <= line_index < len(lines)
+                    and qualified_name.rsplit('.', 1)[-1] in lines[line_index]):
+                insertions.append(self._insertion_at(lines, line_index, documentation[qualified_name]))
+                continue
+            func_name, pattern = self._function_line_pattern(qualified_name, lang)
+            trailing = _TRAILING_NAME.search(func_name)
+            if trailing:
+                by_name.setdefault(trailing.group(1), []).append((order, qualified_name, pattern))
+            else:
+                unindexed.append((order, qualified_name, pattern))
+        
+        pending = len(documentation) - len(insertions)
+        for i, line in enumerate(lines):
+            if not pending:
+                break
+            names = set(_CALLED_NAME.findall(line))
+            if lang == 'javascript':
+                names.update(_TRAILING_NAME.search(binding).group(1)
+                             for binding in _JS_BINDING.findall(line) if _TRAILING_NAME.search(binding))
+            candidates = [(entry, name) for name in names for entry in by_name.get(name, ())]
+            candidates += [(entry, None) for entry in unindexed]
+            if not candidates:
+                continue
+            
+            # The first function in documentation order claims the line
+            for entry, name in sorted(candidates, key=lambda candidate: candidate[0][0]):
+                order, qualified_name, pattern = entry
+                if not pattern(line):
+                    continue
+                insertions.append(self._insertion_at(lines, i, documentation[qualified_name]))
+                (unindexed if name is None else by_name[name]).remove(entry)
+                pending -= 1
+                break
+        
+        return insertions
+    
+    def _insertion_at(self, lines: List[str], line_index: int, doc_string: str) -> Tuple[int, str, Optional[str]]:
+        """
+        Build the insertion point of a function defined on a line.
+        
+        Args:
+            lines: Lines of the file
+            line_index: Index of the function's definition line
+            doc_string: Documentation to insert
+            
+        Returns:
+            Tuple of (line index, indentation, documentation or None if a
+            documentation comment already precedes the function)
+        """
+        line = lines[line_index]
+        indent = line[:len(line) - len(line.lstrip())]
+        
+        # Check for actual documentation immediately before the function
+        if documentation_precedes(lines, line_index):
+            return line_index, indent, None
+        return line_index, indent, doc_string
+    
+    def _function_line_pattern(self, qualified_name: str, lang: str) -> Tuple[str, Callable[[str], Any]]:
+        """
+        Get the matcher for the definition line of a function.
+        
+        Args:
+            qualified_name: Function name as used in the documentation dictionary
+            lang: Programming language
+            
+        Returns:
+            Tuple of (unqualified function name, line matcher)
+        """
+        key = (qualified_name, lang)
+        cached = self._line_patterns.get(key)
+        if cached is not None:
+            return cached
+        
+        if '::' in qualified_name:
+            class_name, func_name = qualified_name.split('::', 1)
+            pattern = re.compile(r'^\s*(?:def\s+' + re.escape(func_name) + r'\s*\(|(?:\w+\s+)*'
+                                 + re.escape(class_name) + r'::' + re.escape(func_name) + r'\s*\()').match
+        elif '.' in qualified_name and lang in ['java', 'javascript']:
+            # Java/JavaScript class methods noted as Class.method
+            class_name, func_name = qualified_name.split('.', 1)
+            if lang == 'java':
+                # Java method signature (allow modifiers and return type); don't require EOL
+                pattern = re.compile(r'^\s*(?:public|private|protected|static|final|synchronized|abstract|native|\s)*[\w<>\[\]]+\s+'
+                                     + re.escape(func_name) + r'\s*\(').match
+            else:
+                # Method occurrence at the start of the line or within a class body line
+                pattern = re.compile(r'(?:^|\s)' + re.escape(func_name) + r'\s*\(').search
+        else:
+            func_name = qualified_name
+            name = re.escape(func_name)
+            python_def = r'^\s*(?:async\s+)?def\s+' + name + r'\s*\('
+            if lang == 'javascript':
+                # Function declarations, const/let/var bindings, or name( ... )
+                pattern = re.compile(python_def + r'|^\s*function\s+' + name + r'\s*\(|^\s*(?:const|let|var)\s+'
+                                     + name + r'\s*=|(?:^|\s)' + name + r'\s*\(').search
+            elif lang == 'java':
+                # Allow method definition anywhere on the line (e.g., inline with class)
+                pattern = re.compile(python_def + r'|\b' + name + r'\s*\(').search
+            else:
+                # Generic C/C++ style without end-of-line anchor
+                pattern = re.compile(r'^\s*(?:(?:async\s+)?def\s+' + name + r'\s*\(|(?:\w+\s+)*\b' + name + r'\s*\([^)]*\))').match
+        
+        self._line_patterns[key] = (func_name, pattern)
+        return func_name, pattern
+    
+    def _splice_documentation(self, lines: List[str], insertions: List[Tuple[int, str, Optional[str]]]) -> List[str]:
+        """
+        Splice documentation blocks into file lines in one pass.
+        
+        Args:
+            lines: Lines of the file
+            insertions: (line index, indentation, documentation) insertion points, in any order
+            
+        Returns:
+            New list of lines
         """
         modified_lines = []
-        processed_functions = set()
-        i = 0
-        
-        while i < len(lines):
-            line = lines[i]
-            inserted = False
-            for qualified_name, doc_string in documentation.items():
-                # Split qualified name for class methods
-                if '::' in qualified_name:
-                    class_name, func_name = qualified_name.split('::', 1)
-                    match = re.match(r'^(\s*)def\s+' + re.escape(func_name) + r'\s*\(', line)
-                    if not match:
-                        match = re.match(r'^(\s*)(?:\w+\s+)*' + re.escape(class_name) + r'::' + re.escape(func_name) + r'\s*\(', line)
-                elif '.' in qualified_name and lang in ['java', 'javascript']:
-                    # Handle Java/JavaScript class methods noted as Class.method
-                    class_name, func_name = qualified_name.split('.', 1)
-                    if lang == 'java':
-                        # Java method signature (allow modifiers and return type); don't require EOL
-                        match = re.match(r'^(\s*)(?:public|private|protected|static|final|synchronized|abstract|native|\s)*[\w<>\[\]]+\s+' + re.escape(func_name) + r'\s*\(', line)
-                    else:  # javascript class method inside class body line or start of line
-                        # Allow start-of-line or within class body; use search to find method occurrence
-                        m = re.search(r'(?:^|\s)(' + re.escape(func_name) + r')\s*\(', line)
-                        match = None
-                        if m:
-                            # Indentation at line start
-                            match = re.match(r'^(\s*)', line)
-                else:
-                    func_name = qualified_name
-                    # Language-specific patterns without requiring end-of-line
-                    match = re.match(r'^(\s*)(?:async\s+)?def\s+' + re.escape(func_name) + r'\s*\(', line)
-                    if not match:
-                        if lang == 'javascript':
-                            # function declarations
-                            match = re.match(r'^(\s*)function\s+' + re.escape(func_name) + r'\s*\(', line)
-                            if not match:
-                                # const/let/var func = ...
-                                match = re.match(r'^(\s*)(?:const|let|var)\s+' + re.escape(func_name) + r'\s*=\s*', line)
-                                if not match:
-                                    # fallback: name( ... )
-                                    match = re.search(r'(?:^|\s)(' + re.escape(func_name) + r')\s*\(', line)
-                                    if match:
-                                        match = re.match(r'^(\s*)', line)
-                        elif lang == 'java':
-                            # Allow method definition anywhere on the line (e.g., inline with class)
-                            if re.search(r'\b' + re.escape(func_name) + r'\s*\(', line):
-                                match = re.match(r'^(\s*)', line)
-                            else:
-                                match = None
-                        else:
-                            # generic C/C++ style without end-of-line anchor
-                            match = re.match(r'^(\s*)(?:\w+\s+)*\b' + re.escape(func_name) + r'\s*\([^)]*\)', line)
-                if match and qualified_name not in processed_functions:
-                    indent = match.group(1) or ''
-                    # Check for actual documentation immediately before the function
-                    doc_blocking = False
-                    j = len(modified_lines) - 1
-                    while j >= 0 and not modified_lines[j].strip():
-                        j -= 1
-                    if j >= 0:
-                        prev_line = modified_lines[j].strip()
-                        if (prev_line.startswith('/**') or prev_line.startswith('/*') or prev_line.startswith('///') or prev_line.startswith('*')):
-                            doc_blocking = True
-                        if prev_line.startswith('//') and any(keyword in prev_line.lower() for keyword in ['@brief', '@param', '@return', 'brief', 'param', 'return']):
-                            doc_blocking = True
-                    if not doc_blocking:
-                        doc_lines = doc_string.split('\n')
-                        for doc_line in doc_lines:
-                            if doc_line.strip():
-                                modified_lines.append(indent + doc_line + '\n')
-                            elif doc_line == '':
-                                modified_lines.append('\n')
-                        processed_functions.add(qualified_name)
-                        inserted = True
-                        break
-                    else:
-                        processed_functions.add(qualified_name)
-                        inserted = True
-                        break
-            modified_lines.append(line)
-            i += 1
+        position = 0
+        for line_index, indent, doc_string in sorted(insertions, key=lambda insertion: insertion[0]):
+            if doc_string is None:
+                continue
+            modified_lines.extend(lines[position:line_index])
+            position = line_index
+            for doc_line in doc_string.split('\n'):
+                if doc_line.strip():
+                    modified_lines.append(indent + doc_line + '\n')
+                elif doc_line == '':
+                    modified_lines.append('\n')
+        modified_lines.extend(lines[position:])
         return modified_lines
 
     def _find_existing_documentation_start(self, lines: List[str], function_line_index: int, lang: str, is_first_function: bool = False) -> Optional[int]:
@@ -751,27 +823,37 @@ class DocumentationGenerator:
         
         print(f"Wrote documentation to {output_path}")
     
-    def generate_diff(self, file_path: Path, documentation: Dict[str, str]) -> str:
+    def generate_diff(
+        self,
+        file_path: Path,
+        documentation: Dict[str, str],
+        lang: Optional[str] = None,
+        functions: Optional[List[Function]] = None
+    ) -> str:
         """
         Generate a diff showing the documentation changes.
         
         Args:
             file_path: Path to the file
             documentation: Dictionary mapping function names to documentation strings
+            lang: Language of the file (if None, inferred from the extension)
+            functions: Parsed functions of the file, whose recorded line numbers locate them
             
         Returns:
             Diff string
         """
         try:
             # Read the original file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_lines = f.readlines()
+            original_lines = self._read_lines(file_path)
             
             # Infer language from file extension
-            lang = self._infer_language_from_extension(file_path)
+            if not lang:
+                lang = self._infer_language_from_extension(file_path)
             
             # Generate modified lines
-            modified_lines = self._insert_documentation(original_lines, documentation, lang)
+            modified_lines = self._insert_documentation(
+                original_lines, documentation, lang, self._function_locations(functions)
+            )
             
             # Generate diff
             diff = list(unified_diff(
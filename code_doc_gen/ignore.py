@@ -0,0 +1,326 @@
+"""
+Ignore rules for CodeDocGen.
+
+Compiles the configured glob patterns, ignored directory names and nested
+.gitignore files into a matcher that is built once per repository and lets
+the scanner prune whole directories instead of testing every file.
+"""
+
+import os
+import re
+import fnmatch
+import logging
+from pathlib import Path
+from typing import List, Dict, Optional, Iterable, Tuple, Pattern
+
+
+# Characters with a meaning in fnmatch patterns
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+# Directory names that are never descended into
+DEFAULT_IGNORED_DIRECTORIES = frozenset({
+    '.git', '.svn', '.hg', '.bzr',  # Version control
+    '__pycache__', '.pytest_cache',  # Python cache
+    'node_modules', 'bower_components',  # Node.js
+    'build', 'dist', 'target',  # Build artifacts
+    '.idea', '.vscode',  # IDE files
+    'venv', 'env', '.venv', '.env', 'codedocgen',  # Virtual environments
+    'vendor', 'deps',  # Dependencies
+    'tmp', 'temp', 'cache',  # Temporary files
+    'site-packages',  # Python packages
+    '.codedocgen-cache',  # Parse cache
+})
+
+
+def _translate_gitignore(pattern: str) -> str:
+    """
+    Translate the path part of a .gitignore pattern into a regular expression.
+
+    Args:
+        pattern: Pattern without negation, leading or trailing slash
+
+    Returns:
+        Regular expression source (unanchored)
+    """
+    result = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            # Zero or more leading directories
+            result.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            # Everything inside the directory
+            result.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            result.append('.*')
+            i += 2
+        else:
+            char = pattern[i]
+            if char == '*':
+                result.append('[^/]*')
+            elif char == '?':
+                result.append('[^/]')
+            elif char == '[':
+                end = pattern.find(']', i + 2)
+                if end == -1:
+                    result.append('\\[')
+                else:
+                    body = pattern[i + 1:end]
+                    if body[0] == '!':
+                        body = '^' + body[1:]
+                    result.append('[' + body.replace('\\', '\\\\') + ']')
+                    i = end
+            elif char == '\\' and i + 1 < n:
+                i += 1
+                result.append(re.escape(pattern[i]))
+            else:
+                result.append(re.escape(char))
+            i += 1
+    return ''.join(result)
+
+
+class GitignoreRules:
+    """Compiled rules of a single .gitignore file."""
+
+    def __init__(self, lines: Iterable[str]):
+        """
+        Compile .gitignore lines.
+
+        Args:
+            lines: Raw lines of the .gitignore file
+        """
+        # (regex, negated, directory only), in file order
+        self.rules: List[Tuple[Pattern, bool, bool]] = []
+        sources = []
+
+        for line in lines:
+            line = line.rstrip('\n').rstrip('\r')
+            if not line.endswith('\\ '):
+                line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            elif line.startswith('\\#') or line.startswith('\\!'):
+                line = line[1:]
+
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+
+            # A slash anywhere but the end anchors the pattern to this directory
+            anchored = '/' in line
+            line = line.lstrip('/')
+
+            source = _translate_gitignore(line)
+            source = f"^{source}$" if anchored else f"^(?:.*/)?{source}$"
+            self.rules.append((re.compile(source, re.DOTALL), negated, dir_only))
+            sources.append(source)
+
+        # One pass rejects paths that no rule can match
+        self._any = re.compile('|'.join(f"(?:{s})" for s in sources), re.DOTALL) if sources else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Match a path relative to the directory holding the .gitignore.
+
+        Args:
+            rel_path: Slash separated relative path
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if ignored, False if re-included, None if no rule applies
+        """
+        if self._any is None or not self._any.match(rel_path):
+            return None
+
+        # The last matching rule wins
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negated
+        return None
+
+
+class IgnoreMatcher:
+    """Ignore engine combining config globs, directory names and nested .gitignore files."""
+
+    def __init__(
+        self,
+        root: Path,
+        patterns: Iterable[str] = (),
+        ignored_directories: Iterable[str] = DEFAULT_IGNORED_DIRECTORIES,
+        use_gitignore: bool = True
+    ):
+        """
+        Initialize the matcher.
+
+        Args:
+            root: Directory that relative paths and .gitignore files are resolved against
+            patterns: Glob patterns matched against "/" + the root-relative path
+            ignored_directories: Directory names that are always pruned
+            use_gitignore: Whether to honor .gitignore files below root
+        """
+        self.root = Path(root)
+        self.use_gitignore = use_gitignore
+
+        # Split globs into the shapes that need no regex at all; the rest are
+        # compiled into a single alternation
+        glob_directories = set()
+        suffixes = []
+        remaining = []
+        for pattern in patterns:
+            if pattern.startswith('*/') and pattern.endswith('/*') and not _GLOB_CHARS.search(pattern[2:-2]) \
+                    and '/' not in pattern[2:-2]:
+                # "*/name/*": any directory with that name
+                glob_directories.add(pattern[2:-2])
+            elif pattern.startswith('*') and not _GLOB_CHARS.search(pattern[1:]):
+                # "*.ext": fnmatch's star also crosses slashes, so this is a plain suffix test
+                suffixes.append(pattern[1:])
+            else:
+                remaining.append(pattern)
+
+        self._glob_directories = frozenset(glob_directories)
+        self.ignored_directories = frozenset(ignored_directories) | self._glob_directories
+        self._suffixes = tuple(suffixes)
+        self._glob = re.compile('|'.join(fnmatch.translate(p) for p in remaining)) if remaining else None
+
+        self._gitignores: Dict[str, Optional[GitignoreRules]] = {}
+        self._scopes: Dict[str, Tuple[Tuple[str, GitignoreRules], ...]] = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config, root: Path) -> "IgnoreMatcher":
+        """
+        Build a matcher from the configuration.
+
+        Args:
+            config: Configuration object
+            root: Repository root
+
+        Returns:
+            IgnoreMatcher instance
+        """
+        return cls(
+            root,
+            patterns=config.get_ignore_patterns(),
+            ignored_directories=config.get_ignored_directories(),
+            use_gitignore=config.config.get('respect_gitignore', True)
+        )
+
+    def _load_gitignore(self, rel_dir: str) -> Optional[GitignoreRules]:
+        """Load and compile the .gitignore of a directory, if any."""
+        if rel_dir in self._gitignores:
+            return self._gitignores[rel_dir]
+
+        rules = None
+        gitignore = os.path.join(str(self.root), rel_dir, '.gitignore')
+        try:
+            with open(gitignore, 'r', encoding='utf-8', errors='replace') as f:
+                rules = GitignoreRules(f)
+            if not rules.rules:
+                rules = None
+        except OSError:
+            pass
+        except re.error as e:
+            self.logger.warning(f"Ignoring malformed {gitignore}: {e}")
+
+        self._gitignores[rel_dir] = rules
+        return rules
+
+    def _scopes_for(self, rel_dir: str) -> Tuple[Tuple[str, GitignoreRules], ...]:
+        """Collect the .gitignore files that apply inside a directory, outermost first."""
+        scopes = self._scopes.get(rel_dir)
+        if scopes is not None:
+            return scopes
+
+        parent = rel_dir.rpartition('/')[0] if rel_dir else None
+        scopes = self._scopes_for(parent) if parent is not None else ()
+        rules = self._load_gitignore(rel_dir)
+        if rules is not None:
+            scopes = scopes + ((rel_dir, rules),)
+
+        self._scopes[rel_dir] = scopes
+        return scopes
+
+    def _gitignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Apply the nested .gitignore files to a root-relative path."""
+        rel_dir = rel_path.rpartition('/')[0]
+        ignored = False
+        for scope, rules in self._scopes_for(rel_dir):
+            result = rules.match(rel_path[len(scope) + 1:] if scope else rel_path, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    def is_ignored_dir(self, rel_path: str) -> bool:
+        """
+        Check whether a directory (and everything below it) should be pruned.
+
+        The parent directory is assumed not to be ignored, as during a top-down walk.
+
+        Args:
+            rel_path: Slash separated path relative to root
+
+        Returns:
+            True if the directory should be skipped
+        """
+        if rel_path.rpartition('/')[2] in self.ignored_directories:
+            return True
+        if self._glob is not None and self._glob.match(f"/{rel_path}/"):
+            return True
+        return self.use_gitignore and self._gitignored(rel_path, True)
+
+    def is_ignored_file(self, rel_path: str) -> bool:
+        """
+        Check whether a file should be skipped.
+
+        The parent directory is assumed not to be ignored, as during a top-down walk.
+
+        Args:
+            rel_path: Slash separated path relative to root
+
+        Returns:
+            True if the file should be skipped
+        """
+        if self._suffixes and rel_path.endswith(self._suffixes):
+            return True
+        if self._glob is not None and self._glob.match(f"/{rel_path}"):
+            return True
+        return self.use_gitignore and self._gitignored(rel_path, False)
+
+    def is_ignored(self, path: Path) -> bool:
+        """
+        Check an arbitrary file path, including all of its parent directories.
+
+        Args:
+            path: File path (absolute, or relative to root)
+
+        Returns:
+            True if the file should be skipped
+        """
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.root)
+            except ValueError:
+                # Outside the root only the globs apply, to the full path
+                posix = path.as_posix()
+                if self._suffixes and posix.endswith(self._suffixes):
+                    return True
+                if any(f"/{name}/" in posix for name in self._glob_directories):
+                    return True
+                return self._glob is not None and bool(self._glob.match(posix))
+
+        parts = path.parts
+        for i in range(1, len(parts)):
+            if self.is_ignored_dir('/'.join(parts[:i])):
+                return True
+        return self.is_ignored_file('/'.join(parts))
@@ -6,6 +6,7 @@ Main entry point for the CodeDocGen tool that provides both CLI and library inte
 """
 
 import argparse
+import copy
 import sys
 import logging
 from pathlib import Path
@@ -54,7 +55,9 @@ log_filename = setup_logging_early()
 
 from . import generate_docs, generate_cpp_docs, generate_python_docs
 from .scanner import RepositoryScanner
+from .pipeline import DocumentationPipeline
 from .config import Config
+from .cache import cache_directory
 
 
 def update_logging_level(verbose: bool = False) -> None:
@@ -100,6 +103,21 @@ def validate_args(args: argparse.Namespace) -> None:
     
     if args.output_dir and args.inplace:
         raise ValueError("Cannot specify both --output-dir and --inplace")
+    
+    if args.jobs is not None and args.jobs < 1:
+        raise ValueError(f"--jobs must be at least 1: {args.jobs}")
+    
+    if args.ai_batch_export and args.ai_batch_ingest:
+        raise ValueError("Cannot specify both --ai-batch-export and --ai-batch-ingest")
+    
+    if args.ai_batch_ingest and not Path(args.ai_batch_ingest).exists():
+        raise ValueError(f"Batch result file does not exist: {args.ai_batch_ingest}")
+    
+    if args.ai_budget is not None:
+        if args.ai_budget < 0:
+            raise ValueError(f"--ai-budget must not be negative: {args.ai_budget}")
+        if args.ai_batch_export or args.ai_batch_ingest:
+            raise ValueError("Cannot combine --ai-budget with --ai-batch-export or --ai-batch-ingest")
 
 
 def main() -> int:
@@ -125,6 +143,19 @@ Examples:
 
   # Process specific files only
   code_doc_gen --repo /path/to/repo --lang python --files src/main.py src/utils.py
+
+  # Parse and analyze with 8 worker processes
+  code_doc_gen --repo /path/to/repo --inplace --jobs 8
+
+  # Spend at most 200 AI requests, on the most valuable functions first
+  code_doc_gen --repo /path/to/repo --enable-ai --inplace --ai-budget 200
+
+  # Undo the last in-place run
+  code_doc_gen --repo /path/to/repo --rollback
+
+  # Nightly run through a provider batch job
+  code_doc_gen --repo /path/to/repo --enable-ai --ai-batch-export batch.jsonl
+  code_doc_gen --repo /path/to/repo --inplace --ai-batch-ingest batch_output.jsonl
         """
     )
     
@@ -156,7 +187,19 @@ Examples:
     parser.add_argument(
         '--inplace',
         action='store_true',
-        help='Modify files in place (creates backups)'
+        help='Modify files in place (the original files are journaled, see --rollback)'
+    )
+    
+    parser.add_argument(
+        '--no-journal',
+        action='store_true',
+        help='Do not record the original files of an --inplace run (it cannot be rolled back)'
+    )
+    
+    parser.add_argument(
+        '--rollback',
+        action='store_true',
+        help='Restore the files modified by the last --inplace run and exit'
     )
     
     parser.add_argument(
@@ -211,6 +254,52 @@ Examples:
         help='Automatically commit generated documentation (requires Git repository)'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the persistent parse cache (.codedocgen-cache/)'
+    )
+    
+    parser.add_argument(
+        '--no-ai-cache',
+        action='store_true',
+        help='Do not reuse or store cached AI responses for this run'
+    )
+    
+    parser.add_argument(
+        '--ai-batch-export',
+        metavar='FILE',
+        help='Write the AI prompts of all undocumented functions to a provider batch JSONL file instead of calling the API'
+    )
+    
+    parser.add_argument(
+        '--ai-batch-ingest',
+        metavar='FILE',
+        help='Apply the comments of a provider batch result JSONL file (from --ai-batch-export) without calling the API'
+    )
+    
+    parser.add_argument(
+        '--ai-budget',
+        type=int,
+        metavar='N',
+        help='Send only the highest-value undocumented functions to AI, up to N requests (or tokens, see '
+             '--ai-budget-unit); the rest use NLTK analysis'
+    )
+    
+    parser.add_argument(
+        '--ai-budget-unit',
+        choices=['requests', 'tokens'],
+        default='requests',
+        help='Unit of --ai-budget (default: requests; tokens counts the prompt plus the response limit)'
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Number of parallel parse/analyze worker processes (default: CPU count, 1 disables the pool)'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -218,6 +307,7 @@ Examples:
     )
     
     args = parser.parse_args()
+    file_writer = None
     
     try:
         # Update logging level if verbose flag is set
@@ -256,6 +346,49 @@ Examples:
             # Update config with AI settings
             config.config['ai'] = ai_config
         
+        if args.rollback:
+            from .writer import rollback_last_run
+            restored = rollback_last_run(config, Path(args.repo))
+            for file_path in restored:
+                logger.info(f"Restored {file_path}")
+            return 0
+        
+        if args.no_cache:
+            config.config['cache']['enabled'] = False
+        
+        if args.no_ai_cache:
+            config.config['cache'].setdefault('ai', {})['enabled'] = False
+        
+        # Caches live in the scanned repository, whatever the working directory
+        config.config['cache']['directory'] = str(cache_directory(config, Path(args.repo)))
+        
+        # Batch mode builds prompts from the AI configuration but never calls
+        # the API during the run
+        batch_exporter = None
+        batch_ingester = None
+        if args.ai_batch_export:
+            from .ai_batch import AIBatchExporter
+            batch_exporter = AIBatchExporter(config, Path(args.repo), Path(args.ai_batch_export))
+        elif args.ai_batch_ingest:
+            from .ai_batch import AIBatchIngester
+            batch_ingester = AIBatchIngester(config, Path(args.repo), Path(args.ai_batch_ingest))
+            logger.info(
+                f"Loaded {len(batch_ingester.responses)} batch responses "
+                f"({batch_ingester.stats['failed']} failed requests) from {args.ai_batch_ingest}"
+            )
+        if batch_exporter or batch_ingester:
+            config.config['ai']['enabled'] = False
+        
+        # A budgeted run parses and analyzes without AI, then hands the
+        # highest-value functions of the whole repository to the scheduler
+        scheduler = None
+        pipeline_config = config
+        if args.ai_budget is not None:
+            from .ai_scheduler import AIScheduler
+            scheduler = AIScheduler(config, args.ai_budget, args.ai_budget_unit)
+            pipeline_config = copy.deepcopy(config)
+            pipeline_config.config['ai']['enabled'] = False
+        
         # Initialize scanner AFTER AI configuration is updated
         scanner = RepositoryScanner(config)
         
@@ -283,55 +416,62 @@ Examples:
             logger.error(f"Available languages: {', '.join(supported_langs)}")
             return 1
         
-        # Scan repository
+        # Scan repository; files are handed to the pipeline as they are found
         logger.info("Scanning repository for source files...")
-        file_paths = scanner.scan_repository(Path(args.repo), args.lang, args.files, args.changes_only)
-        
-        if not file_paths:
-            logger.warning("No source files found to process")
-            return 0
+        file_paths = scanner.iter_repository(Path(args.repo), args.lang, args.files, args.changes_only)
         
-        logger.info(f"Found {len(file_paths)} files to process")
+        # Process files: discovery, parsing and generation run concurrently,
+        # results are written here by a single consumer
+        from .generator import DocumentationGenerator
+        pipeline = DocumentationPipeline(pipeline_config, jobs=args.jobs)
+        # Files read while parsing are reused for diffs and writes, then released
+        writer = DocumentationGenerator(config, pipeline.content)
+        results = pipeline.run(file_paths, args.lang)
+        if args.inplace and not args.diff and not batch_exporter:
+            # Files are rendered in the background and replaced together at the end
+            from .writer import TransactionalWriter
+            file_writer = TransactionalWriter(config, Path(args.repo), writer,
+                                              journal=False if args.no_journal else None,
+                                              content_store=pipeline.content)
+        if scheduler:
+            results = scheduler.run(results)
         
-        # Process files
         total_functions = 0
         processed_files = 0
+        modified_paths = []
         
-        for file_path in file_paths:
+        for result in results:
+            file_path = result.file_path
+            staged = False
             try:
                 logger.info(f"Processing {file_path}")
                 
-                # Parse file
-                functions = scanner.parse_file(file_path, args.lang)
-                
-                if not functions:
+                if not result.functions:
                     logger.warning(f"No functions found in {file_path}")
                     continue
                 
-                logger.info(f"Found {len(functions)} functions in {file_path}")
-                total_functions += len(functions)
+                logger.info(f"Found {len(result.functions)} functions in {file_path}")
+                total_functions += len(result.functions)
                 
-                # Generate documentation
-                from .generator import DocumentationGenerator
-                generator = DocumentationGenerator(config)
+                if not result.language:
+                    logger.warning(f"Could not determine language for {file_path}")
+                    continue
                 
-                # Determine language for this file
-                file_lang = args.lang
-                if not file_lang:
-                    # Auto-detect language based on file extension
-                    if file_path.suffix.lower() in ['.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.hh', '.hxx']:
-                        file_lang = 'c++'
-                    elif file_path.suffix.lower() in ['.py', '.pyx', '.pxd']:
-                        file_lang = 'python'
-                    elif file_path.suffix.lower() == '.java':
-                        file_lang = 'java'
-                    elif file_path.suffix.lower() in ['.js', '.mjs', '.cjs']:
-                        file_lang = 'javascript'
-                    else:
-                        logger.warning(f"Could not determine language for {file_path}")
-                        continue
+                documentation = result.documentation
                 
-                documentation = generator.generate_documentation(functions, file_lang)
+                if batch_exporter:
+                    exported = batch_exporter.add(file_path, result.functions, result.language)
+                    logger.info(f"Exported {exported} batch requests for {file_path}")
+                    continue
+                
+                if batch_ingester:
+                    # Only functions with a batch comment are documented; the rest wait for the next batch
+                    applied = set(batch_ingester.apply(file_path, result.functions, result.language))
+                    documentation = {
+                        name: doc
+                        for name, doc in writer.generate_documentation(result.functions, result.language).items()
+                        if name in applied
+                    }
                 
                 if not documentation:
                     logger.warning(f"No documentation generated for {file_path}")
@@ -340,7 +480,7 @@ Examples:
                 # Apply or output documentation
                 if args.diff:
                     # Show diff
-                    diff = generator.generate_diff(file_path, documentation)
+                    diff = writer.generate_diff(file_path, documentation, result.language, result.functions)
                     if diff:
                         print(f"\n--- Diff for {file_path} ---")
                         print(diff)
@@ -349,13 +489,13 @@ Examples:
                 
                 elif args.inplace:
                     # Apply in place
-                    generator.apply_documentation_inplace(file_path, documentation)
-                    processed_files += 1
+                    file_writer.stage(file_path, documentation, result.language, result.functions)
+                    staged = True
                 
                 elif args.output_dir:
                     # Write to output directory
                     output_path = Path(args.output_dir) / file_path.name
-                    generator.write_documentation_to_file(output_path, documentation)
+                    writer.write_documentation_to_file(output_path, documentation)
                     processed_files += 1
                 
                 else:
@@ -368,14 +508,74 @@ Examples:
             except Exception as e:
                 logger.error(f"Error processing {file_path}: {e}")
                 continue
+            finally:
+                # Staged files are released by the writer once rendered
+                if not staged:
+                    pipeline.content.release(file_path)
+        
+        if file_writer:
+            modified_paths = file_writer.commit()
+            processed_files += len(modified_paths)
+        
+        if batch_exporter:
+            batch_exporter.close()
+            logger.info(f"Wrote {batch_exporter.exported} batch requests to {args.ai_batch_export}")
+        if batch_ingester:
+            logger.info(f"Applied {batch_ingester.stats['applied']} batch comments from {args.ai_batch_ingest}")
+        if scheduler:
+            scheduler_stats = scheduler.stats
+            logger.info(
+                f"AI budget: {scheduler_stats['documented']} of {scheduler_stats['candidates']} undocumented functions "
+                f"documented by AI ({scheduler_stats['spent']} of {args.ai_budget} {args.ai_budget_unit} spent, "
+                f"{scheduler_stats['cached']} from cache), {scheduler_stats['fallback']} used NLTK analysis"
+            )
+        
+        if not pipeline.stats['discovered']:
+            logger.warning("No source files found to process")
+            return 0
         
         # Summary
         logger.info(f"Processing complete!")
+        logger.info(f"Found {pipeline.stats['discovered']} source files")
         logger.info(f"Processed {processed_files} files")
         logger.info(f"Found {total_functions} functions")
         
-        if args.inplace:
-            logger.info("Files have been modified in place (backups created with .bak extension)")
+        if config.get_cache_config().get('enabled', True):
+            pipeline_stats = pipeline.stats
+            logger.info(
+                f"Parse cache: {pipeline_stats['cache_hits']} hits, "
+                f"{pipeline_stats['parsed'] - pipeline_stats['cache_hits']} misses"
+            )
+        scanner.cache.close()
+        
+        dedup = pipeline.get_dedup_stats()
+        if dedup['functions']:
+            logger.info(
+                f"Deduplicated {dedup['duplicates']} of {dedup['functions']} analyzed functions "
+                f"({dedup['duplicates'] / dedup['functions']:.1%} reused an identical function's analysis)"
+            )
+        
+        for target, health in sorted(pipeline.get_ai_health().items()):
+            p50 = f"{health['p50'] * 1000:.0f} ms" if health['p50'] is not None else "n/a"
+            logger.info(
+                f"AI {target}: {health['requests']} requests, {health['failures']} failed, "
+                f"p50 {p50}, circuit opened {health['circuit_opens']}x, "
+                f"{health['skipped']} skipped, now {health['state']}"
+            )
+        
+        if file_writer:
+            writer_stats = file_writer.stats
+            throughput = file_writer.throughput()
+            logger.info(
+                f"Wrote {writer_stats['written']} files ({writer_stats['bytes'] / (1024 * 1024):.2f} MB) in "
+                f"{writer_stats['seconds']:.2f}s: {throughput['files_per_second']:.0f} files/s, "
+                f"{throughput['mb_per_second']:.2f} MB/s ({writer_stats['unchanged']} unchanged, "
+                f"{writer_stats['conflicts']} changed during the run, {writer_stats['failed']} failed)"
+            )
+            if file_writer.journal_path:
+                logger.info("Files have been modified in place (undo with --rollback)")
+            else:
+                logger.info("Files have been modified in place")
         elif args.output_dir:
             logger.info(f"Modified files written to {args.output_dir}")
         
@@ -387,7 +587,7 @@ Examples:
             if git_integration.is_git_repo:
                 # Stage all modified files
                 staged_count = 0
-                for file_path in file_paths:
+                for file_path in modified_paths:
                     if git_integration.stage_file(file_path):
                         staged_count += 1
                 
@@ -406,9 +606,13 @@ Examples:
         return 0
         
     except KeyboardInterrupt:
+        if file_writer:
+            file_writer.abort()
         logger.info("Operation cancelled by user")
         return 1
     except Exception as e:
+        if file_writer:
+            file_writer.abort()
         logger.error(f"Error: {e}")
         if args.verbose:
             import traceback
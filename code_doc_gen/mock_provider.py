@@ -0,0 +1,307 @@
+"""
+Local stand-in for the OpenAI and Groq chat-completions APIs.
+
+Answers ``POST .../chat/completions`` in the OpenAI wire format (which Groq
+also speaks), plain or streamed as server-sent events, with canned responses
+after a configurable latency, and injects server errors and 429 rate
+limiting at configurable rates. Responses are cut at the request's
+``max_tokens`` and the output tokens actually sent are counted, as a
+provider would bill them. Point the providers at it to load-test
+CodeDocGen's AI path without spending money:
+
+    python -m code_doc_gen.mock_provider --port 8000 --latency-ms 300 --rate-limit-rate 0.05
+
+    ai:
+      base_urls:
+        groq: "http://127.0.0.1:8000"
+        openai: "http://127.0.0.1:8000/v1"
+"""
+
+import re
+import json
+import math
+import time
+import random
+import argparse
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+DEFAULT_RESPONSE = "Computes the result from the given arguments and returns it."
+
+# Output "tokens" of a canned response: words with their trailing whitespace
+_TOKEN = re.compile(r'\s*\S+\s*|\s+')
+
+
+class MockProviderServer:
+    """Threaded HTTP server answering chat completions with injected latency and failures."""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency_ms: float = 50.0,
+        latency_sigma: float = 0.0,
+        token_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        responses: Optional[List[str]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the server (call start() to serve).
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency_ms: Median response latency in milliseconds
+            latency_sigma: Spread of the log-normal latency distribution (0 for fixed latency)
+            token_ms: Generation time per output token in milliseconds
+            error_rate: Fraction of requests answered with a 500 error
+            rate_limit_rate: Fraction of requests answered with a 429 and a Retry-After header
+            retry_after: Retry-After seconds sent with a 429
+            responses: Canned completion texts, served round-robin
+            seed: Random seed, for reproducible runs
+        """
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.token_ms = token_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.responses = responses or [DEFAULT_RESPONSE]
+        self.stats: Dict[str, int] = {
+            'requests': 0, 'completed': 0, 'errors': 0, 'rate_limited': 0, 'completion_tokens': 0,
+        }
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def url(self) -> str:
+        """Root URL of the server; the Groq SDK appends /openai/v1 itself."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_url(self, provider: str) -> str:
+        """
+        Get the base URL to configure for a provider.
+
+        Args:
+            provider: 'groq' or 'openai'
+
+        Returns:
+            Base URL for the provider's SDK client
+        """
+        return self.url if provider == 'groq' else f"{self.url}/v1"
+
+    def start(self) -> 'MockProviderServer':
+        """
+        Serve requests on a background thread.
+
+        Returns:
+            The server itself
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name='codedocgen-mock-provider', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'MockProviderServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _next_outcome(self) -> tuple:
+        """Pick the latency, status and canned response of the next request."""
+        with self._lock:
+            self.stats['requests'] += 1
+            latency = self.latency_ms / 1000.0
+            if self.latency_sigma > 0:
+                latency *= math.exp(self._random.gauss(0.0, self.latency_sigma))
+            roll = self._random.random()
+            if roll < self.error_rate:
+                self.stats['errors'] += 1
+                return latency, 500, None
+            if roll < self.error_rate + self.rate_limit_rate:
+                self.stats['rate_limited'] += 1
+                return latency, 429, None
+            response = self.responses[self.stats['completed'] % len(self.responses)]
+            self.stats['completed'] += 1
+            return latency, 200, response
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Avoid Nagle/delayed-ACK stalls on kept-alive connections
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._send(404, {'error': {'message': f"Unknown path {self.path}", 'type': 'invalid_request_error'}})
+                    return
+                try:
+                    request = json.loads(body or b'{}')
+                except ValueError:
+                    self._send(400, {'error': {'message': 'Invalid JSON body', 'type': 'invalid_request_error'}})
+                    return
+
+                latency, status, content = server._next_outcome()
+                time.sleep(latency)
+                if status == 500:
+                    self._send(500, {'error': {'message': 'Injected server error', 'type': 'server_error'}})
+                elif status == 429:
+                    self._send(429, {'error': {'message': 'Injected rate limit', 'type': 'rate_limit_exceeded'}},
+                               {'retry-after': f"{server.retry_after:g}"})
+                elif request.get('stream'):
+                    self._stream(request, content)
+                else:
+                    tokens = server._tokens(request, content)
+                    time.sleep(len(tokens) * server.token_ms / 1000.0)
+                    server._count_tokens(len(tokens))
+                    self._send(200, server._completion(request, ''.join(tokens), len(tokens)))
+
+            def _stream(self, request: dict, content: str) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                try:
+                    for token in server._tokens(request, content):
+                        time.sleep(server.token_ms / 1000.0)
+                        self._write_event(server._chunk(request, {'content': token}))
+                        server._count_tokens(1)
+                    self._write_event(server._chunk(request, {}, 'stop'))
+                    self._write_chunk(b'data: [DONE]\n\n')
+                    self._write_chunk(b'')
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading; generation ends here
+                    self.close_connection = True
+
+            def _write_event(self, payload: dict) -> None:
+                self._write_chunk(b'data: ' + json.dumps(payload).encode('utf-8') + b'\n\n')
+
+            def _write_chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+                self.wfile.flush()
+
+            def _send(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                server.logger.debug(format % args)
+
+        return Handler
+
+    def _count_tokens(self, count: int) -> None:
+        with self._lock:
+            self.stats['completion_tokens'] += count
+
+    @staticmethod
+    def _tokens(request: dict, content: str) -> List[str]:
+        """Split a canned response into output tokens, cut at the request's max_tokens."""
+        tokens = _TOKEN.findall(content)
+        max_tokens = request.get('max_tokens')
+        return tokens[:max_tokens] if max_tokens else tokens
+
+    @staticmethod
+    def _chunk(request: dict, delta: dict, finish_reason: Optional[str] = None) -> dict:
+        """Build a chat.completion.chunk stream event."""
+        return {
+            'id': 'chatcmpl-mock',
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+        }
+
+    @staticmethod
+    def _completion(request: dict, content: str, completion_tokens: int) -> dict:
+        """Build a chat.completion response body."""
+        prompt = ''.join(str(m.get('content', '')) for m in request.get('messages', []))
+        prompt_tokens = max(1, len(prompt) // 4)
+        return {
+            'id': f"chatcmpl-mock-{int(time.time() * 1000)}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        }
+
+
+def main() -> None:
+    """Run the mock provider from the command line."""
+    parser = argparse.ArgumentParser(description="Local OpenAI/Groq-compatible mock provider for load tests")
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Median response latency in milliseconds')
+    parser.add_argument('--latency-sigma', type=float, default=0.0, help='Log-normal latency spread (0 = fixed)')
+    parser.add_argument('--token-ms', type=float, default=0.0, help='Generation time per output token in milliseconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests failing with 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with a 429')
+    parser.add_argument('--responses', help='File with canned responses, separated by blank lines')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    responses = None
+    if args.responses:
+        with open(args.responses, encoding='utf-8') as f:
+            responses = [chunk.strip() for chunk in f.read().split('\n\n') if chunk.strip()]
+
+    server = MockProviderServer(
+        args.host, args.port, args.latency_ms, args.latency_sigma, args.token_ms, args.error_rate,
+        args.rate_limit_rate, args.retry_after, responses, args.seed
+    ).start()
+    logging.getLogger(__name__).info(
+        f"Mock provider on {server.url} (groq base_url {server.base_url('groq')}, "
+        f"openai base_url {server.base_url('openai')})"
+    )
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        logging.getLogger(__name__).info(f"Served: {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
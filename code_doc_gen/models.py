@@ -100,7 +100,12 @@ class Function:
                  exceptions: List[FunctionException] = None,
                  body: Optional[FunctionBody] = None,
                  ast_node: Optional[ast.AST] = None,
-                 source_code: str = ""):
+                 source_code: str = "",
+                 start_offset: Optional[int] = None,
+                 end_offset: Optional[int] = None,
+                 line_number: Optional[int] = None,
+                 end_line: Optional[int] = None,
+                 preceded_by_documentation: Optional[bool] = None):
         self.name = name
         self.parameters = parameters
         self.return_type = return_type
@@ -112,6 +117,14 @@ class Function:
         self.body = body or FunctionBody()
         self.ast_node = ast_node
         self.source_code = source_code
+        # Character span of source_code within its file, when the parser knows it
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+        # 1-based lines of the definition and of its last line, when the parser knows them
+        self.line_number = line_number
+        self.end_line = end_line
+        # Whether a documentation comment precedes the definition in its file, once checked
+        self.preceded_by_documentation = preceded_by_documentation
     
     def has_parameters(self) -> bool:
         """Check if the function has parameters."""
@@ -0,0 +1,264 @@
+"""
+Shared NLTK tagging for CodeDocGen.
+
+Holds one tokenizer/tagger per process. Tokenization and part-of-speech tags of
+identifier words are memoized, so names built from the same few words (get,
+set, value, ...) are only tagged once, and missing NLTK data is detected once
+instead of on every call.
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from typing import List, Dict, Optional, Iterable, Sequence, Tuple
+
+import nltk
+
+
+# Resource path -> download package. NLTK >= 3.9 loads the *_tab / *_eng variants.
+NLTK_RESOURCES = {
+    'tokenizers/punkt': 'punkt',
+    'tokenizers/punkt_tab': 'punkt_tab',
+    'taggers/averaged_perceptron_tagger': 'averaged_perceptron_tagger',
+    'taggers/averaged_perceptron_tagger_eng': 'averaged_perceptron_tagger_eng',
+    'corpora/wordnet': 'wordnet',
+}
+
+_resources_checked = False
+_resources_lock = threading.Lock()
+
+
+def ensure_nltk_resources(download: bool = True) -> None:
+    """
+    Make sure the NLTK data used by the analyzer is present, once per process.
+
+    Args:
+        download: Whether missing resources may be downloaded
+    """
+    global _resources_checked
+    if _resources_checked:
+        return
+
+    with _resources_lock:
+        if _resources_checked:
+            return
+        for path, package in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                if download:
+                    try:
+                        nltk.download(package, quiet=True)
+                    except Exception as e:
+                        logging.getLogger(__name__).debug(f"Could not download NLTK resource {package}: {e}")
+        _resources_checked = True
+
+
+class IdentifierTagger:
+    """Memoizing wrapper around nltk.word_tokenize and nltk.pos_tag."""
+
+    def __init__(self, max_entries: int = 65536):
+        """
+        Initialize the tagger.
+
+        Args:
+            max_entries: Maximum number of memoized entries per table (LRU)
+        """
+        self.max_entries = max_entries
+        self._tags: "OrderedDict[Tuple[str, ...], Tuple[Tuple[str, str], ...]]" = OrderedDict()
+        self._tokens: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # First failure of each NLTK call; later calls fail fast with the same error
+        self._tag_error: Optional[BaseException] = None
+        self._tokenize_error: Optional[BaseException] = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, table: OrderedDict, key):
+        """Return a memoized value (refreshing its LRU position) or None."""
+        with self._lock:
+            value = table.get(key)
+            if value is not None:
+                table.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def _store(self, table: OrderedDict, key, value) -> None:
+        """Memoize a value, evicting the least recently used entry when full."""
+        with self._lock:
+            table[key] = value
+            if len(table) > self.max_entries:
+                table.popitem(last=False)
+
+    @staticmethod
+    def _raise_cached(error: BaseException) -> None:
+        # A fresh instance keeps tracebacks from piling up on a shared exception
+        raise type(error)(*error.args)
+
+    def tokenize(self, text: str) -> Tuple[str, ...]:
+        """
+        Tokenize text with nltk.word_tokenize.
+
+        Args:
+            text: Text to tokenize
+
+        Returns:
+            Tuple of tokens
+
+        Raises:
+            LookupError: If the NLTK tokenizer data is not available
+        """
+        tokens = self._lookup(self._tokens, text)
+        if tokens is not None:
+            return tokens
+        if self._tokenize_error is not None:
+            self._raise_cached(self._tokenize_error)
+
+        try:
+            tokens = tuple(nltk.word_tokenize(text))
+        except (LookupError, OSError) as e:
+            self._tokenize_error = e
+            raise
+
+        self._store(self._tokens, text, tokens)
+        return tokens
+
+    def tag(self, words: Sequence[str]) -> Tuple[Tuple[str, str], ...]:
+        """
+        Part-of-speech tag a sequence of words with nltk.pos_tag.
+
+        Args:
+            words: Words of one identifier
+
+        Returns:
+            Tuple of (word, tag) pairs
+
+        Raises:
+            LookupError: If the NLTK tagger data is not available
+        """
+        key = tuple(words)
+        tagged = self._lookup(self._tags, key)
+        if tagged is not None:
+            return tagged
+        if self._tag_error is not None:
+            self._raise_cached(self._tag_error)
+
+        try:
+            tagged = tuple(nltk.pos_tag(list(key)))
+        except (LookupError, OSError) as e:
+            self._tag_error = e
+            raise
+
+        self._store(self._tags, key, tagged)
+        return tagged
+
+    def tag_sents(self, sentences: Iterable[Sequence[str]]) -> List[Tuple[Tuple[str, str], ...]]:
+        """
+        Part-of-speech tag many word sequences, calling NLTK once for all misses.
+
+        Args:
+            sentences: Word sequences, one per identifier
+
+        Returns:
+            Tagged sequences in input order
+
+        Raises:
+            LookupError: If the NLTK tagger data is not available
+        """
+        keys = [tuple(words) for words in sentences]
+        results: List[Optional[Tuple[Tuple[str, str], ...]]] = [self._lookup(self._tags, key) for key in keys]
+
+        # Each distinct untagged sequence is tagged once
+        missing = list(dict.fromkeys(key for key, result in zip(keys, results) if result is None))
+        if missing:
+            if self._tag_error is not None:
+                self._raise_cached(self._tag_error)
+            try:
+                tagged_sents = nltk.pos_tag_sents([list(key) for key in missing])
+            except (LookupError, OSError) as e:
+                self._tag_error = e
+                raise
+
+            tagged_by_key = {}
+            for key, tagged in zip(missing, tagged_sents):
+                tagged_by_key[key] = tuple(tagged)
+                self._store(self._tags, key, tagged_by_key[key])
+            results = [tagged_by_key[key] if result is None else result for key, result in zip(keys, results)]
+
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get memoization statistics.
+
+        Returns:
+            Dictionary of tagger statistics
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'tag_entries': len(self._tags),
+            'token_entries': len(self._tokens),
+        }
+
+
+_tagger: Optional[IdentifierTagger] = None
+_tagger_lock = threading.Lock()
+
+
+def get_tagger() -> IdentifierTagger:
+    """
+    Get the process-wide tagger, creating it on first use.
+
+    Returns:
+        IdentifierTagger instance
+    """
+    global _tagger
+    if _tagger is None:
+        with _tagger_lock:
+            if _tagger is None:
+                _tagger = IdentifierTagger()
+    return _tagger
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """
+    Tokenize text with the process-wide tagger.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Tuple of tokens
+    """
+    return get_tagger().tokenize(text)
+
+
+def tag_identifier(words: Sequence[str]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Part-of-speech tag the words of an identifier with the process-wide tagger.
+
+    Args:
+        words: Words of one identifier
+
+    Returns:
+        Tuple of (word, tag) pairs
+    """
+    return get_tagger().tag(words)
+
+
+def tag_identifiers(sentences: Iterable[Sequence[str]]) -> List[Tuple[Tuple[str, str], ...]]:
+    """
+    Part-of-speech tag many identifiers in one batch with the process-wide tagger.
+
+    Args:
+        sentences: Word sequences, one per identifier
+
+    Returns:
+        Tagged sequences in input order
+    """
+    return get_tagger().tag_sents(sentences)
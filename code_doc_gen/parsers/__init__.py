@@ -6,11 +6,12 @@ signatures, parameters, and analyze function bodies.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from ..models import Function, ParsedFile
 from ..config import Config
+from ..content import ContentStore, FileContent
 
 
 class BaseParser(ABC):
@@ -24,6 +25,22 @@ class BaseParser(ABC):
             config: Configuration object
         """
         self.config = config
+        # File contents shared with the other stages of a run; set by the scanner
+        self.content_store: Optional[ContentStore] = None
+    
+    def read_content(self, file_path: Path) -> FileContent:
+        """
+        Get the content of a source file, from the run's content store if there is one.
+        
+        Args:
+            file_path: Path to the source file
+            
+        Returns:
+            FileContent of the file
+        """
+        if self.content_store is not None:
+            return self.content_store.get(file_path)
+        return FileContent.read(file_path)
     
     @abstractmethod
     def parse_file(self, file_path: Path) -> ParsedFile:
@@ -55,16 +72,26 @@ class BaseParser(ABC):
 class ParserFactory:
     """Factory for creating language-specific parsers."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, content_store: Optional[ContentStore] = None):
         """
         Initialize the parser factory.
         
         Args:
             config: Configuration object
+            content_store: Store the parsers read source files from
         """
         self.config = config
         self._parsers = {}
         self._load_parsers()
+        for parser in self._parsers.values():
+            parser.content_store = content_store
+        
+        # Suffix -> (language, parser) for every extension a loaded parser accepts
+        self._by_suffix: Dict[str, Tuple[str, BaseParser]] = {}
+        for suffix, language in config.get_language_index().items():
+            parser = self._parsers.get(language)
+            if parser is not None and parser.can_parse(Path(f"probe{suffix}")):
+                self._by_suffix[suffix] = (language, parser)
     
     def _load_parsers(self) -> None:
         """Load available parsers."""
@@ -123,11 +150,40 @@ class ParserFactory:
         Raises:
             ValueError: If no parser can handle the file
         """
-        for language, parser in self._parsers.items():
-            if parser.can_parse(file_path):
-                return parser
+        return self.resolve(file_path)[1]
+    
+    def resolve(self, file_path: Path) -> Tuple[str, BaseParser]:
+        """
+        Look up the language and parser for a file by its extension.
         
-        raise ValueError(f"No parser available for file: {file_path}")
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Tuple of (language, parser)
+            
+        Raises:
+            ValueError: If no parser can handle the file
+        """
+        entry = self._by_suffix.get(file_path.suffix.lower())
+        if entry is None:
+            raise ValueError(f"No parser available for file: {file_path}")
+        return entry
+    
+    def get_suffixes(self, language: Optional[str] = None) -> List[str]:
+        """
+        Get the file suffixes handled by the loaded parsers.
+        
+        Args:
+            language: Restrict to this language (if None, all languages)
+            
+        Returns:
+            List of lowercase suffixes including the leading dot
+        """
+        return [
+            suffix for suffix, (lang, _) in self._by_suffix.items()
+            if language is None or lang == language
+        ]
     
     def get_supported_languages(self) -> List[str]:
         """
@@ -6,6 +6,7 @@ parameters, and analyze function bodies.
 """
 
 import os
+import re
 import sys
 import glob
 import platform
@@ -15,6 +16,7 @@ from typing import List, Dict, Any, Optional, TYPE_CHECKING
 import logging
 
 from . import BaseParser
+from .spans import LineIndex, find_block_end, line_start
 from ..models import Function, Parameter, FunctionBody, FunctionException, ParsedFile, FunctionType
 from ..config import Config
 
@@ -39,6 +41,14 @@ else:
     Cursor = Any
     Type = Any
 
+# Function definition head for the regex fallback: return_type function_name(parameters) {
+# The return type starts a line and stays on it, so preprocessor directives and
+# the lines before a definition never become part of it
+_FUNCTION_HEAD = re.compile(
+    r'^[ \t]*([a-zA-Z_][\w:<>,&* \t]*)[ \t]+(\w+)\s*\(([^)]*)\)\s*\{',
+    re.MULTILINE
+)
+
 
 class CppParser(BaseParser):
     """Parser for C++ source files."""
@@ -169,7 +179,7 @@ class CppParser(BaseParser):
                                 return
                         if _try_set_and_probe("path", native_dir2):
                             return
-                except Exception:
+        except Exception:
             pass
 
         # 4) ctypes-based search for common library names
@@ -181,7 +191,7 @@ class CppParser(BaseParser):
                     # Otherwise, fall back to set_library_file with the returned value
                     if _try_set_and_probe("file", found):
                         return
-                    except Exception:
+            except Exception:
                 pass
 
         # 5) OS-specific common locations
@@ -287,10 +297,12 @@ class CppParser(BaseParser):
             # Create libclang index
             index = clang.cindex.Index.create()
             
-            # Parse the file
+            # Parse the file, handing libclang the source already read for the run
+            source_code = self.read_content(file_path).text
             translation_unit = index.parse(
                 str(file_path),
-                args=['-std=c++17', '-x', 'c++']  # Use C++17 standard
+                args=['-std=c++17', '-x', 'c++'],  # Use C++17 standard
+                unsaved_files=[(str(file_path), source_code)]
             )
             
             parsed_file = ParsedFile(
@@ -382,7 +394,9 @@ class CppParser(BaseParser):
                 exceptions=exceptions,
                 body=body,
                 function_type=FunctionType.FUNCTION,
-                source_code=source_code
+                source_code=source_code,
+                line_number=cursor.location.line,
+                end_line=self._get_end_line(cursor)
             )
             
             return function
@@ -434,7 +448,9 @@ class CppParser(BaseParser):
                 body=body,
                 function_type=FunctionType.METHOD,
                 class_name=class_name,
-                source_code=source_code
+                source_code=source_code,
+                line_number=cursor.location.line,
+                end_line=self._get_end_line(cursor)
             )
             
             return function
@@ -754,19 +770,12 @@ class CppParser(BaseParser):
         Returns:
             End line number
         """
-        if not CLANG_AVAILABLE:
-            # This is a simplified implementation
-            # In a real implementation, you would need to traverse the AST
-            # to find the actual end of the function
-            
-            # For now, we'll use a reasonable estimate
-            return cursor.location.line + 10  # Assume 10 lines for the function
-            
-        # This is a simplified implementation
-        # In a real implementation, you would need to traverse the AST
-        # to find the actual end of the function
+        # The cursor's extent ends with the closing brace of the body
+        extent = getattr(cursor, 'extent', None)
+        if extent is not None and extent.end.line >= cursor.location.line:
+            return extent.end.line
         
-        # For now, we'll use a reasonable estimate
+        # Without an extent, use a reasonable estimate
         return cursor.location.line + 10  # Assume 10 lines for the function
     
     def _extract_function_source(self, cursor: Cursor) -> str:
@@ -788,8 +797,8 @@ class CppParser(BaseParser):
             if not file_path:
                 return ""
                 
-            with open(str(file_path), 'r', encoding='utf-8') as f:
-                source_lines = f.readlines()
+            # Shared with the other functions of the file instead of re-reading it
+            source_lines = self.read_content(Path(str(file_path))).lines
             
             # Get start and end lines
             start_line = cursor.location.line - 1  # 0-indexed
@@ -817,8 +826,7 @@ class CppParser(BaseParser):
         
         if not CLANG_AVAILABLE:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    source_code = f.read()
+                source_code = self.read_content(file_path).text
                 
                 parsed_file = ParsedFile(
                     file_path=str(file_path),
@@ -837,8 +845,7 @@ class CppParser(BaseParser):
                 return ParsedFile(file_path=str(file_path), language='c++')
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            source_code = self.read_content(file_path).text
             
             parsed_file = ParsedFile(
                 file_path=str(file_path),
@@ -866,14 +873,11 @@ class CppParser(BaseParser):
         Returns:
             List of Function objects
         """
-        import re
+        lines = LineIndex(source_code)
         
         if not CLANG_AVAILABLE:
             functions = []
-            # Updated pattern for function definitions to match complex return types
-            # Matches: return_type function_name(parameters) { body }
-            function_pattern = r'([a-zA-Z_][\w:\s<>,&*]*)\s+(\w+)\s*\(([^)]*)\)\s*\{'
-            matches = re.finditer(function_pattern, source_code)
+            matches = _FUNCTION_HEAD.finditer(source_code)
             for match in matches:
                 return_type = match.group(1).strip()
                 function_name = match.group(2).strip()
@@ -891,16 +895,13 @@ class CppParser(BaseParser):
                     body=body,
                     function_type=FunctionType.FUNCTION
                 )
+                self._set_span_regex(function, source_code, lines, match)
                 functions.append(function)
             return functions
             
         functions = []
         
-        # Updated pattern for function definitions to match complex return types
-        # Matches: return_type function_name(parameters) { body }
-        function_pattern = r'([a-zA-Z_][\w:\s<>,&*]*)\s+(\w+)\s*\(([^)]*)\)\s*\{'
-        
-        matches = re.finditer(function_pattern, source_code)
+        matches = _FUNCTION_HEAD.finditer(source_code)
         for match in matches:
             return_type = match.group(1).strip()
             function_name = match.group(2).strip()
@@ -921,11 +922,30 @@ class CppParser(BaseParser):
                 body=body,
                 function_type=FunctionType.FUNCTION
             )
+            self._set_span_regex(function, source_code, lines, match)
             
             functions.append(function)
         
         return functions
     
+    def _set_span_regex(self, function: Function, source_code: str, lines: LineIndex, match) -> None:
+        """
+        Record where a regex-matched function sits in its file.
+        
+        Args:
+            function: Function to update
+            source_code: Complete source code
+            lines: Line index of source_code
+            match: Match of the function head, ending with the body's opening brace
+        """
+        name_index = match.start(2)
+        body_end = find_block_end(source_code, match.end() - 1)
+        end = body_end + 1 if body_end != -1 else len(source_code)
+        function.start_offset = line_start(source_code, name_index)
+        function.end_offset = end
+        function.line_number = lines.line_of(name_index)
+        function.end_line = lines.line_of(end - 1)
+    
     def _analyze_function_body_regex(self, source_code: str, function_start: int, function_name: str) -> FunctionBody:
         """
         Analyze function body using regex patterns for NLTK analysis.
@@ -8,9 +8,10 @@ parameters, and analyze function bodies.
 import re
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from . import BaseParser
+from .spans import LineIndex, find_block_end, line_start
 from ..models import Function, Parameter, FunctionBody, FunctionException, ParsedFile, FunctionType
 from ..config import Config
 
@@ -57,8 +58,7 @@ class JavaParser(BaseParser):
             ParsedFile object containing extracted functions
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            source_code = self.read_content(file_path).text
             
             parsed_file = ParsedFile(
                 file_path=str(file_path),
@@ -246,6 +246,7 @@ class JavaParser(BaseParser):
         # Method pattern: modifiers return_type method_name(parameters) throws exceptions
         method_pattern = r'(?:public|private|protected|static|\s) +[\w\<\>\[\]]+\s+(\w+) *\([^\)]*\) *[^\{]*\{'
         
+        lines = LineIndex(source_code)
         matches = re.finditer(method_pattern, source_code)
         for match in matches:
             method_name = match.group(1)
@@ -259,6 +260,13 @@ class JavaParser(BaseParser):
             signature = source_code[start:end].strip()
             function = self._parse_method_signature(signature, method_name)
             if function:
+                # Locate the method: its name's line through its closing brace
+                body_end = find_block_end(source_code, match.end() - 1)
+                body_end = body_end + 1 if body_end != -1 else len(source_code)
+                function.start_offset = line_start(source_code, match.start(1))
+                function.end_offset = body_end
+                function.line_number = lines.line_of(match.start(1))
+                function.end_line = lines.line_of(body_end - 1)
                 methods.append(function)
         
         return methods
@@ -303,6 +311,9 @@ class JavaParser(BaseParser):
             # Analyze function body
             body = self._analyze_method_body_javaparser(method_decl)
             
+            # Get line numbers
+            line_number, end_line = self._get_lines_javaparser(method_decl)
+            
             function = Function(
                 name=name,
                 return_type=return_type,
@@ -310,7 +321,9 @@ class JavaParser(BaseParser):
                 exceptions=exceptions,
                 body=body,
                 function_type=function_type,
-                class_name=class_name
+                class_name=class_name,
+                line_number=line_number,
+                end_line=end_line
             )
             
             return function
@@ -319,6 +332,21 @@ class JavaParser(BaseParser):
             print(f"Error parsing method {method_decl.getName()}: {e}")
             return None
     
+    def _get_lines_javaparser(self, method_decl) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get the first and last line of a javaparser method declaration.
+        
+        Args:
+            method_decl: javaparser method declaration
+            
+        Returns:
+            Tuple of (line number, end line), None where the range is unknown
+        """
+        try:
+            return method_decl.getBegin().get().line, method_decl.getEnd().get().line
+        except Exception:
+            return None, None
+    
     def _parse_method_signature(self, signature: str, method_name: str) -> Optional[Function]:
         """
         Parse a method signature using regex.
@@ -11,13 +11,26 @@ from pathlib import Path
 from typing import List, Optional
 
 from . import BaseParser
+from .spans import LineIndex, find_block_end, find_body_start, find_expression_end, line_start
 from ..models import Function, Parameter, FunctionBody, ParsedFile, FunctionType
 from ..config import Config
 
 
+_WHITESPACE = re.compile(r"\s*")
+
+
 class JavaScriptParser(BaseParser):
     """Parser for JavaScript source files (.js, .mjs, .cjs)."""
 
+    # Method head inside a class body: modifiers, name, type parameters, parameters, return type, '{'
+    METHOD_PATTERN = re.compile(
+        r"(?:(?:public|private|protected|readonly|static|async|get|set)\s+)*([A-Za-z_$][\w$]*)\s*"
+        r"(?:<[^>]+>)?\s*\(([^)]*)\)\s*(?::\s*[^ {]+)?\s*\{"
+    )
+
+    # Control statements whose heads look like method declarations
+    NON_METHOD_KEYWORDS = frozenset({'if', 'for', 'while', 'switch', 'catch', 'with', 'function', 'return'})
+
     def __init__(self, config: Config):
         super().__init__(config)
 
@@ -26,7 +39,8 @@ class JavaScriptParser(BaseParser):
 
     def parse_file(self, file_path: Path) -> ParsedFile:
         try:
-            source = file_path.read_text(encoding='utf-8')
+            content = self.read_content(file_path)
+            source = content.text
         except Exception as read_err:
             logging.getLogger(__name__).error(f"Failed reading {file_path}: {read_err}")
             # Return empty result early to avoid parsing empty content
@@ -37,13 +51,14 @@ class JavaScriptParser(BaseParser):
         try:
             # Collect functions from various patterns
             functions: List[Function] = []
+            lines = content.line_index
 
             # 1) Function declarations: function name(a, b) { ... }
             for m in re.finditer(r"\bfunction\s+([a-zA-Z_$][\w$]*)\s*\(([^)]*)\)", source):
                 name = m.group(1)
                 params = self._parse_params(m.group(2))
                 func = self._create_function(name, params, 'any', None)
-                func.source_code = source
+                self._set_span(func, source, lines, m.start(1), find_body_start(source, m.end()))
                 functions.append(func)
 
             # 2) Function expressions: const name = function(a, b) { ... }
@@ -51,7 +66,7 @@ class JavaScriptParser(BaseParser):
                 name = m.group(1)
                 params = self._parse_params(m.group(2))
                 func = self._create_function(name, params, 'any', None)
-                func.source_code = source
+                self._set_span(func, source, lines, m.start(1), find_body_start(source, m.end()))
                 functions.append(func)
 
             # 3) Arrow functions: const name = (a, b): Ret => { ... } or name = a: T => a*2
@@ -59,18 +74,24 @@ class JavaScriptParser(BaseParser):
                 name = m.group(1)
                 params = self._parse_params(m.group(2))
                 func = self._create_function(name, params, 'any', None)
-                func.source_code = source
+                body_start = _WHITESPACE.match(source, m.end()).end()
+                if source.startswith('{', body_start):
+                    self._set_span(func, source, lines, m.start(1), body_start)
+                else:
+                    # Concise body: the arrow function ends with its expression
+                    self._set_span(func, source, lines, m.start(1), -1, find_expression_end(source, body_start))
                 functions.append(func)
 
             # 4) Class methods: class A { method(a,b) { ... } static method() {} }
-            for class_match in re.finditer(r"class\s+([A-Za-z_$][\w$]*)\s*\{([\s\S]*?)\}", source):
+            for class_match in re.finditer(r"\bclass\s+([A-Za-z_$][\w$]*)[^{]*\{", source):
                 class_name = class_match.group(1)
-                body = class_match.group(2)
-                for m in re.finditer(r"(?:(?:public|private|protected|readonly|static|async)\s+)*([A-Za-z_$][\w$]*)\s*(?:<[^>]+>)?\s*\(([^)]*)\)\s*(?::\s*[^ {]+)?\s*\{", body):
-                    method_name = m.group(1)
-                    params = self._parse_params(m.group(2))
+                class_end = find_block_end(source, class_match.end() - 1)
+                if class_end == -1:
+                    class_end = len(source)
+                for method_name, params_str, name_start, body_start in self._iter_class_methods(source, class_match.end(), class_end):
+                    params = self._parse_params(params_str)
                     func = self._create_function(method_name, params, 'any', class_name)
-                    func.source_code = source
+                    self._set_span(func, source, lines, name_start, body_start)
                     functions.append(func)
 
             for f in functions:
@@ -83,6 +104,63 @@ class JavaScriptParser(BaseParser):
 
         return parsed_file
 
+    def _iter_class_methods(self, source: str, start: int, end: int):
+        """
+        Find the methods declared directly in a class body.
+
+        Method bodies are skipped as a whole, so control statements such as
+        ``if (x) {`` inside a method are never mistaken for methods.
+
+        Args:
+            source: File source
+            start: Index just after the class body's opening brace
+            end: Index of the class body's closing brace
+
+        Yields:
+            (method name, parameter string, name index, body '{' index)
+        """
+        pos = start
+        while pos < end:
+            m = self.METHOD_PATTERN.search(source, pos, end)
+            if m is None:
+                return
+            body_start = m.end() - 1
+            body_end = find_block_end(source, body_start)
+            pos = body_end + 1 if body_end != -1 else m.end()
+            if m.group(1) in self.NON_METHOD_KEYWORDS:
+                continue
+            yield m.group(1), m.group(2), m.start(1), body_start
+
+    def _set_span(self, func: Function, source: str, lines: LineIndex, name_index: int, body_start: int,
+                  end: Optional[int] = None) -> None:
+        """
+        Give a function its own source: from the start of its declaration line
+        through the end of its body.
+
+        Args:
+            func: Function to update
+            source: File source
+            lines: Line index of the file source
+            name_index: Index of the function name
+            body_start: Index of the body's opening brace (-1 if unknown)
+            end: End of the function when it has no braced body
+        """
+        if end is None and body_start != -1:
+            body_end = find_block_end(source, body_start)
+            end = body_end + 1 if body_end != -1 else len(source)
+        if end is None:
+            # No body found (e.g. a TypeScript overload): keep the declaration line
+            end = source.find('\n', name_index)
+            end = len(source) if end == -1 else end
+        elif source.startswith(';', end):
+            end += 1
+
+        func.start_offset = line_start(source, name_index)
+        func.end_offset = end
+        func.source_code = source[func.start_offset:end]
+        func.line_number = lines.line_of(name_index)
+        func.end_line = lines.line_of(max(end - 1, name_index))
+
     def _parse_params(self, params_str: str) -> List[Parameter]:
         params_str = (params_str or '').strip()
         if not params_str:
@@ -8,9 +8,10 @@ signatures, parameters, and analyze function bodies.
 import ast
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from . import BaseParser
+from .spans import LineIndex
 from ..models import Function, Parameter, FunctionBody, FunctionException, ParsedFile, FunctionType
 from ..config import Config
 
@@ -66,10 +67,11 @@ class PythonParser(BaseParser):
             ParsedFile object containing extracted functions
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            content = self.read_content(file_path)
+            source_code = content.text
             
             tree = ast.parse(source_code)
+            line_index = content.line_index
             
             parsed_file = ParsedFile(
                 file_path=str(file_path),
@@ -85,7 +87,7 @@ class PythonParser(BaseParser):
             # Extract functions
             for node in ast.walk(tree):
                 if isinstance(node, ast.FunctionDef):
-                    function = self._parse_function_def(node, source_code)
+                    function = self._parse_function_def(node, source_code, line_index)
                     if function:
                         parsed_file.add_function(function)
             
@@ -132,13 +134,15 @@ class PythonParser(BaseParser):
                 classes.append(node.name)
         return classes
     
-    def _parse_function_def(self, node: ast.FunctionDef, source_code: str) -> Optional[Function]:
+    def _parse_function_def(self, node: ast.FunctionDef, source_code: str,
+                            line_index: Optional[LineIndex] = None) -> Optional[Function]:
         """
         Parse a function definition node.
         
         Args:
             node: Function definition AST node
             source_code: Original source code
+            line_index: Line index of source_code, shared by the functions of a file
             
         Returns:
             Function object or None if parsing fails
@@ -162,8 +166,11 @@ class PythonParser(BaseParser):
             # Analyze function body
             body = self._analyze_function_body(node)
             
-            # Extract source code for this function
-            function_source = self._extract_function_source(node, source_code)
+            # Locate the function and extract its source code
+            if line_index is None:
+                line_index = LineIndex(source_code)
+            start_offset, end_offset = self._function_span(node, line_index)
+            function_source = source_code[start_offset:end_offset]
             
             function = Function(
                 name=node.name,
@@ -174,7 +181,11 @@ class PythonParser(BaseParser):
                 function_type=function_type,
                 class_name=class_name,
                 ast_node=node,
-                source_code=function_source
+                source_code=function_source,
+                start_offset=start_offset,
+                end_offset=end_offset,
+                line_number=node.lineno,
+                end_line=node.end_lineno
             )
             
             return function
@@ -391,28 +402,6 @@ class PythonParser(BaseParser):
         
         return complexity
     
-    def _get_end_line(self, node: ast.FunctionDef, source_code: str) -> int:
-        """
-        Get the end line number of the function.
-        
-        Args:
-            node: Function definition AST node
-            source_code: Original source code
-            
-        Returns:
-            End line number
-        """
-        lines = source_code.split('\n')
-        start_line = node.lineno - 1  # Convert to 0-based index
-        
-        # Find the end of the function by looking for dedentation
-        for i in range(start_line + 1, len(lines)):
-            line = lines[i]
-            if line.strip() and not line.startswith(' ') and not line.startswith('\t'):
-                return i
-        
-        return len(lines)
-    
     def _ast_to_string(self, node: ast.AST) -> str:
         """
         Convert an AST node to a string representation.
@@ -450,23 +439,17 @@ class PythonParser(BaseParser):
         else:
             return str(type(node).__name__)
     
-    def _extract_function_source(self, node: ast.FunctionDef, source_code: str) -> str:
+    def _function_span(self, node: ast.FunctionDef, line_index: LineIndex) -> Tuple[int, int]:
         """
-        Extract the source code for a specific function.
+        Get the character span of a function: from the start of its def line
+        through the end of its last line.
         
         Args:
             node: Function definition AST node
-            source_code: Original source code
+            line_index: Line index of the file's source code
             
         Returns:
-            Function source code string
+            Tuple of (start offset, end offset)
         """
-        # Extract from original source for compatibility
-        lines = source_code.split('\n')
-        start_line = node.lineno - 1  # Convert to 0-based index
-        end_line = self._get_end_line(node, source_code) - 1
-        
-        if start_line < len(lines) and end_line < len(lines):
-            return '\n'.join(lines[start_line:end_line + 1])
-        else:
-            return "" 
\ No newline at end of file
+        end_line = node.end_lineno or node.lineno
+        return line_index.offset_of(node.lineno), line_index.line_end(end_line)
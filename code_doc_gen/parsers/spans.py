@@ -0,0 +1,288 @@
+"""
+Source span helpers for the regex-based parsers.
+
+Finds where a function body starts and ends in C-family source (JavaScript,
+TypeScript, Java, C++) without a full parser. Braces are only counted in
+code: string literals, comments, template literals (including nested ``${}``
+substitutions) and regular expression literals are skipped.
+
+Also maps between character offsets and line numbers, so parsers can record
+where each function sits in its file.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Iterator, Sequence, Tuple
+
+
+# Structural tokens of code; everything else is skipped in one regex step
+_CODE_TOKEN = re.compile(
+    r'(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))'
+    r'|(?P<string>"(?:[^"\\\n]|\\[\s\S])*"?|\'(?:[^\'\\\n]|\\[\s\S])*\'?)'
+    r'|(?P<tick>`)'
+    r'|(?P<slash>/)'
+    r'|(?P<char>[{}()\[\];,\n])'
+)
+
+# Template literal text up to the closing backtick or the next substitution
+_TEMPLATE_TEXT = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*')
+
+_REGEX_LITERAL = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+# A slash after one of these starts a regular expression, not a division
+_REGEX_PRECEDING_CHARS = frozenset('(,=:[!&|?{};+-*%<>~^')
+_REGEX_PRECEDING_WORDS = frozenset({
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield', 'await',
+})
+
+_OPENERS = '([{'
+_CLOSERS = ')]}'
+
+
+def _starts_regex(source: str, index: int) -> bool:
+    """Decide whether the slash at index starts a regular expression literal."""
+    k = index - 1
+    while k >= 0 and source[k] in ' \t\r\n':
+        k -= 1
+    if k < 0 or source[k] in _REGEX_PRECEDING_CHARS:
+        return True
+    if source[k].isalnum() or source[k] in '_$':
+        end = k + 1
+        while k >= 0 and (source[k].isalnum() or source[k] in '_$'):
+            k -= 1
+        return source[k + 1:end] in _REGEX_PRECEDING_WORDS
+    return False
+
+
+def iter_code_chars(source: str, start: int, end: int = None) -> Iterator[Tuple[int, str]]:
+    """
+    Yield the structural characters of code from a position on.
+
+    Args:
+        source: Source text
+        start: Index to start scanning at (in code, not inside a literal)
+        end: Index to stop at (default: end of source)
+
+    Yields:
+        (index, char) for every brace, parenthesis, bracket, ';', ',' and
+        newline outside of literals and comments
+    """
+    end = len(source) if end is None else end
+    # Brace depth inside each open template substitution, innermost last
+    substitutions = []
+    in_template = False
+    pos = start
+
+    while pos < end:
+        if in_template:
+            pos = _TEMPLATE_TEXT.match(source, pos, end).end()
+            if source.startswith('${', pos):
+                substitutions.append(0)
+                in_template = False
+                pos += 2
+            else:
+                # Closing backtick (or end of an unterminated template)
+                in_template = False
+                pos += 1
+            continue
+
+        match = _CODE_TOKEN.search(source, pos, end)
+        if match is None:
+            return
+        pos = match.end()
+        kind = match.lastgroup
+
+        if kind == 'tick':
+            in_template = True
+        elif kind == 'slash':
+            if _starts_regex(source, match.start()):
+                literal = _REGEX_LITERAL.match(source, match.start(), end)
+                if literal:
+                    pos = literal.end()
+        elif kind == 'char':
+            char = match.group()
+            if substitutions:
+                if char == '{':
+                    substitutions[-1] += 1
+                elif char == '}':
+                    if substitutions[-1] == 0:
+                        # End of a ${...} substitution, back to template text
+                        substitutions.pop()
+                        in_template = True
+                        continue
+                    substitutions[-1] -= 1
+            yield match.start(), char
+
+
+def find_block_end(source: str, open_index: int) -> int:
+    """
+    Find the brace that closes the block opened at open_index.
+
+    Args:
+        source: Source text
+        open_index: Index of an opening '{'
+
+    Returns:
+        Index of the matching '}', or -1 if the block is not closed
+    """
+    depth = 0
+    for index, char in iter_code_chars(source, open_index):
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
+
+
+def find_body_start(source: str, start: int) -> int:
+    """
+    Find the '{' that opens a function body after its parameter list.
+
+    Args:
+        source: Source text
+        start: Index just after the parameter list
+
+    Returns:
+        Index of the body's '{', or -1 if a ';' or the end of the enclosing
+        block comes first (a declaration without a body)
+    """
+    depth = 0
+    for index, char in iter_code_chars(source, start):
+        if char in _OPENERS:
+            if char == '{' and depth == 0:
+                return index
+            depth += 1
+        elif char in _CLOSERS:
+            if depth == 0:
+                return -1
+            depth -= 1
+        elif char == ';' and depth == 0:
+            return -1
+    return -1
+
+
+def find_expression_end(source: str, start: int) -> int:
+    """
+    Find the end of an expression, such as the body of a concise arrow function.
+
+    The expression ends at a ';', ',' or line break outside of any brackets,
+    or at a closing bracket of the enclosing code.
+
+    Args:
+        source: Source text
+        start: Index where the expression starts
+
+    Returns:
+        Index just past the last character of the expression
+    """
+    depth = 0
+    for index, char in iter_code_chars(source, start):
+        if char in _OPENERS:
+            depth += 1
+        elif char in _CLOSERS:
+            if depth == 0:
+                return index
+            depth -= 1
+        elif depth == 0:
+            return index
+    return len(source)
+
+
+def line_start(source: str, index: int) -> int:
+    """
+    Get the index of the first character of the line containing index.
+
+    Args:
+        source: Source text
+        index: Any index within the line
+
+    Returns:
+        Index of the start of the line
+    """
+    return source.rfind('\n', 0, index) + 1
+
+
+class LineIndex:
+    """Line starts of a source text, for offset and line number lookups."""
+
+    def __init__(self, source: str):
+        """
+        Index the lines of a source text.
+
+        Args:
+            source: Source text
+        """
+        self.length = len(source)
+        self.starts = [0]
+        self.starts.extend(match.end() for match in re.finditer('\n', source))
+
+    def line_of(self, index: int) -> int:
+        """
+        Get the 1-based line number of a character index.
+
+        Args:
+            index: Index within the source
+
+        Returns:
+            Line number containing the index
+        """
+        return bisect_right(self.starts, index)
+
+    def offset_of(self, line: int) -> int:
+        """
+        Get the index of the first character of a 1-based line.
+
+        Args:
+            line: Line number
+
+        Returns:
+            Index of the start of the line (the source length past the last line)
+        """
+        if line > len(self.starts):
+            return self.length
+        return self.starts[max(line, 1) - 1]
+
+    def line_end(self, line: int) -> int:
+        """
+        Get the index just past the last character of a 1-based line, before its newline.
+
+        Args:
+            line: Line number
+
+        Returns:
+            Index of the end of the line
+        """
+        if line >= len(self.starts):
+            return self.length
+        return self.starts[line] - 1
+
+
+# Keywords that make a // comment documentation rather than a remark
+_DOC_KEYWORDS = ('@brief', '@param', '@return', 'brief', 'param', 'return')
+
+
+def documentation_precedes(lines: Sequence[str], line_index: int) -> bool:
+    """
+    Check whether a documentation comment directly precedes a definition line.
+
+    This is the check the generator applies before inserting documentation,
+    so functions it would skip can be skipped before they are analyzed.
+
+    Args:
+        lines: Lines of the file
+        line_index: 0-based index of the definition line
+
+    Returns:
+        True if the nearest non-blank line above is a documentation comment
+    """
+    j = min(line_index, len(lines)) - 1
+    while j >= 0 and not lines[j].strip():
+        j -= 1
+    if j < 0:
+        return False
+    prev_line = lines[j].strip()
+    if prev_line.startswith(('/**', '/*', '///', '*')):
+        return True
+    return prev_line.startswith('//') and any(keyword in prev_line.lower() for keyword in _DOC_KEYWORDS)
@@ -0,0 +1,320 @@
+"""
+Pipelined execution for CodeDocGen.
+
+Connects repository discovery, parsing/analysis, documentation generation and
+output through bounded queues so that all stages run concurrently and a slow
+stage applies back-pressure to the ones before it.
+"""
+
+import os
+import queue
+import logging
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+from multiprocessing import Pool, cpu_count
+
+from . import scanner as scanner_module
+from .scanner import RepositoryScanner, _init_parse_worker
+from .generator import DocumentationGenerator
+from .models import Function
+from .config import Config
+from .content import ContentStore
+from .ai_health import get_health_tracker, merge_health_stats
+
+
+# Marks the end of a stage's output
+_DONE = object()
+
+# What a parse task returns: file path, language, functions, whether the parse
+# cache was hit, and (pid, run statistics) of the process that parsed it
+ParseResult = Tuple[Path, Optional[str], List[Function], bool, Tuple[int, Dict[str, Any]]]
+
+
+def _run_parse_task(task: Tuple[Path, Optional[str]]) -> ParseResult:
+    """
+    Parse a single file in a pool worker.
+
+    Args:
+        task: Tuple of (file path, language)
+
+    Returns:
+        ParseResult tuple
+    """
+    file_path, lang = task
+    return _parse_with_scanner(scanner_module._worker_scanner, file_path, lang)
+
+
+def _parse_with_scanner(
+    scanner: RepositoryScanner,
+    file_path: Path,
+    lang: Optional[str]
+) -> ParseResult:
+    """
+    Parse a file and report whether it was served from the parse cache.
+
+    Args:
+        scanner: Scanner to parse with
+        file_path: Path to the file
+        lang: Programming language (if None, auto-detect)
+
+    Returns:
+        ParseResult tuple
+    """
+    hits_before = scanner.cache.hits
+    functions = scanner._parse_file_worker(file_path, lang)
+    worker_stats = {
+        'ai_health': get_health_tracker().get_stats(),
+        'dedup': dict(scanner.analyzer.dedup_stats),
+    }
+    return file_path, lang, functions, scanner.cache.hits > hits_before, (os.getpid(), worker_stats)
+
+
+class FileResult:
+    """Parsed functions and generated documentation for one file."""
+
+    def __init__(self,
+                 file_path: Path,
+                 language: Optional[str],
+                 functions: List[Function],
+                 documentation: Dict[str, str]):
+        self.file_path = file_path
+        self.language = language
+        self.functions = functions
+        self.documentation = documentation
+
+
+class DocumentationPipeline:
+    """
+    Staged discovery -> parse/analyze -> generate -> write pipeline.
+
+    Discovery, dispatch and generation each run in their own thread; parsing
+    and analysis run in a process pool of ``jobs`` workers. The write stage is
+    the caller iterating over ``run()``, so exactly one consumer touches the
+    output.
+
+    Files read in this process stay in ``content`` so that the write stage
+    reuses them; the consumer releases each file once it is done with it.
+    """
+
+    def __init__(self, config: Config, jobs: Optional[int] = None, queue_size: Optional[int] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            config: Configuration object
+            jobs: Number of parse/analyze worker processes (default: CPU count)
+            queue_size: Capacity of each inter-stage queue (default: 4 * jobs)
+        """
+        self.config = config
+        self.jobs = max(1, jobs or cpu_count())
+        self.queue_size = queue_size or self.jobs * 4
+        # Files handed to the pool but not yet collected by the generation stage
+        self.max_in_flight = self.jobs * 2
+        self._languages = config.get_language_index()
+        # Contents of the files read in this process, shared with the write stage
+        self.content = ContentStore()
+
+        self.stats: Dict[str, int] = {
+            'discovered': 0,
+            'parsed': 0,
+            'cache_hits': 0,
+            'generated': 0,
+        }
+        # Latest run statistics of each parsing process
+        self._worker_stats: Dict[int, Dict[str, Any]] = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, file_paths: Iterable[Path], lang: Optional[str] = None) -> Iterator[FileResult]:
+        """
+        Run the pipeline over the given files.
+
+        Args:
+            file_paths: File paths to process (consumed lazily)
+            lang: Programming language (if None, detected once per file from its
+                extension and carried through every stage)
+
+        Yields:
+            FileResult objects in completion order
+        """
+        path_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        parsed_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        write_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+
+        # Fork the workers before any pipeline thread starts
+        pool = None
+        if self.jobs > 1:
+            pool = Pool(processes=self.jobs, initializer=_init_parse_worker, initargs=(self.config,))
+
+        threads = [
+            threading.Thread(
+                target=self._guard,
+                args=(self._discover, errors, stop, path_queue, file_paths, path_queue, stop),
+                name='codedocgen-discovery', daemon=True
+            ),
+            threading.Thread(
+                target=self._guard,
+                args=(self._dispatch, errors, stop, parsed_queue, path_queue, parsed_queue, pool, lang, stop),
+                name='codedocgen-parse', daemon=True
+            ),
+            threading.Thread(
+                target=self._guard,
+                args=(self._generate, errors, stop, write_queue, parsed_queue, write_queue, stop),
+                name='codedocgen-generate', daemon=True
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(write_queue, stop)
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            stop.set()
+            if pool is not None:
+                if errors:
+                    pool.terminate()
+                else:
+                    pool.close()
+                pool.join()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+    def _guard(self, stage, errors: List[BaseException], stop: threading.Event,
+               downstream: "queue.Queue", *args) -> None:
+        """Run a stage, record its failure and always signal completion downstream."""
+        try:
+            stage(*args)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            self._put(downstream, _DONE, stop)
+
+    def _discover(self, file_paths: Iterable[Path], path_queue: "queue.Queue",
+                  stop: threading.Event) -> None:
+        """Discovery stage: feed file paths into the pipeline."""
+        for file_path in file_paths:
+            if not self._put(path_queue, file_path, stop):
+                return
+            self.stats['discovered'] += 1
+
+    def _dispatch(self, path_queue: "queue.Queue", parsed_queue: "queue.Queue",
+                  pool, lang: Optional[str], stop: threading.Event) -> None:
+        """Parse/analyze stage: hand files to the worker pool with bounded in-flight work."""
+        if pool is None:
+            scanner = RepositoryScanner(self.config, content_store=self.content)
+            try:
+                while True:
+                    file_path = self._get(path_queue, stop)
+                    if file_path is _DONE:
+                        return
+                    file_lang = lang or self._languages.get(file_path.suffix.lower())
+                    if not self._put(parsed_queue, _parse_with_scanner(scanner, file_path, file_lang), stop):
+                        return
+            finally:
+                # Enforces the size cap and releases the database of this thread
+                scanner.cache.close()
+
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+
+        def on_parsed(result: ParseResult) -> None:
+            self._put(parsed_queue, result, stop)
+            slots.release()
+
+        def on_error(error: BaseException) -> None:
+            self.logger.error(f"Worker failed: {error}")
+            slots.release()
+
+        while True:
+            file_path = self._get(path_queue, stop)
+            if file_path is _DONE:
+                break
+            while not slots.acquire(timeout=0.1):
+                if stop.is_set():
+                    return
+            file_lang = lang or self._languages.get(file_path.suffix.lower())
+            pool.apply_async(_run_parse_task, ((file_path, file_lang),), callback=on_parsed, error_callback=on_error)
+
+        # Wait for every in-flight file before signalling completion
+        for _ in range(self.max_in_flight):
+            while not slots.acquire(timeout=0.1):
+                if stop.is_set():
+                    return
+
+    def _generate(self, parsed_queue: "queue.Queue", write_queue: "queue.Queue",
+                  stop: threading.Event) -> None:
+        """Generation stage: turn parsed functions into documentation strings."""
+        generator = DocumentationGenerator(self.config)
+
+        while True:
+            item = self._get(parsed_queue, stop)
+            if item is _DONE:
+                return
+            file_path, file_lang, functions, cache_hit, (pid, worker_stats) = item
+            self._worker_stats[pid] = worker_stats
+            self.stats['parsed'] += 1
+            if cache_hit:
+                self.stats['cache_hits'] += 1
+
+            documentation: Dict[str, str] = {}
+            if functions and file_lang:
+                documentation = generator.generate_documentation(functions, file_lang)
+                self.stats['generated'] += 1
+
+            if not self._put(write_queue, FileResult(file_path, file_lang, functions, documentation), stop):
+                return
+
+    def get_ai_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the AI provider and model health of the run, across all worker processes.
+
+        Returns:
+            Dictionary mapping "provider" and "provider/model" targets to their
+            merged statistics (see merge_health_stats)
+        """
+        return merge_health_stats(stats['ai_health'] for stats in self._worker_stats.values())
+
+    def get_dedup_stats(self) -> Dict[str, int]:
+        """
+        Get how many analyzed functions reused the analysis of an identical function.
+        
+        Returns:
+            Dictionary with the 'functions' fingerprinted and the 'duplicates'
+            among them, across all worker processes
+        """
+        totals = {'functions': 0, 'duplicates': 0}
+        for stats in self._worker_stats.values():
+            for key in totals:
+                totals[key] += stats['dedup'][key]
+        return totals
+
+    @staticmethod
+    def _put(target: "queue.Queue", item: Any, stop: threading.Event) -> bool:
+        """Blocking put that gives up once the pipeline is stopping."""
+        while True:
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if stop.is_set():
+                    return False
+
+    @staticmethod
+    def _get(source: "queue.Queue", stop: threading.Event) -> Any:
+        """Blocking get that returns _DONE once the pipeline is stopping."""
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                if stop.is_set():
+                    return _DONE
@@ -0,0 +1,204 @@
+"""
+Prompt compaction for CodeDocGen.
+
+Shrinks function bodies to fit a token budget before they are sent to an AI
+provider. Comments, blank lines and long literal tables carry little meaning
+for a documentation prompt, so they go first; if the body is still too long,
+only the control-flow skeleton is kept, and as a last resort the head and
+tail of the skeleton.
+"""
+
+import re
+import logging
+from typing import List, Optional
+
+from .ai_engine import estimate_tokens
+
+
+# Languages whose line comments start with '#'
+HASH_COMMENT_LANGUAGES = frozenset({'python', 'ruby', 'shell', 'bash', 'perl', 'r'})
+
+# Lines kept in a control-flow skeleton
+SKELETON_PATTERN = re.compile(
+    r'^\s*(?:[}\])]\s*)?(?:'
+    r'def|class|async|if|elif|else|for|foreach|while|do|try|except|catch|finally|with|'
+    r'switch|case|default|match|return|raise|throw|yield|await|break|continue|goto'
+    r')\b'
+)
+
+# Pieces of a literal-only line: strings, then constants and numbers, then punctuation
+_STRING_LITERAL = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+_VALUE_LITERAL = re.compile(
+    r'\b(?:true|false|True|False|None|null|nullptr)\b'
+    r'|-?\b(?:0[xX][0-9a-fA-F]+|\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)[fFlLuU]*\b'
+)
+_PUNCTUATION_ONLY = re.compile(r'[\s,:;{}\[\]()=>\-]*')
+
+# Keep this many rows of a literal table
+LITERAL_TABLE_KEEP = 2
+
+# Lines longer than this are shortened (long inline literals)
+MAX_LINE_CHARS = 200
+
+ELLIPSIS = '...'
+
+
+class PromptCompactor:
+    """Shrinks function bodies to a token budget."""
+
+    def __init__(self, min_table_rows: int = 4):
+        """
+        Initialize the compactor.
+
+        Args:
+            min_table_rows: Consecutive literal-only lines that count as a table
+        """
+        self.min_table_rows = min_table_rows
+        self.logger = logging.getLogger(__name__)
+
+    def compact(self, body: str, language: str, token_budget: Optional[int] = None) -> str:
+        """
+        Compact a function body.
+
+        Args:
+            body: Function body source
+            language: Programming language
+            token_budget: Maximum estimated tokens of the result (None for no limit)
+
+        Returns:
+            Compacted body
+        """
+        if not body:
+            return ""
+
+        text = strip_comments(body, language)
+        lines = [line.rstrip() for line in text.splitlines()]
+        lines = [line for line in lines if line.strip()]
+        lines = self._collapse_literal_tables(lines)
+        lines = [self._shorten_line(line) for line in lines]
+        compacted = '\n'.join(lines)
+
+        if token_budget is None or estimate_tokens(compacted) <= token_budget:
+            return compacted
+
+        skeleton = self._skeleton(lines)
+        compacted = '\n'.join(skeleton)
+        if estimate_tokens(compacted) <= token_budget:
+            return compacted
+
+        return '\n'.join(self._head_and_tail(skeleton, max(token_budget, 1)))
+
+    def _collapse_literal_tables(self, lines: List[str]) -> List[str]:
+        """Replace runs of literal-only lines with their first rows."""
+        result = []
+        i = 0
+        while i < len(lines):
+            j = i
+            while j < len(lines) and _is_literal_line(lines[j]):
+                j += 1
+            if j - i >= self.min_table_rows:
+                result.extend(lines[i:i + LITERAL_TABLE_KEEP])
+                indent = _indent_of(lines[i])
+                result.append(f"{indent}{ELLIPSIS} ({j - i - LITERAL_TABLE_KEEP} more rows)")
+                i = j
+            else:
+                result.append(lines[i])
+                i += 1
+        return result
+
+    @staticmethod
+    def _shorten_line(line: str) -> str:
+        if len(line) <= MAX_LINE_CHARS:
+            return line
+        return line[:MAX_LINE_CHARS] + ' ' + ELLIPSIS
+
+    @staticmethod
+    def _skeleton(lines: List[str]) -> List[str]:
+        """Keep the first line, the control-flow lines and the last line."""
+        kept = []
+        elided = False
+        for index, line in enumerate(lines):
+            if index == 0 or index == len(lines) - 1 or SKELETON_PATTERN.match(line):
+                kept.append(line)
+                elided = False
+            elif not elided:
+                kept.append(f"{_indent_of(line)}{ELLIPSIS}")
+                elided = True
+        return kept
+
+    @staticmethod
+    def _head_and_tail(lines: List[str], token_budget: int) -> List[str]:
+        """Keep lines from both ends (the tail holds the returns) within the budget."""
+        marker_tokens = estimate_tokens(ELLIPSIS) + 1
+        used = marker_tokens
+        head: List[str] = []
+        tail: List[str] = []
+        low, high = 0, len(lines) - 1
+        take_head = True
+        while low <= high:
+            line = lines[low] if take_head else lines[high]
+            cost = estimate_tokens(line) + 1
+            if used + cost > token_budget:
+                break
+            used += cost
+            if take_head:
+                head.append(line)
+                low += 1
+            else:
+                tail.append(line)
+                high -= 1
+            take_head = not take_head
+
+        if low > high:
+            return head + tail[::-1]
+        if not head and not tail:
+            # Not even one whole line fits
+            return [lines[0][:token_budget * 4].rstrip() + ' ' + ELLIPSIS]
+        return head + [ELLIPSIS] + tail[::-1]
+
+
+def _is_literal_line(line: str) -> bool:
+    """Check for a line made only of literals: numbers, strings, constants and punctuation."""
+    rest, strings = _STRING_LITERAL.subn(' ', line)
+    rest, values = _VALUE_LITERAL.subn(' ', rest)
+    # At least one actual literal, so runs of closing braces are not tables
+    return bool(strings or values) and _PUNCTUATION_ONLY.fullmatch(rest) is not None
+
+
+def _indent_of(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+# String literals (group 1) or comments, for '#' and C-style comment languages
+_HASH_TOKENS = re.compile(
+    r'("""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\')'
+    r'|#[^\n]*'
+)
+_C_TOKENS = re.compile(
+    r'("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|`(?:[^`\\]|\\.)*`)'
+    r'|//[^\n]*'
+    r'|/\*[\s\S]*?(?:\*/|\Z)'
+)
+
+
+def _keep_strings(match: "re.Match") -> str:
+    if match.group(1) is not None:
+        return match.group(1)
+    # Keep line structure so that blank-line removal stays line based
+    return '\n' * match.group(0).count('\n')
+
+
+def strip_comments(source: str, language: str) -> str:
+    """
+    Remove comments from source code, leaving string literals intact.
+
+    Args:
+        source: Source code
+        language: Programming language ('#' comments for Python and similar,
+            '//' and '/* */' comments otherwise)
+
+    Returns:
+        Source without comments
+    """
+    pattern = _HASH_TOKENS if language in HASH_COMMENT_LANGUAGES else _C_TOKENS
+    return pattern.sub(_keep_strings, source)
@@ -8,29 +8,68 @@ the parsing and analysis of code files.
 import os
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 from multiprocessing import Pool, cpu_count
 
 from .parsers import ParserFactory
 from .analyzer import IntelligentAnalyzer
 from .models import Function, ParsedFile
 from .config import Config
+from .cache import ParseCache
+from .content import ContentStore
 from .git_integration import GitIntegration
 
 
+# Scanner owned by a pool worker process; built once by _init_parse_worker
+_worker_scanner: Optional["RepositoryScanner"] = None
+
+
+def _init_parse_worker(config: Config) -> None:
+    """
+    Pool initializer that builds one scanner per worker process.
+    
+    The parser factory, analyzer and AI clients are created once here instead
+    of being pickled along with every task.
+    
+    Args:
+        config: Configuration object
+    """
+    global _worker_scanner
+    _worker_scanner = RepositoryScanner(config)
+
+
+def _parse_in_worker(task: Tuple[Path, Optional[str]]) -> Tuple[Path, List[Function]]:
+    """
+    Parse a single file using the worker's scanner.
+    
+    Args:
+        task: Tuple of (file path, language)
+        
+    Returns:
+        Tuple of (file path, list of Function objects)
+    """
+    file_path, lang = task
+    return file_path, _worker_scanner._parse_file_worker(file_path, lang)
+
+
 class RepositoryScanner:
     """Scans repositories for source files and coordinates parsing."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, content_store: Optional[ContentStore] = None):
         """
         Initialize the repository scanner.
         
         Args:
             config: Configuration object
+            content_store: Store shared with later stages of the run. Without one,
+                each file's content is released as soon as it has been parsed.
         """
         self.config = config
-        self.parser_factory = ParserFactory(config)
+        self._owns_content = content_store is None
+        self.content = content_store if content_store is not None else ContentStore()
+        self.parser_factory = ParserFactory(config, self.content)
         self.analyzer = IntelligentAnalyzer(config)
+        self.cache = ParseCache(config)
         
         # Get logger (logging configuration is handled centrally in main.py)
         self.logger = logging.getLogger(__name__)
@@ -64,6 +103,35 @@ class RepositoryScanner:
         Returns:
             List of file paths to process
         """
+        file_paths = list(self.iter_repository(repo_path, lang, files, changes_only))
+        self.logger.info(f"Found {len(file_paths)} files to process")
+        return file_paths
+    
+    def iter_repository(
+        self,
+        repo_path: Path,
+        lang: Optional[str] = None,
+        files: Optional[List[str]] = None,
+        changes_only: bool = False
+    ) -> Iterator[Path]:
+        """
+        Lazily discover source files in a repository.
+        
+        Paths are yielded as soon as they are found, so parsing can start before
+        the walk finishes and memory stays flat on very large trees.
+        
+        Args:
+            repo_path: Path to the repository
+            lang: Programming language to filter by
+            files: Specific files to process
+            changes_only: Whether to only process changed files (requires Git)
+            
+        Yields:
+            File paths to process
+            
+        Raises:
+            ValueError: If the repository path does not exist
+        """
         repo_path = Path(repo_path)
         
         if not repo_path.exists():
@@ -74,7 +142,7 @@ class RepositoryScanner:
             git_integration = GitIntegration(repo_path)
             if not git_integration.is_git_repo:
                 self.logger.warning("Changes-only mode requires a Git repository")
-                return []
+                return
             
             # Get all supported file extensions
             all_extensions = []
@@ -86,80 +154,58 @@ class RepositoryScanner:
             source_files = git_integration.filter_source_files(changed_files, all_extensions)
             
             self.logger.info(f"Found {len(source_files)} changed source files")
-            return source_files
+            yield from source_files
+            return
         
         if files:
             # Process specific files
-            file_paths = []
             for file_str in files:
                 file_path = repo_path / file_str
                 if file_path.exists():
-                    file_paths.append(file_path)
+                    yield file_path
                 else:
                     self.logger.warning(f"File not found: {file_path}")
-            return file_paths
+            return
         
-        # Scan the entire repository
-        file_paths = []
+        suffixes = frozenset(self.parser_factory.get_suffixes(lang))
+        if not suffixes:
+            self.logger.warning(f"No parser available for language: {lang}")
+            return
         
-        for root, dirs, filenames in os.walk(repo_path):
-            # Skip ignored directories
-            dirs[:] = [d for d in dirs if not self._should_ignore_directory(Path(root) / d)]
-            
-            for filename in filenames:
-                file_path = Path(root) / filename
-                
-                # Skip ignored files
-                if self.config.should_ignore_file(file_path):
-                    continue
-                
-                # Check if we can parse this file
-                if lang:
-                    # Use specific language parser
-                    try:
-                        parser = self.parser_factory.get_parser(lang)
-                        if parser.can_parse(file_path):
-                            file_paths.append(file_path)
-                    except ValueError:
-                        self.logger.warning(f"No parser available for language: {lang}")
-                else:
-                    # Try to find appropriate parser
-                    try:
-                        parser = self.parser_factory.get_parser_for_file(file_path)
-                        file_paths.append(file_path)
-                    except ValueError:
-                        # Skip files we can't parse
-                        continue
+        matcher = self.config.get_ignore_matcher(repo_path)
         
-        self.logger.info(f"Found {len(file_paths)} files to process")
-        return file_paths
-    
-    def _should_ignore_directory(self, dir_path: Path) -> bool:
-        """
-        Check if a directory should be ignored.
-        
-        Args:
-            dir_path: Directory path
+        # Iterative walk: no recursion limit, no per-directory lists of Path objects.
+        # Ignored directories are pruned as a whole, never listed.
+        stack = [(str(repo_path), '')]
+        while stack:
+            directory, rel_dir = stack.pop()
+            prefix = f"{rel_dir}/" if rel_dir else ''
+            subdirectories = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        rel_path = prefix + entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not matcher.is_ignored_dir(rel_path):
+                                    subdirectories.append((entry.path, rel_path))
+                                continue
+                            
+                            # Cheap suffix check before any pattern matching
+                            _, ext = os.path.splitext(entry.name)
+                            if ext.lower() not in suffixes or not entry.is_file():
+                                continue
+                        except OSError:
+                            continue
+                        
+                        if not matcher.is_ignored_file(rel_path):
+                            yield Path(entry.path)
+            except OSError as e:
+                self.logger.debug(f"Skipping unreadable directory {directory}: {e}")
+                continue
             
-        Returns:
-            True if directory should be ignored
-        """
-        dir_name = dir_path.name
-        
-        # Common directories to ignore
-        ignore_dirs = {
-            '.git', '.svn', '.hg', '.bzr',  # Version control
-            '__pycache__', '.pytest_cache',  # Python cache
-            'node_modules', 'bower_components',  # Node.js
-            'build', 'dist', 'target',  # Build artifacts
-            '.idea', '.vscode',  # IDE files
-            'venv', 'env', '.venv', '.env', 'codedocgen',  # Virtual environments
-            'vendor', 'deps',  # Dependencies
-            'tmp', 'temp', 'cache',  # Temporary files
-            'site-packages',  # Python packages
-        }
-        
-        return dir_name in ignore_dirs
+            # Reverse so that directories are visited in listing order
+            stack.extend(reversed(subdirectories))
     
     def parse_file(self, file_path: Path, lang: Optional[str] = None) -> List[Function]:
         """
@@ -173,29 +219,32 @@ class RepositoryScanner:
             List of Function objects
         """
         try:
-            # Get appropriate parser
+            # Get appropriate parser and the language for AI analysis
             if lang:
                 parser = self.parser_factory.get_parser(lang)
+                detected_lang = lang
             else:
-                parser = self.parser_factory.get_parser_for_file(file_path)
+                detected_lang, parser = self.parser_factory.resolve(file_path)
+            
+            # Unchanged files are served straight from the parse cache
+            cache_key = None
+            if self.cache.enabled:
+                cache_key = self.cache.make_key(file_path, type(parser).__name__, detected_lang,
+                                                self.content.get(file_path))
+                if cache_key:
+                    cached_functions = self.cache.get(cache_key)
+                    if cached_functions is not None:
+                        self.logger.info(f"Loaded {len(cached_functions)} cached functions for {file_path}")
+                        return cached_functions
             
             # Parse the file
             parsed_file = parser.parse_file(file_path)
             
-            # Determine language for AI analysis
-            detected_lang = lang or self._detect_language_from_file(file_path)
+            # Analyze functions, parameters and exceptions in one batch
+            self.analyzer.analyze_functions(parsed_file.functions, detected_lang, self.content.get(file_path).lines)
             
-            # Analyze functions
-            for function in parsed_file.functions:
-                self.analyzer.analyze_function(function, detected_lang)
-                
-                # Analyze parameters
-                for parameter in function.parameters:
-                    self.analyzer.analyze_parameter(parameter)
-                
-                # Analyze exceptions
-                for exception in function.exceptions:
-                    self.analyzer.analyze_exception(exception)
+            if cache_key:
+                self.cache.put(cache_key, parsed_file.functions)
             
             self.logger.info(f"Parsed {len(parsed_file.functions)} functions from {file_path}")
             return parsed_file.functions
@@ -203,21 +252,16 @@ class RepositoryScanner:
         except (Exception, OSError, ImportError) as e:
             self.logger.error(f"Error parsing file {file_path}: {e}")
             return []
+        finally:
+            if self._owns_content:
+                self.content.release(file_path)
     
-    """
-        Parses the files based on self, file_paths, lang, max_workers. Function iterates over data, conditionally processes input, has side effects. Takes self, file_paths, lang and max_workers as input. Returns a dict[(path, list[function])] value.
-        :param self: The self object.
-        :param file_paths: The file_paths value of type List[Path].
-        :param lang: The lang value of type Optional[str].
-        :param max_workers: The max_workers value of type Optional[int].
-        :return: Value of type Dict[(Path, List[Function])]
-
-    """
     def parse_files_parallel(
         self, 
         file_paths: List[Path], 
         lang: Optional[str] = None,
-        max_workers: Optional[int] = None
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None
     ) -> Dict[Path, List[Function]]:
         """
         Parse multiple files in parallel.
@@ -226,28 +270,57 @@ class RepositoryScanner:
             file_paths: List of file paths to parse
             lang: Programming language (if None, auto-detect)
             max_workers: Maximum number of worker processes
+            chunksize: Number of files handed to a worker at a time
             
         Returns:
-            Dictionary mapping file paths to lists of functions
+            Dictionary mapping file paths to lists of functions, in input order
         """
-        if not max_workers:
-            max_workers = min(cpu_count(), len(file_paths))
+        results = dict(self.iter_parse_files_parallel(file_paths, lang, max_workers, chunksize))
+        return {file_path: results.get(file_path, []) for file_path in file_paths}
+    
+    def iter_parse_files_parallel(
+        self,
+        file_paths: Iterable[Path],
+        lang: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None
+    ) -> Iterator[Tuple[Path, List[Function]]]:
+        """
+        Parse files in a worker pool and yield results as each file finishes.
         
-        self.logger.info(f"Parsing {len(file_paths)} files with {max_workers} workers")
+        Every worker process builds its own scanner once (see _init_parse_worker),
+        so only file paths and results cross process boundaries.
+        
+        Args:
+            file_paths: File paths to parse (any iterable)
+            lang: Programming language (if None, auto-detect)
+            max_workers: Maximum number of worker processes
+            chunksize: Number of files handed to a worker at a time
+                (if None, derived from the number of files)
+            
+        Yields:
+            Tuples of (file path, list of functions) in completion order
+        """
+        total = len(file_paths) if hasattr(file_paths, '__len__') else None
+        if total == 0:
+            return
         
-        # Prepare arguments for parallel processing
-        args = [(file_path, lang) for file_path in file_paths]
+        if not max_workers:
+            max_workers = min(cpu_count(), total) if total else cpu_count()
         
-        # Use multiprocessing to parse files in parallel
-        with Pool(processes=max_workers) as pool:
-            results = pool.starmap(self._parse_file_worker, args)
+        if not chunksize:
+            # Large batches amortize IPC; small ones keep workers evenly loaded
+            chunksize = max(1, min(64, total // (max_workers * 8))) if total else 1
         
-        # Combine results
-        file_functions = {}
-        for file_path, functions in zip(file_paths, results):
-            file_functions[file_path] = functions
+        self.logger.info(
+            f"Parsing {total if total is not None else 'streamed'} files with "
+            f"{max_workers} workers (chunksize {chunksize})"
+        )
         
-        return file_functions
+        tasks = ((file_path, lang) for file_path in file_paths)
+        with Pool(processes=max_workers, initializer=_init_parse_worker, initargs=(self.config,)) as pool:
+            for file_path, functions in pool.imap_unordered(_parse_in_worker, tasks, chunksize=chunksize):
+                yield file_path, functions
     
     def _parse_file_worker(self, file_path: Path, lang: Optional[str] = None) -> List[Function]:
         """
@@ -343,15 +416,7 @@ class RepositoryScanner:
         Returns:
             Detected language string
         """
-        suffix = file_path.suffix.lower()
-        
-        if suffix in ['.py', '.pyx', '.pxd']:
-            return 'python'
-        elif suffix in ['.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.hh', '.hxx']:
-            return 'c++'
-        elif suffix == '.java':
-            return 'java'
-        elif suffix in ['.js', '.mjs', '.cjs']:
-            return 'javascript'
-        else:
+        try:
+            return self.parser_factory.resolve(file_path)[0]
+        except ValueError:
             return 'python'  # Default fallback 
\ No newline at end of file
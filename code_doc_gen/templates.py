@@ -0,0 +1,198 @@
+"""
+Compiled documentation templates for CodeDocGen.
+
+Templates are ``str.format`` strings. Rendering one used to mean looking the
+template up in the configuration and falling back through a chain of
+hardcoded defaults, for every function, parameter and exception. Here each
+(language, template type) is resolved once per run to a render callable, and
+configured templates are checked when the configuration is loaded, so an
+unknown field is reported up front instead of failing every function of the
+run.
+"""
+
+import re
+import string
+from typing import Callable, Dict, Optional, Tuple
+
+
+# Fields each template type is rendered with
+TEMPLATE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'brief': ('description',),
+    'detailed': ('description', 'params', 'returns', 'throws', 'raises'),
+    'param': ('name', 'description'),
+    'return': ('description',),
+    'throws': ('exception', 'description'),
+    'raises': ('exception', 'description'),
+}
+
+# Templates used when the configuration has none for a language; None holds
+# the templates of languages without their own
+FALLBACK_TEMPLATES: Dict[Optional[str], Dict[str, str]] = {
+    'c++': {
+        'brief': "/**\n * \\brief {description}\n */",
+        'detailed': "/**\n * \\brief {description}{params}{returns}{throws}\n */",
+        'param': " * \\param {name} {description}",
+        'return': " * \\return {description}",
+        'throws': " * \\throws {exception} {description}",
+    },
+    'python': {
+        'brief': '""" {description} """',
+        'detailed': '"""\n    {description}\n{params}{returns}{raises}\n    """',
+        'param': "    :param {name}: {description}",
+        'return': "    :return: {description}",
+        'throws': "    :raises {exception}: {description}",
+    },
+    'java': {
+        'brief': "/**\n * {description}\n */",
+        'detailed': "/**\n * {description}\n *\n{params}{returns}{throws}\n */",
+        'param': " * @param {name} {description}",
+        'return': " * @return {description}",
+        'throws': " * @throws {exception} {description}",
+    },
+    'javascript': {
+        'brief': "/**\n * {description}\n */",
+        'detailed': "/**\n * {description}\n *\n{params}{returns}{throws}\n */",
+        'param': " * @param {name} {description}",
+        'return': " * @returns {description}",
+        'throws': " * @throws {exception} {description}",
+    },
+    None: {
+        'brief': "/** {description} */",
+        'detailed': "/**\n * {description}\n *\n{params}{returns}{throws}\n */",
+        'param': " * @param {name} {description}",
+        'return': " * @return {description}",
+        'throws': " * @throws {exception} {description}",
+    },
+}
+
+# Template types the generator renders; exceptions use 'raises' where a
+# language configures that instead of 'throws'
+RENDERED_TYPES = ('brief', 'detailed', 'param', 'return', 'throws')
+
+_FORMATTER = string.Formatter()
+
+# Name a replacement field starts with, before any attribute or index access
+_FIELD_NAME = re.compile(r'[^.\[]*')
+
+
+def compile_template(template: str, template_type: str) -> Callable[..., str]:
+    """
+    Check a template and return its render callable.
+
+    Fields may use attribute and index access (``{params[0]}``) and format
+    specs, as with ``str.format``; only their names are restricted.
+
+    Args:
+        template: Format string of the template
+        template_type: Template type, which determines the allowed fields
+
+    Returns:
+        Callable taking every field of the template type as a keyword argument
+
+    Raises:
+        ValueError: If the template is not a valid format string or uses a
+            field the template type does not provide
+    """
+    fields = TEMPLATE_FIELDS[template_type]
+    if not isinstance(template, str):
+        raise ValueError(f"{template_type} template must be a string, not {type(template).__name__}")
+    try:
+        parsed = list(_FORMATTER.parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid {template_type} template {template!r}: {e}") from None
+
+    # Format specs may hold nested replacement fields, which are checked too
+    pending = parsed
+    while pending:
+        nested = []
+        for _, field, format_spec, _ in pending:
+            if field is None:
+                continue
+            if _FIELD_NAME.match(field).group() not in fields:
+                raise ValueError(
+                    f"Unknown field {{{field}}} in {template_type} template {template!r} "
+                    f"(available: {', '.join(fields)})"
+                )
+            if format_spec and '{' in format_spec:
+                try:
+                    nested.extend(_FORMATTER.parse(format_spec))
+                except ValueError as e:
+                    raise ValueError(f"Invalid {template_type} template {template!r}: {e}") from None
+        pending = nested
+
+    try:
+        template.format(**dict.fromkeys(fields, ''))
+    except ValueError as e:
+        raise ValueError(f"Invalid {template_type} template {template!r}: {e}") from None
+    except (AttributeError, IndexError, KeyError, TypeError):
+        # Attribute and index access depend on the rendered values
+        pass
+    return template.format
+
+
+def validate_templates(templates: Dict[str, Dict[str, str]]) -> None:
+    """
+    Check configured templates before they are used.
+
+    Args:
+        templates: Templates by language and template type
+
+    Raises:
+        ValueError: If a template is invalid
+    """
+    if not isinstance(templates, dict):
+        raise ValueError("templates must be a mapping of languages to templates")
+    for lang, lang_templates in templates.items():
+        if not isinstance(lang_templates, dict):
+            raise ValueError(f"templates for {lang} must be a mapping of template types to templates")
+        for template_type, template in lang_templates.items():
+            if template_type in TEMPLATE_FIELDS and template is not None:
+                try:
+                    compile_template(template, template_type)
+                except ValueError as e:
+                    raise ValueError(f"{lang}: {e}") from None
+
+
+class TemplateRenderers:
+    """Render callables for every language and template type, compiled once."""
+
+    def __init__(self, templates: Dict[str, Dict[str, str]]):
+        """
+        Compile the templates.
+
+        Args:
+            templates: Configured templates by language and template type
+
+        Raises:
+            ValueError: If a configured template is invalid
+        """
+        validate_templates(templates)
+        self._renderers: Dict[Tuple[Optional[str], str], Callable[..., str]] = {}
+        languages = [lang for lang in FALLBACK_TEMPLATES if lang is not None]
+        languages += [lang for lang in templates if lang not in FALLBACK_TEMPLATES]
+        for lang in languages + [None]:
+            configured = templates.get(lang, {}) if lang is not None else {}
+            fallback = FALLBACK_TEMPLATES.get(lang, FALLBACK_TEMPLATES[None])
+            for template_type in RENDERED_TYPES:
+                template = configured.get(template_type)
+                if not template and template_type == 'throws':
+                    template = configured.get('raises')
+                self._renderers[(lang, template_type)] = compile_template(
+                    template or fallback[template_type], template_type
+                )
+
+    def get(self, lang: str, template_type: str) -> Callable[..., str]:
+        """
+        Get the render callable of a template.
+
+        Args:
+            lang: Programming language
+            template_type: Template type (brief, detailed, param, return or throws)
+
+        Returns:
+            Callable taking the template type's fields as keyword arguments
+        """
+        renderer = self._renderers.get((lang, template_type))
+        if renderer is None:
+            renderer = self._renderers[(None, template_type)]
+        return renderer
@@ -0,0 +1,373 @@
+"""
+Transactional in-place writer for CodeDocGen.
+
+Writing documented files one at a time from the main loop (backup copy, read,
+rewrite) costs several synchronous file operations per file and leaves a
+``.bak`` next to every source file. The writer instead renders each file into
+a temporary file beside it on a pool of threads while the rest of the
+repository is still being processed, and commits the run at the end with one
+atomic ``os.replace`` per file, so a file is never seen half written and an
+aborted run leaves the tree untouched.
+
+The original contents of a run are appended to a single journal in the
+repository (``.codedocgen-cache/journal/<run>/`` by default) rather than
+copied to per-file backups; ``rollback_last_run`` restores them. A journal is
+complete once its manifest is written, which happens before the first file
+is replaced.
+"""
+
+import os
+import json
+import stat
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from .models import Function
+from .config import Config
+from .content import ContentStore
+from .generator import DocumentationGenerator
+
+
+MANIFEST = 'manifest.json'
+ORIGINALS = 'originals.bin'
+TEMP_SUFFIX = '.cdgtmp'
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _replace_atomically(path: Path, data: bytes, mode: Optional[int] = None) -> None:
+    """
+    Write a file through a temporary file in its directory and os.replace.
+
+    Args:
+        path: File to write
+        data: New contents
+        mode: Permission bits for the file (default: those of the temporary file)
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=TEMP_SUFFIX, dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def journal_directory(config: Config, repo_root: Path) -> Path:
+    """
+    Get the directory holding the run journals of a repository.
+
+    Args:
+        config: Configuration object
+        repo_root: Repository root
+
+    Returns:
+        Journal directory (relative settings are resolved against the repository)
+    """
+    directory = Path(config.get_writer_config().get('journal_directory', '.codedocgen-cache/journal'))
+    return directory if directory.is_absolute() else Path(repo_root) / directory
+
+
+class _StagedFile:
+    """A rendered file waiting in its temporary file to be committed."""
+
+    def __init__(self, path: Path, temp_path: str, size: int, original_stat: os.stat_result, digest: str,
+                 entry: Optional[Tuple[int, int]]):
+        self.path = path
+        self.temp_path = temp_path
+        self.size = size
+        self.original_version = (original_stat.st_mtime_ns, original_stat.st_size)
+        self.digest = digest
+        self.entry = entry
+
+
+class TransactionalWriter:
+    """Applies documentation to many files in parallel and commits them atomically."""
+
+    def __init__(self, config: Config, repo_root: Path, generator: Optional[DocumentationGenerator] = None,
+                 jobs: Optional[int] = None, journal: Optional[bool] = None,
+                 content_store: Optional[ContentStore] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            config: Configuration object
+            repo_root: Repository root; journal paths are recorded relative to it
+            generator: Generator that inserts the documentation (default: a new one)
+            jobs: Number of writer threads (default: the writer configuration)
+            journal: Whether to record the original contents for rollback (default: the writer configuration)
+            content_store: Store holding the contents already read this run; each
+                file is released from it once rendered
+        """
+        writer_config = config.get_writer_config()
+        self.repo_root = Path(repo_root).resolve()
+        self.generator = generator or DocumentationGenerator(config)
+        self.content = content_store if content_store is not None else ContentStore()
+        self.jobs = max(1, jobs or writer_config.get('jobs', 8))
+        self.journal_enabled = writer_config.get('journal', True) if journal is None else journal
+        self.keep_runs = max(1, int(writer_config.get('keep_runs', 5)))
+        self.journal_dir = journal_directory(config, self.repo_root)
+        self.logger = logging.getLogger(__name__)
+
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        self.journal_path: Optional[Path] = None
+        self.stats: Dict[str, Any] = {
+            'staged': 0, 'written': 0, 'unchanged': 0, 'conflicts': 0, 'failed': 0, 'bytes': 0, 'seconds': 0.0,
+        }
+
+        self._executor = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix='codedocgen-writer')
+        self._futures: List[Future] = []
+        self._journal = None
+        self._journal_lock = threading.Lock()
+        self._started: Optional[float] = None
+
+    def stage(self, file_path: Path, documentation: Dict[str, str], lang: str,
+              functions: Optional[List[Function]] = None) -> None:
+        """
+        Render a file's documentation into a temporary file in the background.
+
+        Args:
+            file_path: Path to the file to modify
+            documentation: Dictionary mapping function names to documentation strings
+            lang: Language of the file
+            functions: Parsed functions of the file, whose recorded lines locate them
+        """
+        if self._started is None:
+            self._started = time.perf_counter()
+        self.stats['staged'] += 1
+        self._futures.append(self._executor.submit(self._render, Path(file_path), documentation, lang, functions))
+
+    def _render(self, path: Path, documentation: Dict[str, str], lang: str,
+                functions: Optional[List[Function]]) -> Optional[_StagedFile]:
+        """
+        Write the documented version of a file next to it.
+
+        Returns:
+            The staged file, or None if the documentation changes nothing
+        """
+        try:
+            content = self.content.get(path)
+            original_stat = content.stat
+            lines = content.lines
+            modified_lines = self.generator._insert_documentation(
+                lines, documentation, lang, self.generator._function_locations(functions)
+            )
+            if modified_lines == lines:
+                return None
+            data = ''.join(modified_lines).replace('\n', os.linesep).encode('utf-8')
+
+            fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=TEMP_SUFFIX, dir=path.parent)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.chmod(temp_path, stat.S_IMODE(original_stat.st_mode))
+                entry = self._record_original(path, content.data)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            return _StagedFile(path, temp_path, len(data), original_stat, _digest(data), entry)
+        finally:
+            # The file has left the pipeline
+            self.content.release(path)
+
+    def _record_original(self, path: Path, original: bytes) -> Optional[Tuple[int, int]]:
+        """Append a file's original contents to the run journal; returns their (offset, length)."""
+        if not self.journal_enabled:
+            return None
+        with self._journal_lock:
+            if self._journal is None:
+                self.journal_path = self.journal_dir / self.run_id
+                self.journal_path.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.journal_path / ORIGINALS, 'wb')
+            offset = self._journal.tell()
+            self._journal.write(original)
+        return offset, len(original)
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.resolve().relative_to(self.repo_root).as_posix()
+        except ValueError:
+            return str(path.resolve())
+
+    def commit(self) -> List[Path]:
+        """
+        Wait for the staged files and replace the originals with them.
+
+        The journal is completed before the first file is replaced. A file
+        modified by someone else since it was staged is left alone.
+
+        Returns:
+            Paths of the files that were rewritten
+        """
+        staged: List[_StagedFile] = []
+        for future in self._futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                self.logger.error(f"Error writing documentation: {e}")
+                self.stats['failed'] += 1
+                continue
+            if result is None:
+                self.stats['unchanged'] += 1
+            else:
+                staged.append(result)
+        self._futures = []
+        self._executor.shutdown()
+
+        committable = []
+        for staged_file in staged:
+            current = staged_file.path.stat()
+            if (current.st_mtime_ns, current.st_size) != staged_file.original_version:
+                self.logger.warning(f"{staged_file.path} changed during the run, leaving it unmodified")
+                self.stats['conflicts'] += 1
+                os.unlink(staged_file.temp_path)
+                continue
+            committable.append(staged_file)
+        self._close_journal(committable)
+
+        written = []
+        for staged_file in committable:
+            try:
+                os.replace(staged_file.temp_path, staged_file.path)
+            except OSError as e:
+                self.logger.error(f"Error replacing {staged_file.path}: {e}")
+                self.stats['failed'] += 1
+                os.unlink(staged_file.temp_path)
+                continue
+            written.append(staged_file.path)
+            self.stats['bytes'] += staged_file.size
+        self.stats['written'] = len(written)
+        if self._started is not None:
+            self.stats['seconds'] = time.perf_counter() - self._started
+
+        if written and self.journal_path:
+            self.logger.info(f"Recorded the original files in {self.journal_path} (undo with --rollback)")
+        self._prune_journals()
+        return written
+
+    def _close_journal(self, committable: List[_StagedFile]) -> None:
+        """Close the journal and write the manifest of the files about to be replaced."""
+        if self._journal is None:
+            return
+        with self._journal_lock:
+            self._journal.close()
+            self._journal = None
+        if not committable:
+            shutil.rmtree(self.journal_path)
+            self.journal_path = None
+            return
+        manifest = {
+            'run': self.run_id,
+            'repo': str(self.repo_root),
+            'files': [
+                {'path': self._relative(f.path), 'original': list(f.entry), 'sha256': f.digest}
+                for f in committable
+            ],
+        }
+        _replace_atomically(self.journal_path / MANIFEST, json.dumps(manifest, indent=2).encode('utf-8'))
+
+    def _prune_journals(self) -> None:
+        """Delete all but the newest keep_runs journals."""
+        if not self.journal_dir.is_dir():
+            return
+        for old in sorted(p for p in self.journal_dir.iterdir() if p.is_dir())[:-self.keep_runs]:
+            shutil.rmtree(old)
+
+    def abort(self) -> None:
+        """Discard everything staged so far; no file is modified."""
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        for future in self._futures:
+            if future.cancelled() or future.exception() is not None:
+                continue
+            result = future.result()
+            if result is not None and os.path.exists(result.temp_path):
+                os.unlink(result.temp_path)
+        self._futures = []
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+                shutil.rmtree(self.journal_path)
+                self.journal_path = None
+
+    def throughput(self) -> Dict[str, float]:
+        """
+        Get the write throughput of the committed run.
+
+        Returns:
+            Dictionary with files per second and megabytes per second, from the
+            first staged file to the end of the commit
+        """
+        seconds = self.stats['seconds'] or float('inf')
+        return {
+            'files_per_second': self.stats['written'] / seconds,
+            'mb_per_second': self.stats['bytes'] / (1024 * 1024) / seconds,
+        }
+
+
+def rollback_last_run(config: Config, repo_root: Path) -> List[Path]:
+    """
+    Restore the files of the most recent journaled run.
+
+    Files changed since that run are not touched. The journal is removed
+    afterwards, so rolling back again undoes the run before it.
+
+    Args:
+        config: Configuration object
+        repo_root: Repository root
+
+    Returns:
+        Paths of the restored files
+
+    Raises:
+        FileNotFoundError: If there is no journaled run to roll back
+    """
+    logger = logging.getLogger(__name__)
+    repo_root = Path(repo_root).resolve()
+    directory = journal_directory(config, repo_root)
+    runs = sorted((p for p in directory.iterdir() if p.is_dir()), reverse=True) if directory.is_dir() else []
+    for journal_path in runs:
+        if not (journal_path / MANIFEST).exists():
+            # A run interrupted before its commit replaced no file
+            logger.warning(f"Discarding incomplete journal {journal_path}")
+            shutil.rmtree(journal_path)
+            continue
+        manifest = json.loads((journal_path / MANIFEST).read_text(encoding='utf-8'))
+        with open(journal_path / ORIGINALS, 'rb') as originals:
+            restored = _restore(originals, manifest, repo_root)
+        shutil.rmtree(journal_path)
+        logger.info(f"Rolled back run {manifest['run']}: restored {len(restored)} of {len(manifest['files'])} files")
+        return restored
+    raise FileNotFoundError(f"No journaled run to roll back in {directory}")
+
+
+def _restore(originals: Any, manifest: Dict[str, Any], repo_root: Path) -> List[Path]:
+    """Restore the original contents recorded in a journal, skipping files changed since."""
+    logger = logging.getLogger(__name__)
+    restored = []
+    for entry in manifest['files']:
+        path = repo_root / entry['path']
+        if not path.exists() or _digest(path.read_bytes()) != entry['sha256']:
+            logger.warning(f"{path} changed since run {manifest['run']}, not restoring it")
+            continue
+        offset, length = entry['original']
+        originals.seek(offset)
+        _replace_atomically(path, originals.read(length), stat.S_IMODE(path.stat().st_mode))
+        restored.append(path)
+    return restored
@@ -0,0 +1,20 @@
+"""
+Shared pytest fixtures for CodeDocGen tests.
+"""
+
+import pytest
+
+from code_doc_gen.config import Config
+from code_doc_gen.ai_health import get_health_tracker
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches out of the working tree and isolated per test."""
+    monkeypatch.setitem(Config.DEFAULT_CONFIG["cache"], "directory", str(tmp_path / ".codedocgen-cache"))
+
+
+@pytest.fixture(autouse=True)
+def fresh_ai_health():
+    """Do not let circuit breakers opened by one test skip providers in another."""
+    get_health_tracker().reset()
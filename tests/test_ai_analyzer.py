@@ -6,9 +6,9 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
-from code_doc_gen.ai_analyzer import AIAnalyzer
+from code_doc_gen.ai_analyzer import AIAnalyzer, find_comment_end
 from code_doc_gen.config import Config
-from code_doc_gen.models import Function, Parameter
+from code_doc_gen.models import Function, Parameter, FunctionException
 
 
 class TestAIAnalyzer:
@@ -84,6 +84,50 @@ class TestAIAnalyzer:
         assert "def calculate_sum(a: int, b: int) -> int:" in prompt
         assert "return a + b" in prompt
     
+    def test_prompt_response_limit_scales_with_function(self):
+        """Test that comment prompts carry a max_tokens sized by parameters and exceptions."""
+        analyzer = AIAnalyzer(self.config)
+        small = Function(name="ping", parameters=[], return_type="None", source_code="pass")
+        large = Function(name="load", parameters=[Parameter(f"p{i}", "int") for i in range(4)], return_type="dict",
+                         source_code="pass", exceptions=[FunctionException("ValueError"), FunctionException("IOError")])
+        
+        small_limit = analyzer._create_ai_prompt(small, "python").max_tokens
+        large_limit = analyzer._create_ai_prompt(large, "python").max_tokens
+        
+        assert small_limit == analyzer.BASE_RESPONSE_TOKENS
+        assert small_limit < large_limit <= analyzer.MAX_RESPONSE_TOKENS
+    
+    def test_find_comment_end(self):
+        """Test detection of a complete comment block in a partial response."""
+        assert find_comment_end('"""\nAdds numbers.\n"""\nThis docstring') == len('"""\nAdds numbers.\n"""')
+        assert find_comment_end('/**\n * Adds numbers.\n') is None
+        assert find_comment_end('/**\n * Adds numbers.\n */ trailing') == len('/**\n * Adds numbers.\n */')
+        assert find_comment_end('Adds numbers.\n\nReturns:\n    int: Sum.') is None
+        assert find_comment_end('Adds numbers.\n\nThis docstring explains') == len('Adds numbers.')
+    
+    @patch('code_doc_gen.ai_analyzer.groq')
+    def test_streamed_response_stops_after_comment(self, mock_groq):
+        """Test that streaming closes the stream once the comment is complete."""
+        def chunk(text):
+            return Mock(choices=[Mock(delta=Mock(content=text))])
+        
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([chunk('"""\nAdds'), chunk(' numbers.\n"""'), chunk('\n\nNote that'), chunk(' more')])
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = stream
+        mock_groq.Groq.return_value = mock_client
+        
+        self.config.config['ai'].update({'enabled': True, 'provider': 'groq', 'groq_api_key': 'test-key', 'streaming': True})
+        with patch('code_doc_gen.ai_analyzer.GROQ_AVAILABLE', True):
+            analyzer = AIAnalyzer(self.config)
+            result = analyzer.analyze_function(self.sample_function, "python")
+        
+        assert result == '"""\nAdds numbers.\n"""'
+        kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert kwargs['stream'] is True
+        assert kwargs['max_tokens'] == analyzer._max_response_tokens(self.sample_function)
+        stream.close.assert_called_once()
+    
     def test_create_cpp_prompt(self):
         """Test C++ prompt creation."""
         self.config.config['ai']['enabled'] = True
@@ -221,6 +265,151 @@ class TestAIAnalyzer:
             result = analyzer.analyze_function(self.sample_function, "python")
             assert result is None  # Should return None for fallback
     
+    @patch('code_doc_gen.ai_analyzer.groq')
+    def test_open_circuit_skips_retries(self, mock_groq):
+        """Test that a provider that keeps failing is skipped instead of retried for every function."""
+        mock_client = Mock()
+        mock_client.chat.completions.create.side_effect = Exception("Service unavailable")
+        mock_groq.Groq.return_value = mock_client
+        
+        self.config.config['ai'].update({
+            'enabled': True, 'provider': 'groq', 'groq_api_key': 'test-key',
+            'max_retries': 5, 'retry_delay': 0.01, 'models': {'groq': 'llama3-8b-8192'},
+        })
+        with patch('code_doc_gen.ai_analyzer.GROQ_AVAILABLE', True):
+            analyzer = AIAnalyzer(self.config)
+            assert analyzer.analyze_function(self.sample_function, "python") is None
+            calls = mock_client.chat.completions.create.call_count
+            assert analyzer.analyze_function(self.sample_function, "python") is None
+        
+        # The breaker opened after three failures; the second function sent nothing
+        assert calls == 3
+        assert mock_client.chat.completions.create.call_count == calls
+        assert analyzer.health.get_stats()['groq']['state'] == 'open'
+    
+    @patch('code_doc_gen.ai_analyzer.groq')
+    def test_analyze_functions_concurrently(self, mock_groq):
+        """Test analyzing many functions through the concurrent engine."""
+        def create(**kwargs):
+            name = 'first' if 'first' in kwargs['messages'][0]['content'] else 'second'
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = f'"""Documents {name}."""'
+            return response
+        
+        mock_client = Mock()
+        mock_client.chat.completions.create.side_effect = create
+        mock_groq.Groq.return_value = mock_client
+        
+        self.config.config['ai']['enabled'] = True
+        self.config.config['ai']['provider'] = 'groq'
+        self.config.config['ai']['groq_api_key'] = 'test-key'
+        functions = [Function(name=name, parameters=[], return_type="None", source_code="pass") for name in ("first", "second")]
+        completed = []
+        with patch('code_doc_gen.ai_analyzer.GROQ_AVAILABLE', True):
+            analyzer = AIAnalyzer(self.config)
+            results = analyzer.analyze_functions(functions, "python", on_result=lambda f, _: completed.append(f.name))
+        
+        assert results == ['"""Documents first."""', '"""Documents second."""']
+        assert sorted(completed) == ['first', 'second']
+    
+    @patch('code_doc_gen.ai_analyzer.groq')
+    def test_repeat_run_uses_response_cache(self, mock_groq):
+        """Test that unchanged functions make no network calls on a repeat run."""
+        mock_client = Mock()
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = '"""Adds two numbers together."""'
+        mock_client.chat.completions.create.return_value = mock_response
+        mock_groq.Groq.return_value = mock_client
+        
+        self.config.config['ai']['enabled'] = True
+        self.config.config['ai']['provider'] = 'groq'
+        self.config.config['ai']['groq_api_key'] = 'test-key'
+        with patch('code_doc_gen.ai_analyzer.GROQ_AVAILABLE', True):
+            first = AIAnalyzer(self.config).analyze_function(self.sample_function, "python")
+            second = AIAnalyzer(self.config).analyze_function(self.sample_function, "python")
+            batch = AIAnalyzer(self.config).analyze_functions([self.sample_function], "python")
+        
+        assert first == second == batch[0] == '"""Adds two numbers together."""'
+        assert mock_client.chat.completions.create.call_count == 1
+        
+        # --no-ai-cache requests a fresh response
+        self.config.config['cache']['ai']['enabled'] = False
+        with patch('code_doc_gen.ai_analyzer.GROQ_AVAILABLE', True):
+            AIAnalyzer(self.config).analyze_function(self.sample_function, "python")
+        assert mock_client.chat.completions.create.call_count == 2
+    
+    def _batch_analyzer(self, mock_groq, answer):
+        """Create a batching analyzer whose Groq client answers with answer(prompt)."""
+        def create(**kwargs):
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = answer(kwargs['messages'][0]['content'])
+            return response
+        
+        mock_client = Mock()
+        mock_client.chat.completions.create.side_effect = create
+        mock_groq.Groq.return_value = mock_client
+        
+        self.config.config['ai']['enabled'] = True
+        self.config.config['ai']['provider'] = 'groq'
+        self.config.config['ai']['groq_api_key'] = 'test-key'
+        self.config.config['ai']['batch_size'] = 4
+        return mock_client
+    
+    @staticmethod
+    def _batch_answer(prompt, skip=()):
+        """Answer a batch prompt with one JSON entry per function, except skipped names."""
+        import json, re
+        names = re.findall(r'### Function (\d+)\nFunction: def (\w+)', prompt)
+        return json.dumps([
+            {"id": int(number), "description": f"Handles {name}", "parameters": [], "returns": "", "exceptions": []}
+            for number, name in names if name not in skip
+        ])
+    
+    @patch('code_doc_gen.ai_analyzer.groq')
+    def test_analyze_functions_batched(self, mock_groq):
+        """Test that batching packs several functions into one request."""
+        mock_client = self._batch_analyzer(mock_groq, self._batch_answer)
+        functions = [Function(name=f"get_{i}", parameters=[], return_type="int", source_code="return 1")
+                     for i in range(8)]
+        
+        with patch('code_doc_gen.ai_analyzer.GROQ_AVAILABLE', True):
+            results = AIAnalyzer(self.config).analyze_functions(functions, "python")
+        
+        assert mock_client.chat.completions.create.call_count == 2
+        assert results == [f'"""\n    Handles get_{i}\n"""' for i in range(8)]
+    
+    @patch('code_doc_gen.ai_analyzer.groq')
+    def test_analyze_functions_batch_bisects_on_partial_failure(self, mock_groq):
+        """Test that functions missing from a batch response are retried in smaller batches."""
+        answers = []
+        def answer(prompt):
+            answers.append(prompt)
+            if '### Function' not in prompt:
+                return '"""Single-function fallback."""'
+            # The first batch response drops four functions, later ones drop get_4
+            return self._batch_answer(prompt, skip=('get_1', 'get_2', 'get_3', 'get_4') if len(answers) == 1 else ('get_4',))
+        
+        mock_client = self._batch_analyzer(mock_groq, answer)
+        self.config.config['ai']['batch_size'] = 8
+        functions = [Function(name=f"get_{i}", parameters=[], return_type="int", source_code="return 1")
+                     for i in range(8)]
+        
+        with patch('code_doc_gen.ai_analyzer.GROQ_AVAILABLE', True):
+            results = AIAnalyzer(self.config).analyze_functions(functions, "python")
+        
+        # One batch of 8, two halves of the 4 missing functions, then get_4 on its own
+        assert results[:4] == [f'"""\n    Handles get_{i}\n"""' for i in range(4)]
+        assert results[4] == '"""Single-function fallback."""'
+        assert results[5:] == [f'"""\n    Handles get_{i}\n"""' for i in range(5, 8)]
+        assert mock_client.chat.completions.create.call_count == 4
+    
+    def test_analyze_functions_ai_disabled(self):
+        """Test that batch analysis returns no comments when AI is disabled."""
+        assert self.analyzer.analyze_functions([self.sample_function], "python") == [None]
+    
     def test_get_provider_info(self):
         """Test getting provider information."""
         self.config.config['ai']['enabled'] = True
@@ -0,0 +1,149 @@
+"""
+Tests for the offline AI batch export and ingest.
+"""
+
+import json
+import pytest
+
+from code_doc_gen.config import Config
+from code_doc_gen.pipeline import DocumentationPipeline
+from code_doc_gen.generator import DocumentationGenerator
+from code_doc_gen.ai_batch import AIBatchExporter, AIBatchIngester, BATCH_ENDPOINT
+
+
+def _result_line(custom_id, content=None, error=None):
+    """A line of a provider batch output file."""
+    if error:
+        return {'id': f"batch_req_{custom_id}", 'custom_id': custom_id, 'response': None,
+                'error': {'code': 'server_error', 'message': error}}
+    return {
+        'id': f"batch_req_{custom_id}",
+        'custom_id': custom_id,
+        'response': {
+            'status_code': 200,
+            'request_id': 'req-1',
+            'body': {'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}}]},
+        },
+        'error': None,
+    }
+
+
+class TestAIBatch:
+    """Test cases for AIBatchExporter and AIBatchIngester."""
+
+    @pytest.fixture
+    def config(self):
+        """Create a configuration with batch-friendly AI settings."""
+        config = Config()
+        config.config['ai'].update({'provider': 'openai', 'models': {'openai': 'gpt-4o-mini'}, 'enabled': False})
+        return config
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Create a small repository with documented and undocumented functions."""
+        repo = tmp_path / "repo"
+        (repo / "pkg").mkdir(parents=True)
+        (repo / "pkg" / "maths.py").write_text(
+            "def add(a: int, b: int) -> int:\n"
+            "    return a + b\n"
+            "\n"
+            "def documented(x):\n"
+            "    \"\"\"Already documented.\"\"\"\n"
+            "    return x\n"
+        )
+        (repo / "pkg" / "text.py").write_text("def shout(s: str) -> str:\n    return s.upper()\n")
+        return repo
+
+    def _run(self, config, repo):
+        files = sorted(repo.rglob("*.py"))
+        return list(DocumentationPipeline(config, jobs=1).run(files))
+
+    def _export(self, config, repo, path):
+        exporter = AIBatchExporter(config, repo, path)
+        for result in self._run(config, repo):
+            exporter.add(result.file_path, result.functions, result.language)
+        exporter.close()
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    def test_export_writes_provider_batch_requests(self, config, repo, tmp_path):
+        """Every undocumented function becomes one chat completion request."""
+        requests = self._export(config, repo, tmp_path / "batch.jsonl")
+
+        assert len(requests) == 2
+        for request in requests:
+            assert request['method'] == 'POST'
+            assert request['url'] == BATCH_ENDPOINT
+            assert request['body']['model'] == 'gpt-4o-mini'
+            assert request['body']['messages'][0]['role'] == 'user'
+            assert request['body']['max_tokens'] > 0
+        prompts = " ".join(r['body']['messages'][0]['content'] for r in requests)
+        assert "add" in prompts and "shout" in prompts and "documented" not in prompts
+
+    def test_custom_ids_are_stable(self, config, repo, tmp_path):
+        """Exporting unchanged code twice yields the same custom ids."""
+        first = self._export(config, repo, tmp_path / "first.jsonl")
+        second = self._export(config, repo, tmp_path / "second.jsonl")
+
+        assert [r['custom_id'] for r in first] == [r['custom_id'] for r in second]
+        assert len({r['custom_id'] for r in first}) == len(first)
+
+    def test_ingest_applies_results_in_place(self, config, repo, tmp_path):
+        """Results of a fake batch job are parsed and written through the generator."""
+        requests = self._export(config, repo, tmp_path / "batch.jsonl")
+        by_function = {
+            ('add' if 'add(' in r['body']['messages'][0]['content'] else 'shout'): r['custom_id'] for r in requests
+        }
+        result_path = tmp_path / "batch_output.jsonl"
+        result_path.write_text("\n".join(json.dumps(line) for line in [
+            _result_line(by_function['add'], '"""\nAdds two integers.\n\nReturns:\n    int: The sum.\n"""'),
+            _result_line(by_function['shout'], error="Internal error"),
+            _result_line("cdg-unknown", "Stale result of a function that no longer exists."),
+        ]) + "\n")
+
+        ingester = AIBatchIngester(config, repo, result_path)
+        assert ingester.stats['results'] == 3
+        assert ingester.stats['failed'] == 1
+
+        writer = DocumentationGenerator(config)
+        for result in self._run(config, repo):
+            applied = set(ingester.apply(result.file_path, result.functions, result.language))
+            documentation = {
+                name: doc
+                for name, doc in writer.generate_documentation(result.functions, result.language).items()
+                if name in applied
+            }
+            if documentation:
+                writer.apply_documentation_inplace(result.file_path, documentation, result.language)
+
+        assert ingester.stats['applied'] == 1
+        assert "Adds two integers." in (repo / "pkg" / "maths.py").read_text()
+        assert (repo / "pkg" / "text.py").read_text() == "def shout(s: str) -> str:\n    return s.upper()\n"
+
+    def test_ingest_skips_lines_that_are_not_result_objects(self, config, repo, tmp_path):
+        """Valid JSON that is not a result object is counted as failed instead of aborting the ingest."""
+        result_path = tmp_path / "batch_output.jsonl"
+        result_path.write_text("\n".join([
+            "[]", '"x"', "null", "{not json",
+            json.dumps({'custom_id': 'cdg-odd', 'response': 'not an object'}),
+            json.dumps(_result_line("cdg-ok", "Does something.")),
+        ]) + "\n")
+
+        ingester = AIBatchIngester(config, repo, result_path)
+
+        assert ingester.stats['results'] == 6
+        assert ingester.stats['failed'] == 5
+        assert ingester.responses == {'cdg-ok': "Does something."}
+
+    def test_changed_function_ignores_stale_result(self, config, repo, tmp_path):
+        """A result is not applied once its function's code has changed."""
+        requests = self._export(config, repo, tmp_path / "batch.jsonl")
+        result_path = tmp_path / "batch_output.jsonl"
+        result_path.write_text("\n".join(json.dumps(_result_line(r['custom_id'], "Does something.")) for r in requests))
+        (repo / "pkg" / "text.py").write_text("def shout(s: str) -> str:\n    return s.upper() + '!'\n")
+
+        ingester = AIBatchIngester(config, repo, result_path)
+        applied = []
+        for result in self._run(config, repo):
+            applied.extend(ingester.apply(result.file_path, result.functions, result.language))
+
+        assert applied == ['add']
@@ -0,0 +1,65 @@
+"""
+Tests for the shared AI provider client registry.
+"""
+
+from unittest.mock import Mock, patch
+
+from code_doc_gen.ai_clients import ClientRegistry
+from code_doc_gen.ai_analyzer import AIAnalyzer
+from code_doc_gen.config import Config
+
+
+class TestClientRegistry:
+    """Test cases for ClientRegistry."""
+
+    def test_client_built_once_and_reused(self):
+        """Test that a client is built lazily and shared."""
+        registry = ClientRegistry()
+        client_class = Mock()
+
+        first = registry.get('groq', client_class, 'key')
+        second = registry.get('groq', client_class, 'key')
+
+        assert first is second
+        assert client_class.call_count == 1
+        assert 'http_client' in client_class.call_args.kwargs
+        registry.clear()
+
+    def test_separate_clients_per_key_and_endpoint(self):
+        """Test that different keys and endpoints get their own clients."""
+        registry = ClientRegistry()
+        client_class = Mock(side_effect=lambda **kwargs: Mock())
+
+        a = registry.get('openai', client_class, 'key-a')
+        b = registry.get('openai', client_class, 'key-b')
+        c = registry.get('openai', client_class, 'key-a', base_url='http://localhost:8000/v1')
+
+        assert len({id(a), id(b), id(c)}) == 3
+        assert client_class.call_args.kwargs['base_url'] == 'http://localhost:8000/v1'
+        assert registry.get_stats()['created'] == 3
+        registry.clear()
+        assert registry.get_stats()['clients'] == 0
+
+    def test_reset_after_fork_drops_parent_clients(self):
+        """Test that a forked child does not reuse the parent's clients."""
+        registry = ClientRegistry()
+        client_class = Mock(side_effect=lambda **kwargs: Mock())
+        parent = registry.get('groq', client_class, 'key')
+
+        registry._reset_after_fork()
+
+        assert registry.get('groq', client_class, 'key') is not parent
+
+    @patch('code_doc_gen.ai_analyzer.GROQ_AVAILABLE', True)
+    @patch('code_doc_gen.ai_analyzer.groq')
+    def test_analyzers_share_clients(self, mock_groq):
+        """Test that analyzers are cheap to create and share one client."""
+        config = Config()
+        config.config['ai'] = {'enabled': True, 'provider': 'groq', 'groq_api_key': 'test-key'}
+
+        first = AIAnalyzer(config)
+        second = AIAnalyzer(config)
+        assert mock_groq.Groq.call_count == 0
+
+        assert first.groq_client is second.groq_client
+        assert mock_groq.Groq.call_count == 1
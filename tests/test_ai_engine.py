@@ -0,0 +1,161 @@
+"""
+Tests for the concurrent AI request engine.
+"""
+
+import time
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from code_doc_gen.ai_engine import AIRequestEngine, TokenBucket, get_retry_after, is_rate_limit_error, estimate_tokens
+from code_doc_gen.ai_health import HealthTracker
+
+
+class RateLimitError(Exception):
+    """Stand-in for an SDK 429 error."""
+
+    def __init__(self, retry_after: str):
+        super().__init__("rate limited")
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers={'retry-after': retry_after})
+
+
+class FakeProvider:
+    """Local provider that answers after a delay and records concurrency."""
+
+    def __init__(self, delay: float = 0.02, failures=None):
+        self.delay = delay
+        self.failures = list(failures or [])
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str):
+        with self._lock:
+            self.calls.append((prompt, time.monotonic()))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            failure = self.failures.pop(0) if self.failures else None
+        try:
+            time.sleep(self.delay)
+            if failure is not None:
+                raise failure
+            return f"doc:{prompt}"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestAIRequestEngine:
+    """Test cases for AIRequestEngine."""
+
+    def test_results_for_every_item(self):
+        """Every submitted prompt gets its response under its key."""
+        engine = AIRequestEngine([('fake', FakeProvider(delay=0))], concurrency=4)
+
+        results = engine.run((i, f"p{i}") for i in range(20))
+
+        assert results == {i: f"doc:p{i}" for i in range(20)}
+
+    def test_concurrency_cap(self):
+        """At most `concurrency` requests are in flight, and they do overlap."""
+        provider = FakeProvider(delay=0.05)
+        engine = AIRequestEngine([('fake', provider)], concurrency=3)
+
+        start = time.monotonic()
+        engine.run((i, str(i)) for i in range(9))
+        elapsed = time.monotonic() - start
+
+        assert provider.peak == 3
+        assert elapsed < 9 * 0.05
+
+    def test_results_arrive_in_completion_order(self):
+        """Slow prompts do not hold back fast ones."""
+        async def provider(prompt):
+            await asyncio.sleep(0.1 if prompt == 'slow' else 0)
+            return prompt
+
+        engine = AIRequestEngine([('fake', provider)], concurrency=2)
+        order = []
+        engine.run([('slow', 'slow'), ('fast', 'fast')], on_result=lambda key, _: order.append(key))
+
+        assert order == ['fast', 'slow']
+
+    def test_retry_after_is_honored(self):
+        """A 429 pauses the provider for the advertised delay before retrying."""
+        provider = FakeProvider(delay=0, failures=[RateLimitError('0.2')])
+        engine = AIRequestEngine([('fake', provider)], concurrency=1, retry_delay=10.0)
+
+        results = engine.run([(0, 'p')])
+
+        assert results == {0: 'doc:p'}
+        assert len(provider.calls) == 2
+        assert provider.calls[1][1] - provider.calls[0][1] >= 0.2
+
+    def test_fallback_to_next_provider(self):
+        """When the primary provider keeps failing the next one answers."""
+        primary = FakeProvider(delay=0, failures=[RuntimeError("down")] * 2)
+        engine = AIRequestEngine([('primary', primary), ('backup', lambda p: f"backup:{p}")],
+                                 concurrency=1, max_retries=2, retry_delay=0)
+
+        assert engine.run([(0, 'p')]) == {0: 'backup:p'}
+        assert len(primary.calls) == 2
+
+    def test_open_circuit_skips_provider(self):
+        """Once the primary's circuit opens, later prompts go straight to the backup."""
+        primary = FakeProvider(delay=0, failures=[RuntimeError("down")] * 10)
+        engine = AIRequestEngine([('primary', primary), ('backup', lambda p: f"backup:{p}")],
+                                 concurrency=1, max_retries=5, retry_delay=0,
+                                 health=HealthTracker(failure_threshold=2, cooldown=60))
+
+        results = engine.run((i, str(i)) for i in range(4))
+
+        assert results == {i: f"backup:{i}" for i in range(4)}
+        assert len(primary.calls) == 2
+
+    def test_request_rate_limit(self):
+        """The request bucket spaces out requests beyond its burst."""
+        provider = FakeProvider(delay=0)
+        engine = AIRequestEngine([('fake', provider)], concurrency=4,
+                                 rate_limits={'fake': {'requests_per_minute': 600}})
+        engine.limiters['fake'].requests.tokens = 1
+
+        start = time.monotonic()
+        engine.run((i, str(i)) for i in range(3))
+
+        # One request immediately, then one every 0.1s
+        assert time.monotonic() - start >= 0.18
+
+
+class TestHelpers:
+    """Test cases for the engine helpers."""
+
+    def test_get_retry_after(self):
+        """Retry-After hints are read from attributes and headers."""
+        assert get_retry_after(RateLimitError('3')) == 3.0
+        assert get_retry_after(SimpleNamespace(response=SimpleNamespace(headers={'retry-after-ms': '250'}))) == 0.25
+        assert get_retry_after(SimpleNamespace(retry_after=1.5)) == 1.5
+        assert get_retry_after(RuntimeError("boom")) is None
+
+    def test_is_rate_limit_error(self):
+        """Only 429 responses count as rate limiting."""
+        assert is_rate_limit_error(RateLimitError('1'))
+        assert not is_rate_limit_error(RuntimeError("boom"))
+
+    def test_token_bucket_waits_for_refill(self):
+        """A drained bucket waits for the refill instead of failing."""
+        bucket = TokenBucket(6000)
+        bucket.tokens = 0
+
+        start = time.monotonic()
+        asyncio.run(bucket.acquire(10))
+
+        assert time.monotonic() - start >= 0.09
+
+    def test_estimate_tokens(self):
+        """Token estimates are roughly four characters per token."""
+        assert estimate_tokens("x" * 400) == 100
+        assert estimate_tokens("") == 1
@@ -0,0 +1,75 @@
+"""
+Tests for AI provider and model health tracking.
+"""
+
+import time
+
+from code_doc_gen.ai_health import HealthTracker, merge_health_stats, CLOSED, OPEN, HALF_OPEN
+
+
+class TestHealthTracker:
+    """Test cases for HealthTracker."""
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        """A target is skipped once its failure threshold is reached."""
+        tracker = HealthTracker(failure_threshold=2, cooldown=60)
+
+        tracker.record_failure('groq')
+        assert tracker.order(['groq', 'openai']) == ['groq', 'openai']
+        tracker.record_failure('groq')
+
+        assert tracker.state('groq') == OPEN
+        assert tracker.order(['groq', 'openai']) == ['openai']
+        assert not tracker.allow('groq')
+        assert tracker.get_stats()['groq']['circuit_opens'] == 1
+
+    def test_half_open_admits_one_probe(self):
+        """After the cooldown one probe decides whether the circuit closes."""
+        tracker = HealthTracker(failure_threshold=1, cooldown=0.05)
+        tracker.record_failure('groq')
+        time.sleep(0.06)
+
+        assert tracker.state('groq') == HALF_OPEN
+        assert tracker.allow('groq')
+        assert not tracker.allow('groq')
+
+        tracker.record_success('groq', 0.1)
+        assert tracker.state('groq') == CLOSED
+
+    def test_failed_probe_reopens(self):
+        """A failing probe opens the circuit for another cooldown."""
+        tracker = HealthTracker(failure_threshold=1, cooldown=0.05)
+        tracker.record_failure('groq')
+        time.sleep(0.06)
+        assert tracker.allow('groq')
+
+        tracker.record_failure('groq')
+
+        assert tracker.state('groq') == OPEN
+        assert tracker.get_stats()['groq']['circuit_opens'] == 2
+
+    def test_order_by_median_latency(self):
+        """Measured targets are ordered by p50; unmeasured ones go first, in configured order."""
+        tracker = HealthTracker()
+        for latency in (0.9, 0.1, 0.8):
+            tracker.record_success('groq/slow', latency)
+        for latency in (0.3, 0.3, 0.2):
+            tracker.record_success('groq/fast', latency)
+
+        assert tracker.order(['groq/slow', 'groq/fast', 'groq/new']) == ['groq/new', 'groq/fast', 'groq/slow']
+
+    def test_merge_health_stats(self):
+        """Counters add up and the median is taken over all processes' samples."""
+        first = HealthTracker(failure_threshold=1)
+        second = HealthTracker(failure_threshold=1)
+        first.record_success('groq', 0.1)
+        first.record_success('groq', 0.2)
+        second.record_success('groq', 0.9)
+        second.record_failure('openai')
+
+        merged = merge_health_stats([first.get_stats(), second.get_stats()])
+
+        assert merged['groq']['requests'] == 3
+        assert merged['groq']['p50'] == 0.2
+        assert merged['openai']['state'] == OPEN
+        assert merged['openai']['p50'] is None
@@ -0,0 +1,117 @@
+"""
+Tests for budgeted AI scheduling.
+"""
+
+import copy
+import pytest
+from unittest.mock import patch
+
+from code_doc_gen.config import Config
+from code_doc_gen.pipeline import DocumentationPipeline
+from code_doc_gen.ai_analyzer import AIAnalyzer
+from code_doc_gen.ai_scheduler import AIScheduler
+from code_doc_gen.models import Function
+
+
+class TestAIScheduler:
+    """Test cases for AIScheduler."""
+
+    @pytest.fixture
+    def config(self):
+        """Create a configuration with AI enabled."""
+        config = Config()
+        config.config['ai'].update({'enabled': True, 'provider': 'openai', 'openai_api_key': 'test-key',
+                                    'fallback_providers': []})
+        return config
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Create files with functions of clearly different value."""
+        (tmp_path / "core.py").write_text(
+            "def parse(text, strict=False):\n"
+            "    result = []\n"
+            "    for line in text.splitlines():\n"
+            "        if strict and not line:\n"
+            "            raise ValueError(line)\n"
+            "        elif line.startswith('#') or line.startswith(';'):\n"
+            "            continue\n"
+            "        result.append(line)\n"
+            "    return result\n"
+            "\n"
+            "def _helper(x):\n"
+            "    return x\n"
+        )
+        (tmp_path / "cli.py").write_text(
+            "def main(args):\n"
+            "    return parse(args[0]) + parse(args[1]) + parse(args[2])\n"
+            "\n"
+            "def _unused(y):\n"
+            "    return y\n"
+        )
+        return tmp_path
+
+    def _results(self, config, repo):
+        pipeline_config = copy.deepcopy(config)
+        pipeline_config.config['ai']['enabled'] = False
+        return list(DocumentationPipeline(pipeline_config, jobs=1).run(sorted(repo.glob("*.py"))))
+
+    def test_score_prefers_public_complex_and_called_functions(self, config, repo):
+        """Public API, complexity and fan-in all raise the score."""
+        scheduler = AIScheduler(config, budget=10)
+        candidates = {c.function.name: c for c in scheduler._collect(self._results(config, repo))}
+
+        assert set(candidates) == {'parse', '_helper', 'main', '_unused'}
+        assert candidates['parse'].score > candidates['main'].score > candidates['_helper'].score
+        assert candidates['_helper'].score == pytest.approx(candidates['_unused'].score)
+
+    def test_score_of_cpp_free_function_without_class(self, config):
+        """C++ free functions parsed by libclang have no class name and are scored normally."""
+        scheduler = AIScheduler(config, budget=10)
+        free = Function(name="encode", parameters=[], return_type="int", class_name=None,
+                        source_code="int encode(const Message& message) {\n    return 0;\n}")
+        hidden = Function(name="encode", parameters=[], return_type="int", class_name=None,
+                          source_code="static int encode(const Message& message) {\n    return 0;\n}")
+
+        assert scheduler._is_public(free, 'c++')
+        assert not scheduler._is_public(hidden, 'c++')
+        assert scheduler.score(free, 'c++') > scheduler.score(hidden, 'c++')
+
+    def test_request_budget_sends_only_top_functions(self, config, repo):
+        """With a budget of two requests only the two best functions go to AI."""
+        scheduler = AIScheduler(config, budget=2)
+        with patch.object(AIAnalyzer, 'analyze_functions',
+                          side_effect=lambda functions, language: ['"""AI doc."""'] * len(functions)) as analyze:
+            results = list(scheduler.run(self._results(config, repo)))
+
+        sent = [f.name for call in analyze.call_args_list for f in call.args[0]]
+        assert sorted(sent) == ['main', 'parse']
+        documentation = {name: doc for result in results for name, doc in result.documentation.items()}
+        assert documentation['parse'] == '"""AI doc."""'
+        assert documentation['main'] == '"""AI doc."""'
+        assert documentation['_helper'] != '"""AI doc."""'
+        assert scheduler.stats['documented'] == 2
+        assert scheduler.stats['fallback'] == 2
+        assert scheduler.stats['spent'] == 2
+
+    def test_token_budget_skips_functions_that_do_not_fit(self, config, repo):
+        """A token budget is spent on the best functions whose estimated cost fits."""
+        scheduler = AIScheduler(config, budget=0, unit='tokens')
+        candidates = scheduler._collect(self._results(config, repo))
+        costs = {c.function.name: scheduler._cost(c)[0] for c in candidates}
+
+        scheduler.budget = costs['parse'] + costs['_helper']
+        selected = [c.function.name for c in scheduler.select(candidates)]
+
+        assert selected[0] == 'parse'
+        assert sum(costs[name] for name in selected) <= scheduler.budget
+        assert 'main' not in selected or costs['main'] <= costs['_helper']
+
+    def test_zero_budget_uses_nltk_for_everything(self, config, repo):
+        """No AI request is made without a budget."""
+        scheduler = AIScheduler(config, budget=0)
+        with patch.object(AIAnalyzer, 'analyze_functions') as analyze:
+            results = list(scheduler.run(self._results(config, repo)))
+
+        analyze.assert_not_called()
+        assert all(result.documentation for result in results)
+        assert scheduler.stats['fallback'] == scheduler.stats['candidates'] == 4
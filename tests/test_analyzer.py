@@ -173,4 +173,123 @@ class TestIntelligentAnalyzer:
         result = analyzer._fill_template(template, function)
         
         assert "retrieves" in result.lower()
-        assert "key" in result.lower() 
\ No newline at end of file
+        assert "key" in result.lower()     
+    def test_analyze_functions_tags_batch_once(self, analyzer, monkeypatch):
+        """Batch analysis tags all identifiers in one NLTK call and matches per-function results."""
+        from code_doc_gen import nlp
+        
+        batches = []
+        
+        def pos_tag_sents(sentences):
+            batches.append(sentences)
+            return [[(word, 'VB' if word == 'get' else 'NN') for word in words] for words in sentences]
+        
+        monkeypatch.setattr(nlp.nltk, 'pos_tag_sents', pos_tag_sents)
+        monkeypatch.setattr(nlp.nltk, 'pos_tag', lambda words: pos_tag_sents([words])[0])
+        monkeypatch.setattr(nlp.nltk, 'word_tokenize', lambda text: text.split())
+        monkeypatch.setattr(nlp, '_tagger', nlp.IdentifierTagger())
+        
+        def make_functions():
+            return [
+                Function(name=f"get_value_{i}", return_type="int", parameters=[Parameter(name="key", type="str")])
+                for i in range(3)
+            ]
+        
+        batched = make_functions()
+        analyzer.analyze_functions(batched, "python")
+        
+        assert len(batches) == 1
+        
+        # Per-function analysis of the same names is served from the primed tags
+        single = make_functions()
+        for function in single:
+            analyzer.analyze_function(function, "python")
+            for parameter in function.parameters:
+                analyzer.analyze_parameter(parameter)
+        
+        assert len(batches) == 1
+        assert [f.brief_description for f in batched] == [f.brief_description for f in single]
+        assert [f.parameters[0].description for f in batched] == [f.parameters[0].description for f in single]
+    
+    def test_priming_covers_every_tagged_sequence(self, analyzer, monkeypatch):
+        """After batch analysis, no per-function lookup of the same names tags a single sequence."""
+        from code_doc_gen import nlp
+        
+        single_tags = []
+        
+        def pos_tag(words):
+            single_tags.append(list(words))
+            return [(word, 'NN') for word in words]
+        
+        monkeypatch.setattr(nlp.nltk, 'pos_tag_sents', lambda sentences: [pos_tag(words) for words in sentences])
+        monkeypatch.setattr(nlp.nltk, 'pos_tag', pos_tag)
+        monkeypatch.setattr(nlp.nltk, 'word_tokenize', lambda text: text.split())
+        monkeypatch.setattr(nlp, '_tagger', nlp.IdentifierTagger())
+        
+        functions = [
+            Function(name="getUserName", return_type="str", parameters=[Parameter(name="userId", type="int")]),
+            Function(name="save_record_2", return_type="bool", parameters=[Parameter(name="Record", type="dict")]),
+        ]
+        analyzer.analyze_functions(functions, "python")
+        single_tags.clear()
+        
+        for function in functions:
+            analyzer._parse_function_name(function.name)
+            analyzer._name_to_sentence(function.name)
+            analyzer._describe_return_type(function)
+            for parameter in function.parameters:
+                analyzer.analyze_parameter(parameter)
+        
+        assert single_tags == []
+    
+    def test_functions_documented_in_file_are_not_analyzed(self, analyzer):
+        """A doc comment above a recorded definition line keeps the function away from AI."""
+        from unittest.mock import Mock
+        
+        lines = [
+            "/**\n",
+            " * Loads a file.\n",
+            " */\n",
+            "function load(path) {\n",
+            "    return read(path);\n",
+            "}\n",
+            "\n",
+            "function save(path, data) {\n",
+            "    *buffer = data;\n",
+            "}\n",
+            "function close(path) {\n",
+            "    return path;\n",
+            "}\n",
+        ]
+        functions = [
+            Function(name=name, return_type="", parameters=[], source_code=lines[start - 1], line_number=start)
+            for name, start in (("load", 4), ("save", 8), ("close", 11))
+        ]
+        analyzer.ai_analyzer = Mock()
+        analyzer.ai_analyzer.analyze_functions.side_effect = lambda pending, language: ['/** AI */'] * len(pending)
+        
+        analyzer.analyze_functions(functions, "javascript", lines)
+        
+        sent = [f.name for f in analyzer.ai_analyzer.analyze_functions.call_args.args[0]]
+        assert sent == ["save", "close"]
+        assert [f.preceded_by_documentation for f in functions] == [True, False, False]
+        assert analyzer._is_documented(functions[0], "javascript")
+    
+    def test_identical_functions_share_one_analysis(self, analyzer):
+        """Functions with the same fingerprint are analyzed once and share the result."""
+        from unittest.mock import Mock
+        
+        source = "def load(path):\n    data = open(path).read()\n    return parse(data)\n"
+        copy = "def load(path):\n    text = open(path).read()  # vendored\n    return parse(text)\n"
+        functions = [
+            Function(name="load", return_type="dict", parameters=[Parameter(name="path", type="str")], source_code=code)
+            for code in (source, copy, source)
+        ]
+        analyzer.ai_analyzer = Mock()
+        analyzer.ai_analyzer.analyze_functions.side_effect = lambda pending, language: ['"""Loads a file."""'] * len(pending)
+        
+        analyzer.analyze_functions(functions, "python")
+        
+        assert len(analyzer.ai_analyzer.analyze_functions.call_args.args[0]) == 1
+        assert [f.brief_description for f in functions] == ['"""Loads a file."""'] * 3
+        assert analyzer.dedup_stats == {'functions': 3, 'duplicates': 2}
@@ -0,0 +1,250 @@
+"""
+Tests for the persistent parse cache.
+"""
+
+import time
+import pytest
+from pathlib import Path
+
+from code_doc_gen.cache import ParseCache, AIResponseCache, cache_directory
+from code_doc_gen.config import Config
+from code_doc_gen.models import Function, Parameter
+from code_doc_gen.scanner import RepositoryScanner
+
+
+class TestParseCache:
+    """Test cases for ParseCache."""
+    
+    @pytest.fixture
+    def config(self):
+        """Create a test configuration."""
+        return Config()
+    
+    @pytest.fixture
+    def source_file(self, tmp_path):
+        """Create a small Python source file."""
+        path = tmp_path / "sample.py"
+        path.write_text("def add(a: int, b: int) -> int:\n    return a + b\n")
+        return path
+    
+    def test_round_trip(self, config, source_file):
+        """Stored functions are returned on the next lookup."""
+        cache = ParseCache(config)
+        key = cache.make_key(source_file, "PythonParser", "python")
+        assert cache.get(key) is None
+        
+        cache.put(key, [Function(name="add", parameters=[Parameter("a", "int")], return_type="int",
+                                 brief_description="Adds numbers.")])
+        cached = cache.get(key)
+        
+        assert [f.name for f in cached] == ["add"]
+        assert cached[0].brief_description == "Adds numbers."
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+    
+    def test_cached_analysis_renders_the_same_documentation(self, config, tmp_path):
+        """Functions served from the cache document exactly like freshly analyzed ones."""
+        from code_doc_gen.generator import DocumentationGenerator
+        
+        sources = {
+            "python": ("tool.py", "class Tool:\n    def run(self, path: str, retries=3) -> bool:\n"
+                                  "        if not path:\n            raise ValueError(path)\n"
+                                  "        for _ in range(retries):\n            open(path).read()\n        return True\n"),
+            "c++": ("tool.cpp", "#include <string>\nint count_words(const std::string& text) {\n"
+                                "    int n = 0;\n    for (char c : text) { if (c == ' ') n++; }\n    return n + 1;\n}\n"),
+        }
+        generator = DocumentationGenerator(config)
+        for lang, (name, source) in sources.items():
+            path = tmp_path / name
+            path.write_text(source)
+            fresh = RepositoryScanner(config).parse_file(path, lang)
+            second_scanner = RepositoryScanner(config)
+            cached = second_scanner.parse_file(path, lang)
+            
+            assert second_scanner.cache.get_stats()["hits"] == 1
+            assert cached and [vars(f.body) for f in cached] == [vars(f.body) for f in fresh]
+            assert generator.generate_documentation(cached, lang) == generator.generate_documentation(fresh, lang)
+    
+    def test_untrusted_entries_are_misses(self, config, source_file, tmp_path):
+        """Entries that are not stored functions are ignored, and never executed."""
+        import os
+        import pickle
+        
+        marker = tmp_path / "executed"
+        
+        class Exploit:
+            def __reduce__(self):
+                return os.mkdir, (str(marker),)
+        
+        cache = ParseCache(config)
+        key = cache.make_key(source_file, "PythonParser", "python")
+        payloads = [
+            pickle.dumps([Exploit()]),
+            b'{"name": "add"}',
+            b'[{"name": "add"}]',
+            b'[[' * 100000 + b']]' * 100000,
+        ]
+        cache.put(key, [Function(name="add", parameters=[], return_type="int")])
+        stored = cache.get_bytes(key)
+        forged = stored.replace(b'"has_loops"', b'"get_behavior_description"')
+        assert forged != stored
+        payloads.append(forged)
+        
+        for payload in payloads:
+            cache.put_bytes(key, payload)
+            assert cache.get(key) is None
+        
+        assert not marker.exists()
+        assert cache.hits == 1  # the get_bytes above
+        assert cache.misses == len(payloads)
+    
+    def test_key_changes_with_content_parser_and_config(self, config, source_file):
+        """Keys depend on file content, parser type and effective configuration."""
+        cache = ParseCache(config)
+        key = cache.make_key(source_file, "PythonParser", "python")
+        
+        assert key != cache.make_key(source_file, "CppParser", "python")
+        
+        other_config = Config()
+        other_config.config["rules"] = []
+        assert key != ParseCache(other_config).make_key(source_file, "PythonParser", "python")
+        
+        source_file.write_text("def sub(a, b):\n    return a - b\n")
+        assert key != cache.make_key(source_file, "PythonParser", "python")
+    
+    def test_cache_settings_do_not_change_key(self, config, source_file):
+        """Cache-only settings do not invalidate existing entries."""
+        key = ParseCache(config).make_key(source_file, "PythonParser", "python")
+        config.config["cache"]["max_size_mb"] = 1
+        assert key == ParseCache(config).make_key(source_file, "PythonParser", "python")
+    
+    def test_request_settings_and_api_keys_do_not_change_key(self, config, source_file):
+        """AI transport settings are not hashed, and API keys only by whether they are set."""
+        def make_key():
+            return ParseCache(config).make_key(source_file, "PythonParser", "python")
+        
+        ai_config = config.config["ai"]
+        ai_config["groq_api_key"] = "gsk-first"
+        key = make_key()
+        ai_config["groq_api_key"] = "gsk-rotated"
+        ai_config["concurrency"] = 32
+        ai_config["max_retries"] = 9
+        ai_config["rate_limits"]["groq"]["requests_per_minute"] = 1
+        ai_config["health"]["failure_threshold"] = 10
+        ai_config["base_urls"]["groq"] = "http://localhost:8000"
+        ai_config["scheduling"]["public_weight"] = 0.0
+        assert make_key() == key
+        
+        ai_config["groq_api_key"] = ""
+        assert make_key() != key
+        ai_config["groq_api_key"] = "gsk-rotated"
+        ai_config["provider"] = "openai"
+        assert make_key() != key
+    
+    def test_eviction_respects_size_cap(self, config, tmp_path):
+        """Least recently used entries are evicted once the cap is exceeded."""
+        config.config["cache"]["max_size_mb"] = 0.01  # ~10 KB
+        cache = ParseCache(config)
+        big = "x" * 3000
+        for i in range(10):
+            cache.put(f"key-{i}", [Function(name=f"f{i}", parameters=[], return_type="int", source_code=big)])
+        
+        evicted = cache.evict()
+        
+        assert evicted > 0
+        assert cache.get("key-0") is None
+        assert cache.get("key-9") is not None
+    
+    def test_disabled_cache_is_inert(self, config, source_file):
+        """A disabled cache never stores or returns entries."""
+        config.config["cache"]["enabled"] = False
+        cache = ParseCache(config)
+        key = cache.make_key(source_file, "PythonParser", "python")
+        cache.put(key, [Function(name="add", parameters=[], return_type="int")])
+        
+        assert cache.get(key) is None
+        assert not Path(config.config["cache"]["directory"]).exists()
+    
+    def test_scanner_skips_parsing_on_hit(self, config, source_file, monkeypatch):
+        """Unchanged files are served from the cache without re-parsing."""
+        scanner = RepositoryScanner(config)
+        first = scanner.parse_file(source_file, "python")
+        
+        second_scanner = RepositoryScanner(config)
+        parser = second_scanner.parser_factory.get_parser("python")
+        monkeypatch.setattr(parser, "parse_file", lambda path: pytest.fail("file was re-parsed"))
+        second = second_scanner.parse_file(source_file, "python")
+        
+        assert [f.name for f in second] == [f.name for f in first]
+        assert second[0].brief_description == first[0].brief_description
+        assert second_scanner.cache.get_stats()["hits"] == 1
+    
+    def test_cache_lives_in_the_repository(self, tmp_path, monkeypatch):
+        """A relative cache directory is resolved against the repository, not the working directory."""
+        from code_doc_gen import generate_docs
+        
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        (repo / "sample.py").write_text("def add(a, b):\n    return a + b\n")
+        elsewhere = tmp_path / "elsewhere"
+        elsewhere.mkdir()
+        monkeypatch.chdir(elsewhere)
+        monkeypatch.setitem(Config.DEFAULT_CONFIG["cache"], "directory", ".codedocgen-cache")
+        
+        generate_docs(repo, lang="python")
+        
+        assert (repo / ".codedocgen-cache" / "parse_cache.sqlite3").exists()
+        assert not (elsewhere / ".codedocgen-cache").exists()
+        assert cache_directory(Config(), repo) == repo / ".codedocgen-cache"
+        config = Config()
+        config.config["cache"]["directory"] = str(tmp_path / "shared")
+        assert cache_directory(config, repo) == tmp_path / "shared"
+
+
+class TestAIResponseCache:
+    """Test cases for AIResponseCache."""
+    
+    @pytest.fixture
+    def config(self):
+        """Create a test configuration."""
+        return Config()
+    
+    def test_round_trip(self, config):
+        """Stored responses are returned on the next lookup."""
+        cache = AIResponseCache(config)
+        key = AIResponseCache.make_key("groq", ["llama3-8b-8192"], 1, "Document add()")
+        assert cache.get(key) is None
+        
+        cache.put(key, '"""Adds numbers."""')
+        
+        assert AIResponseCache(config).get(key) == '"""Adds numbers."""'
+    
+    def test_key_depends_on_provider_model_version_and_prompt(self):
+        """Every key component changes the key."""
+        key = AIResponseCache.make_key("groq", "m", 1, "p")
+        
+        assert key != AIResponseCache.make_key("openai", "m", 1, "p")
+        assert key != AIResponseCache.make_key("groq", "n", 1, "p")
+        assert key != AIResponseCache.make_key("groq", "m", 2, "p")
+        assert key != AIResponseCache.make_key("groq", "m", 1, "q")
+    
+    def test_expired_entries_are_misses(self, config, monkeypatch):
+        """Entries older than the TTL are dropped on lookup and on eviction."""
+        config.config["cache"]["ai"]["ttl_hours"] = 1
+        cache = AIResponseCache(config)
+        cache.put("old", "response")
+        cache.put("older", "response")
+        
+        later = time.time() + 2 * 3600
+        monkeypatch.setattr(time, "time", lambda: later)
+        
+        assert cache.get("old") is None
+        assert cache.evict() == 1
+    
+    def test_no_ai_cache_setting(self, config):
+        """A disabled AI cache stores nothing."""
+        config.config["cache"]["ai"]["enabled"] = False
+        cache = AIResponseCache(config)
+        cache.put("key", "response")
+        
+        assert cache.get("key") is None
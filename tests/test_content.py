@@ -0,0 +1,82 @@
+"""
+Tests for the per-run content store.
+"""
+
+import pytest
+
+from code_doc_gen.config import Config
+from code_doc_gen.content import ContentStore, FileContent
+from code_doc_gen.scanner import RepositoryScanner
+from code_doc_gen.generator import DocumentationGenerator
+
+
+class TestContentStore:
+    """Test cases for FileContent and ContentStore."""
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        """Create a Python file with mixed line endings."""
+        path = tmp_path / "mixed.py"
+        path.write_bytes(b"def first(a):\r\n    return a\r\n\rdef second(b):\n    return b")
+        return path
+
+    def test_views_match_text_mode_reads(self, source):
+        """Text and lines are what a text-mode read and readlines() return."""
+        content = FileContent.read(source)
+
+        with open(source, 'r', encoding='utf-8') as f:
+            assert content.text == f.read()
+        with open(source, 'r', encoding='utf-8') as f:
+            assert content.lines == f.readlines()
+        assert content.line_index.line_of(content.text.index('second')) == 4
+        assert content.size == source.stat().st_size
+
+    def test_large_files_are_memory_mapped(self, source):
+        """Files from the threshold up are mapped; the views outlive the mapping."""
+        content = FileContent.read(source, mmap_threshold=16)
+        assert content.mapped
+        text = content.text
+        content.close()
+        assert content.text == text
+        assert not FileContent.read(source).mapped
+
+    def test_each_file_is_read_once_until_released(self, source):
+        """Repeated gets share one read; a released file is read again."""
+        store = ContentStore()
+
+        first = store.get(source)
+        assert store.get(str(source)) is first
+        assert store.stats['reads'] == 1
+        assert store.stats['hits'] == 1
+        assert store.stats['bytes_read'] == source.stat().st_size
+
+        store.release(source)
+        assert len(store) == 0
+        assert store.get(source) is not first
+        assert store.stats['reads'] == 2
+
+    def test_parse_and_diff_share_one_read(self, source):
+        """The parse cache, the parser and the diff all use the same content."""
+        config = Config()
+        config.config['ai']['enabled'] = False
+        config.config['cache']['enabled'] = True
+        config.config['cache']['directory'] = str(source.parent / "cache")
+        store = ContentStore()
+        scanner = RepositoryScanner(config, store)
+        generator = DocumentationGenerator(config, store)
+
+        functions = scanner.parse_file(source, 'python')
+        documentation = generator.generate_documentation(functions, 'python')
+        diff = generator.generate_diff(source, documentation, 'python', functions)
+
+        assert [f.name for f in functions] == ['first', 'second']
+        assert '+++' in diff
+        assert store.stats['reads'] == 1
+
+    def test_scanner_without_store_releases_after_parsing(self, source):
+        """A scanner with its own store holds no file once it is parsed."""
+        scanner = RepositoryScanner(Config())
+
+        assert scanner.parse_file(source, 'python')
+        assert len(scanner.content) == 0
+        assert scanner.content.stats['released'] == 1
@@ -0,0 +1,58 @@
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from code_doc_gen.config import Config
+from code_doc_gen.parsers.cpp_parser import CppParser, CLANG_AVAILABLE
+
+
+@pytest.mark.skipif(CLANG_AVAILABLE, reason="exercises the regex fallback used without libclang")
+def test_cpp_regex_parser_function_spans(tmp_path: Path):
+    src = tmp_path / "math.cpp"
+    text = textwrap.dedent(
+        """
+        #include <string>
+
+        static int clamp(int value, int low, int high) {
+            if (value < low) { return low; }
+            return value > high ? high : value;
+        }
+
+        std::string label(const std::string& name) {
+            return "{" + name + "}";
+        }
+        """
+    )
+    src.write_text(text)
+    functions = {f.name: f for f in CppParser(Config()).parse_file(src).functions}
+
+    clamp = functions["clamp"]
+    assert (clamp.line_number, clamp.end_line) == (4, 7)
+    assert text[clamp.start_offset:clamp.end_offset].startswith("static int clamp(")
+    assert text[clamp.start_offset:clamp.end_offset].endswith("return value > high ? high : value;\n}")
+
+    label = functions["label"]
+    assert (label.line_number, label.end_line) == (9, 11)
+
+
+def test_cpp_regex_return_type_stops_at_directives_and_lines():
+    text = textwrap.dedent(
+        """
+        #include <vector>
+        #define LIMIT 10
+
+        int total(const std::vector<int>& values) {
+            return 0;
+        }
+        // helpers
+        static std::map<int, int> index_of(int count) {
+            return {};
+        }
+        """
+    )
+    functions = {f.name: f for f in CppParser(Config())._extract_functions_regex(text)}
+
+    assert functions["total"].return_type == "int"
+    assert functions["index_of"].return_type == "static std::map<int, int>"
+    assert functions["total"].line_number == 5
@@ -0,0 +1,58 @@
+"""
+Tests for function fingerprints.
+"""
+
+from code_doc_gen.fingerprint import fingerprint_function, normalize_source
+from code_doc_gen.models import Function, Parameter
+
+
+def make_function(source, name="total", language_params=("items",)):
+    return Function(name=name, parameters=[Parameter(p, "list") for p in language_params],
+                    return_type="int", source_code=source)
+
+
+class TestFingerprint:
+    """Test cases for fingerprint_function."""
+
+    def test_python_ignores_locals_comments_and_formatting(self):
+        """Renamed locals, comments, docstrings and layout do not change the fingerprint."""
+        original = make_function(
+            "def total(items):\n"
+            "    result = 0\n"
+            "    for item in items:\n"
+            "        result += item\n"
+            "    return result\n"
+        )
+        copy = make_function(
+            "    def total(items):\n"
+            "        \"\"\"Vendored helper.\"\"\"\n"
+            "        acc = 0  # running sum\n"
+            "        for x in items:\n"
+            "            acc +=   x\n"
+            "\n"
+            "        return acc\n"
+        )
+
+        assert fingerprint_function(original, "python") == fingerprint_function(copy, "python")
+
+    def test_python_body_and_signature_matter(self):
+        """Different operations, names or parameters give different fingerprints."""
+        base = make_function("def total(items):\n    return sum(items)\n")
+        other_body = make_function("def total(items):\n    return max(items)\n")
+        other_name = make_function("def grand_total(items):\n    return sum(items)\n", name="grand_total")
+        other_params = make_function("def total(values):\n    return sum(values)\n", language_params=("values",))
+
+        fingerprints = {fingerprint_function(f, "python") for f in (base, other_body, other_name, other_params)}
+
+        assert len(fingerprints) == 4
+
+    def test_c_family_strips_comments_and_whitespace(self):
+        """For other languages comments and whitespace are dropped."""
+        a = "int total(int n) {\n  // sum\n  return n + 1;\n}"
+        b = "int total(int n)\n{\n    /* vendored */ return n   + 1;\n}"
+
+        assert normalize_source(a, "c++") == normalize_source(b, "c++")
+
+    def test_no_source_no_fingerprint(self):
+        """Functions without source code are never treated as duplicates."""
+        assert fingerprint_function(make_function(""), "java") is None
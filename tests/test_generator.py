@@ -643,4 +643,86 @@ def no_comment_func():
         # Check that diff contains expected content
         assert "---" in diff
         assert "+++" in diff
-        assert "\\brief" in diff 
\ No newline at end of file
+        assert "\\brief" in diff 
+    
+    def test_insert_documentation_single_pass(self, generator):
+        """Every function is documented once, at its definition, in one pass over the file."""
+        lines = [
+            "int helper(int x);\n",
+            "\n",
+            "int Widget::size() const {\n",
+            "    return helper(count_);\n",
+            "}\n",
+            "\n",
+            "/** Already documented. */\n",
+            "int helper(int x) {\n",
+            "    return x;\n",
+            "}\n",
+            "\n",
+            "int main() {\n",
+            "    return helper(1);\n",
+            "}\n",
+        ]
+        documentation = {
+            "main": "/** main */",
+            "Widget::size": "/** size */",
+            "helper": "/** helper */",
+        }
+        
+        result = generator._insert_documentation(lines, documentation, "c++")
+        
+        assert result.count("/** helper */\n") == 1
+        assert result[result.index("int Widget::size() const {\n") - 1] == "/** size */\n"
+        assert result[result.index("int main() {\n") - 1] == "/** main */\n"
+        assert len(result) == len(lines) + 3
+    
+    def test_insert_documentation_at_recorded_locations(self, generator):
+        """Recorded definition lines are used directly, without matching signatures."""
+        lines = [
+            "class Shape:\n",
+            "    def area(self):\n",
+            "        return 0\n",
+            "\n",
+            "    # area of the square\n",
+            "    def area(self):\n",
+            "        return self.side ** 2\n",
+        ]
+        documentation = {"Shape.area": '"""\nArea of the shape.\n"""'}
+        
+        result = generator._insert_documentation(lines, documentation, "python", {"Shape.area": 5})
+        
+        assert result[:5] == lines[:5]
+        assert result[5:8] == ['    """\n', '    Area of the shape.\n', '    """\n']
+        assert result[8:] == lines[5:]
+    
+    def test_apply_documentation_inplace_uses_parsed_lines(self, generator, tmp_path):
+        """Parsed line numbers place documentation at the definition, not an earlier prototype."""
+        source = tmp_path / "clamp.cpp"
+        source.write_text(
+            "int clamp(int value);\n"
+            "\n"
+            "int clamp(int value) {\n"
+            "    return value;\n"
+            "}\n"
+        )
+        clamp = Function(name="clamp", return_type="int", parameters=[], line_number=3, end_line=5)
+        
+        generator.apply_documentation_inplace(source, {"clamp": "/** Clamps a value. */"}, "c++", [clamp])
+        
+        assert source.read_text().splitlines()[:4] == [
+            "int clamp(int value);",
+            "",
+            "/** Clamps a value. */",
+            "int clamp(int value) {",
+        ]
+    
+    def test_generate_diff_ignores_stale_line_numbers(self, generator, tmp_path):
+        """A recorded line that no longer names the function falls back to signature matching."""
+        source = tmp_path / "module.py"
+        source.write_text("import os\n\ndef add(a, b):\n    return a + b\n")
+        stale = Function(name="add", return_type="", parameters=[], line_number=1, end_line=2)
+        
+        diff = generator.generate_diff(source, {"add": '"""Adds."""'}, "python", [stale])
+        
+        assert '+"""Adds."""' in diff
+        assert diff.index('+"""Adds."""') > diff.index(" import os")
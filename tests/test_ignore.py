@@ -0,0 +1,116 @@
+"""
+Tests for the ignore engine.
+"""
+
+import pytest
+from pathlib import Path
+
+from code_doc_gen.config import Config
+from code_doc_gen.ignore import IgnoreMatcher, GitignoreRules
+from code_doc_gen.scanner import RepositoryScanner
+
+
+class TestGitignoreRules:
+    """Test cases for .gitignore pattern semantics."""
+
+    def test_unanchored_pattern_matches_at_any_depth(self):
+        """A pattern without a slash matches the name in every directory."""
+        rules = GitignoreRules(["*.log\n"])
+
+        assert rules.match("debug.log", False) is True
+        assert rules.match("a/b/debug.log", False) is True
+        assert rules.match("debug.logs", False) is None
+
+    def test_anchored_pattern(self):
+        """A leading or inner slash anchors the pattern to the .gitignore directory."""
+        rules = GitignoreRules(["/generated.py", "docs/*.py"])
+
+        assert rules.match("generated.py", False) is True
+        assert rules.match("src/generated.py", False) is None
+        assert rules.match("docs/conf.py", False) is True
+        assert rules.match("docs/api/conf.py", False) is None
+
+    def test_directory_only_pattern(self):
+        """A trailing slash only matches directories."""
+        rules = GitignoreRules(["out/"])
+
+        assert rules.match("out", True) is True
+        assert rules.match("out", False) is None
+
+    def test_negation_last_rule_wins(self):
+        """A later negated rule re-includes a path."""
+        rules = GitignoreRules(["*.py", "!keep.py", "# comment", ""])
+
+        assert rules.match("drop.py", False) is True
+        assert rules.match("keep.py", False) is False
+
+    def test_double_star(self):
+        """Double stars match any number of directories."""
+        rules = GitignoreRules(["**/fixtures/*.py", "gen/**"])
+
+        assert rules.match("fixtures/a.py", False) is True
+        assert rules.match("tests/unit/fixtures/a.py", False) is True
+        assert rules.match("gen/x/y.py", False) is True
+
+
+class TestIgnoreMatcher:
+    """Test cases for IgnoreMatcher."""
+
+    @pytest.fixture
+    def config(self):
+        """Create a test configuration."""
+        return Config()
+
+    def test_config_globs(self, config, tmp_path):
+        """Configured globs apply to files and prune whole directories."""
+        matcher = IgnoreMatcher.from_config(config, tmp_path)
+
+        assert matcher.is_ignored_file("module.pyc")
+        assert matcher.is_ignored_dir("src/bin")
+        assert not matcher.is_ignored_file("src/binary.py")
+        assert not matcher.is_ignored_file("rebuild.py")
+
+    def test_ignored_directory_names(self, config, tmp_path):
+        """Known directory names are pruned by name."""
+        matcher = IgnoreMatcher.from_config(config, tmp_path)
+
+        assert matcher.is_ignored_dir("node_modules")
+        assert matcher.is_ignored_dir("src/.git")
+        assert not matcher.is_ignored_dir("src/environment")
+
+    def test_nested_gitignore(self, config, tmp_path):
+        """Nested .gitignore files apply relative to their own directory."""
+        (tmp_path / ".gitignore").write_text("*.gen.py\n")
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / ".gitignore").write_text("/local.py\n!keep.gen.py\n")
+        matcher = IgnoreMatcher.from_config(config, tmp_path)
+
+        assert matcher.is_ignored_file("a.gen.py")
+        assert matcher.is_ignored_file("pkg/local.py")
+        assert not matcher.is_ignored_file("local.py")
+        assert not matcher.is_ignored_file("pkg/keep.gen.py")
+
+    def test_gitignore_can_be_disabled(self, config, tmp_path):
+        """respect_gitignore turns .gitignore handling off."""
+        (tmp_path / ".gitignore").write_text("*.py\n")
+        config.config['respect_gitignore'] = False
+
+        assert not IgnoreMatcher.from_config(config, tmp_path).is_ignored_file("a.py")
+
+    def test_config_should_ignore_file(self, config, tmp_path):
+        """Config.should_ignore_file checks every parent directory below the root."""
+        assert config.should_ignore_file(tmp_path / "node_modules" / "lib" / "index.js", tmp_path)
+        assert config.should_ignore_file(Path("src/__pycache__/mod.py"), tmp_path)
+        assert not config.should_ignore_file(tmp_path / "src" / "main.py", tmp_path)
+
+    def test_scanner_honors_gitignore(self, config, tmp_path):
+        """Repository discovery skips gitignored files and directories."""
+        (tmp_path / ".gitignore").write_text("generated/\nskip_*.py\n")
+        (tmp_path / "generated").mkdir()
+        (tmp_path / "generated" / "out.py").write_text("def out():\n    pass\n")
+        (tmp_path / "skip_me.py").write_text("def skip():\n    pass\n")
+        (tmp_path / "main.py").write_text("def main():\n    pass\n")
+
+        found = [p.name for p in RepositoryScanner(config).iter_repository(tmp_path)]
+
+        assert found == ["main.py"]
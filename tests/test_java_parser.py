@@ -23,6 +23,31 @@ def test_java_parser_methods(tmp_path: Path):
     assert names == ["greet", "mul"]
 
 
+def test_java_parser_method_spans(tmp_path: Path):
+    src = tmp_path / "Spans.java"
+    text = textwrap.dedent(
+        """
+        public class Spans {
+            public int first(int a) {
+                if (a > 0) { return a; }
+                return -a;
+            }
+
+            public String second() { return "}"; }
+        }
+        """
+    )
+    src.write_text(text)
+    functions = {f.name: f for f in JavaParser(Config()).parse_file(src).functions}
+
+    first = functions["first"]
+    assert (first.line_number, first.end_line) == (3, 6)
+    assert text[first.start_offset:first.end_offset] == (
+        "    public int first(int a) {\n        if (a > 0) { return a; }\n        return -a;\n    }"
+    )
+    assert functions["second"].line_number == functions["second"].end_line == 8
+
+
 def test_java_generator_inserts_javadoc(tmp_path: Path):
     src = tmp_path / "S.java"
     src.write_text(textwrap.dedent(
@@ -46,3 +46,51 @@ def test_js_generator_inserts_jsdoc(tmp_path: Path):
     # Ensure no double blank line before @param
     assert "*\n\n * @param" not in out
 
+
+
+def test_js_parser_function_spans(tmp_path: Path):
+    src = tmp_path / "d.js"
+    text = textwrap.dedent(
+        """
+        /** Header with a brace { */
+        function outer(a, b) {
+          const s = `value ${a + `${b}`} and }`;
+          const re = /[}]+\\//g;
+          if (a) { return { x: '}' }; }
+          return s;
+        }
+
+        const inc = (x) => x + 1;
+        """
+    )
+    src.write_text(text)
+    functions = {f.name: f for f in JavaScriptParser(Config()).parse_file(src).functions}
+
+    outer = functions["outer"]
+    assert outer.source_code.startswith("function outer(a, b) {")
+    assert outer.source_code.endswith("  return s;\n}")
+    assert text[outer.start_offset:outer.end_offset] == outer.source_code
+    assert (outer.line_number, outer.end_line) == (3, 8)
+    assert functions["inc"].source_code == "const inc = (x) => x + 1;"
+    assert functions["inc"].line_number == functions["inc"].end_line == 10
+
+
+def test_js_parser_class_methods_skip_control_statements(tmp_path: Path):
+    src = tmp_path / "e.js"
+    src.write_text(textwrap.dedent(
+        """
+        class Widget extends Base {
+          render(data) {
+            if (data) {
+              for (const d of data) { this.draw(d); }
+            }
+            return this;
+          }
+          static create() { return new Widget(); }
+        }
+        """
+    ))
+    functions = JavaScriptParser(Config()).parse_file(src).functions
+
+    assert [(f.class_name, f.name) for f in functions] == [("Widget", "render"), ("Widget", "create")]
+    assert functions[0].source_code.strip().endswith("return this;\n  }")
@@ -0,0 +1,79 @@
+"""
+Tests for the local mock AI provider.
+"""
+
+import time
+
+import openai
+import pytest
+
+from code_doc_gen.ai_engine import get_retry_after
+from code_doc_gen.mock_provider import MockProviderServer
+from code_doc_gen.ai_analyzer import AIAnalyzer
+from code_doc_gen.config import Config
+from code_doc_gen.models import Function
+
+
+@pytest.fixture
+def server():
+    with MockProviderServer(latency_ms=0, responses=['Adds two numbers.', 'Returns the sum.']) as server:
+        yield server
+
+
+class TestMockProviderServer:
+    """Test cases for MockProviderServer."""
+
+    @pytest.mark.parametrize('provider', ['groq', 'openai'])
+    def test_analyzer_talks_to_mock(self, server, provider):
+        """Test that both SDK clients reach the mock through ai.base_urls."""
+        config = Config()
+        config.config['ai'].update({
+            'enabled': True, 'provider': provider, f'{provider}_api_key': 'mock-key',
+            'base_urls': {provider: server.base_url(provider)}, 'models': {'groq': ['mock'], 'openai': 'mock'},
+        })
+        analyzer = AIAnalyzer(config)
+
+        call = analyzer._call_groq if provider == 'groq' else analyzer._call_openai
+        assert call("p1") == 'Adds two numbers.'
+        assert server.stats['completed'] == 1
+
+    def test_injected_rate_limit(self, server):
+        """Test that an injected 429 carries a Retry-After the analyzer honors."""
+        server.rate_limit_rate = 1.0
+        server.retry_after = 2.5
+        client = openai.OpenAI(api_key='mock-key', base_url=server.base_url('openai'), max_retries=0)
+
+        with pytest.raises(openai.RateLimitError) as error:
+            client.chat.completions.create(model='mock', messages=[{'role': 'user', 'content': 'p'}])
+
+        assert get_retry_after(error.value) == 2.5
+        assert server.stats == {'requests': 1, 'completed': 0, 'errors': 0, 'rate_limited': 1, 'completion_tokens': 0}
+
+    def test_canned_responses_round_robin(self, server):
+        """Test that canned responses are served in turn."""
+        client = openai.OpenAI(api_key='mock-key', base_url=server.base_url('openai'), max_retries=0)
+
+        contents = [
+            client.chat.completions.create(model='mock', messages=[{'role': 'user', 'content': 'p'}]).choices[0].message.content
+            for _ in range(3)
+        ]
+
+        assert contents == ['Adds two numbers.', 'Returns the sum.', 'Adds two numbers.']
+
+    def test_streaming_stops_after_comment(self):
+        """Test that a streamed response is cut off, and no longer generated, after the docstring."""
+        chatter = ' '.join(['This docstring describes the function in more detail.'] * 20)
+        response = f'"""\nAdds two numbers.\n"""\n\n{chatter}'
+        config = Config()
+        config.config['ai'].update({
+            'enabled': True, 'provider': 'openai', 'openai_api_key': 'mock-key', 'streaming': True,
+            'models': {'openai': 'mock'},
+        })
+        with MockProviderServer(latency_ms=0, token_ms=5, responses=[response]) as server:
+            config.config['ai']['base_urls'] = {'openai': server.base_url('openai')}
+            analyzer = AIAnalyzer(config)
+            function = Function(name="add", parameters=[], return_type="int", source_code="return a + b")
+            
+            assert analyzer.analyze_function(function, "python") == '"""\nAdds two numbers.\n"""'
+            time.sleep(0.05)
+            assert server.stats['completion_tokens'] < 20
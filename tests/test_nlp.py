@@ -0,0 +1,93 @@
+"""
+Tests for the shared NLTK tagger.
+"""
+
+import pytest
+
+from code_doc_gen import nlp
+from code_doc_gen.nlp import IdentifierTagger
+
+
+class TestIdentifierTagger:
+    """Test cases for IdentifierTagger."""
+
+    @pytest.fixture
+    def fake_pos_tag(self, monkeypatch):
+        """Replace nltk.pos_tag with a counting stand-in."""
+        calls = []
+
+        def pos_tag(words):
+            calls.append(list(words))
+            return [(word, 'VB' if word == 'get' else 'NN') for word in words]
+
+        monkeypatch.setattr(nlp.nltk, 'pos_tag', pos_tag)
+        return calls
+
+    def test_tag_is_memoized(self, fake_pos_tag):
+        """Repeated identifiers are tagged by NLTK only once."""
+        tagger = IdentifierTagger()
+
+        first = tagger.tag(['get', 'value'])
+        second = tagger.tag(('get', 'value'))
+
+        assert first == second == (('get', 'VB'), ('value', 'NN'))
+        assert fake_pos_tag == [['get', 'value']]
+        assert tagger.get_stats()['hits'] == 1
+
+    def test_lru_eviction(self, fake_pos_tag):
+        """The least recently used entry is dropped when the table is full."""
+        tagger = IdentifierTagger(max_entries=2)
+
+        tagger.tag(['a'])
+        tagger.tag(['b'])
+        tagger.tag(['a'])
+        tagger.tag(['c'])
+        tagger.tag(['a'])
+        tagger.tag(['b'])
+
+        assert fake_pos_tag == [['a'], ['b'], ['c'], ['b']]
+
+    def test_missing_data_fails_fast(self, monkeypatch):
+        """After NLTK reports missing data, later calls raise without calling NLTK again."""
+        calls = []
+
+        def word_tokenize(text):
+            calls.append(text)
+            raise LookupError("punkt not found")
+
+        monkeypatch.setattr(nlp.nltk, 'word_tokenize', word_tokenize)
+        tagger = IdentifierTagger()
+
+        for text in ['get value', 'set value']:
+            with pytest.raises(LookupError, match="punkt not found"):
+                tagger.tokenize(text)
+
+        assert calls == ['get value']
+
+    def test_module_functions_share_one_tagger(self, fake_pos_tag, monkeypatch):
+        """tag_identifier goes through the process-wide tagger."""
+        monkeypatch.setattr(nlp, '_tagger', None)
+        assert nlp.get_tagger() is nlp.get_tagger()
+
+        nlp.tag_identifier(['get', 'shared', 'value'])
+        nlp.tag_identifier(['get', 'shared', 'value'])
+
+        assert fake_pos_tag.count(['get', 'shared', 'value']) == 1
+
+    def test_tag_sents_tags_misses_in_one_call(self, fake_pos_tag, monkeypatch):
+        """Only distinct, uncached sequences are sent to pos_tag_sents, in one call."""
+        batches = []
+
+        def pos_tag_sents(sentences):
+            batches.append(sentences)
+            return [[(word, 'NN') for word in words] for words in sentences]
+
+        monkeypatch.setattr(nlp.nltk, 'pos_tag_sents', pos_tag_sents)
+        tagger = IdentifierTagger()
+        tagger.tag(['get', 'value'])
+
+        results = tagger.tag_sents([['get', 'value'], ['set', 'value'], ['set', 'value']])
+
+        assert batches == [[['set', 'value']]]
+        assert results[0] == (('get', 'VB'), ('value', 'NN'))
+        assert results[1] == results[2] == (('set', 'NN'), ('value', 'NN'))
@@ -0,0 +1,97 @@
+"""
+Tests for the pipelined documentation run.
+"""
+
+import pytest
+from pathlib import Path
+
+from code_doc_gen.config import Config
+from code_doc_gen.pipeline import DocumentationPipeline
+
+
+class TestDocumentationPipeline:
+    """Test cases for DocumentationPipeline."""
+
+    @pytest.fixture
+    def config(self):
+        """Create a test configuration."""
+        return Config()
+
+    @pytest.fixture
+    def python_files(self, tmp_path):
+        """Create a few small Python files."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"module_{i}.py"
+            path.write_text(f"def func_{i}(value: int) -> int:\n    return value + {i}\n")
+            paths.append(path)
+        return paths
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_run_documents_every_file(self, config, python_files, jobs):
+        """Every discovered file comes out of the write end with documentation."""
+        pipeline = DocumentationPipeline(config, jobs=jobs, queue_size=2)
+        results = {result.file_path: result for result in pipeline.run(iter(python_files))}
+
+        assert set(results) == set(python_files)
+        for i, path in enumerate(python_files):
+            assert results[path].language == 'python'
+            assert [f.name for f in results[path].functions] == [f"func_{i}"]
+            assert f"func_{i}" in results[path].documentation
+        assert pipeline.stats['discovered'] == len(python_files)
+        assert pipeline.stats['parsed'] == len(python_files)
+
+    def test_run_reports_cache_hits(self, config, python_files):
+        """A second run over unchanged files is served from the parse cache."""
+        list(DocumentationPipeline(config, jobs=1).run(python_files))
+
+        pipeline = DocumentationPipeline(config, jobs=1)
+        list(pipeline.run(python_files))
+
+        assert pipeline.stats['cache_hits'] == len(python_files)
+
+    def test_in_process_run_closes_parse_cache(self, config, python_files, monkeypatch):
+        """Without worker processes, the parse cache is closed when the run ends or is abandoned."""
+        from code_doc_gen.cache import ParseCache
+
+        closed = []
+        close = ParseCache.close
+        monkeypatch.setattr(ParseCache, 'close', lambda cache: (closed.append(cache), close(cache)))
+
+        list(DocumentationPipeline(config, jobs=1).run(python_files))
+        assert len(closed) == 1
+
+        results = DocumentationPipeline(config, jobs=1, queue_size=1).run(python_files)
+        next(results)
+        results.close()
+        assert len(closed) == 2
+
+    def test_run_propagates_discovery_errors(self, config, python_files):
+        """A failing discovery stage stops the pipeline and re-raises."""
+        def broken_discovery():
+            yield python_files[0]
+            raise OSError("disk went away")
+
+        pipeline = DocumentationPipeline(config, jobs=1)
+        with pytest.raises(OSError, match="disk went away"):
+            list(pipeline.run(broken_discovery()))
+
+    def test_run_can_be_abandoned(self, config, python_files):
+        """Closing the result iterator early shuts all stages down."""
+        pipeline = DocumentationPipeline(config, jobs=2, queue_size=1)
+        results = pipeline.run(python_files)
+        next(results)
+        results.close()
+
+        assert pipeline.stats['discovered'] <= len(python_files)
+
+    def test_unknown_extension_has_no_language(self, config, tmp_path):
+        """Files without a known extension are passed through undocumented."""
+        path = tmp_path / "script.txt"
+        path.write_text("def helper():\n    pass\n")
+
+        results = list(DocumentationPipeline(config, jobs=1).run([Path(path)]))
+
+        assert len(results) == 1
+        assert results[0].language is None
+        assert results[0].documentation == {}
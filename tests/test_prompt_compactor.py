@@ -0,0 +1,73 @@
+"""
+Tests for prompt compaction.
+"""
+
+from code_doc_gen.ai_engine import estimate_tokens
+from code_doc_gen.prompt_compactor import PromptCompactor, strip_comments
+
+
+class TestPromptCompactor:
+    """Test cases for PromptCompactor."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.compactor = PromptCompactor()
+    
+    def test_strip_comments_keeps_strings(self):
+        """Comment markers inside string literals are not comments."""
+        python = 'x = "# kept"  # dropped\n# dropped\ny = 1\n'
+        java = 'String s = "//kept"; // dropped\n/* dropped\n */ int y = 1;\n'
+        
+        assert strip_comments(python, "python") == 'x = "# kept"  \n\ny = 1\n'
+        assert strip_comments(java, "java") == 'String s = "//kept"; \n\n int y = 1;\n'
+    
+    def test_blank_lines_and_comments_removed(self):
+        """Short bodies only lose comments and blank lines."""
+        body = "    # add the numbers\n\n    total = a + b\n\n    return total  # done\n"
+        
+        assert self.compactor.compact(body, "python", 500) == "    total = a + b\n    return total"
+    
+    def test_literal_tables_collapsed(self):
+        """Runs of literal-only lines keep their first rows."""
+        rows = "\n".join(f"        {i}, {i * 2}, {i * 3}," for i in range(50))
+        body = f"    table = [\n{rows}\n    ]\n    return table[n]\n"
+        
+        compacted = self.compactor.compact(body, "python")
+        
+        assert "(48 more rows)" in compacted
+        assert compacted.endswith("    ]\n    return table[n]")
+    
+    def test_closing_braces_are_not_a_table(self):
+        """Lines without literal values are never collapsed."""
+        body = "if (a) {\n  if (b) {\n    if (c) {\n      x();\n    }\n  }\n}\n}"
+        
+        assert self.compactor.compact(body, "java") == body
+    
+    def test_long_body_keeps_control_flow_within_budget(self):
+        """Over-budget bodies are reduced to their control-flow skeleton."""
+        statements = "\n".join(f"        value_{i} = compute_something(value_{i - 1}, {i})" for i in range(1, 80))
+        body = (
+            "    result = []\n"
+            "    for item in items:\n"
+            f"{statements}\n"
+            "        if value_79 > limit:\n"
+            "            raise ValueError('too large')\n"
+            "    return result\n"
+        )
+        
+        compacted = self.compactor.compact(body, "python", 100)
+        
+        assert estimate_tokens(compacted) <= 100
+        assert "    for item in items:" in compacted
+        assert "raise ValueError('too large')" in compacted
+        assert compacted.endswith("    return result")
+    
+    def test_tiny_budget_keeps_head_and_tail(self):
+        """When even the skeleton is too long, both ends are kept."""
+        body = "\n".join(f"if x{i}:\n    return {i}" for i in range(100))
+        
+        compacted = self.compactor.compact(body, "python", 20)
+        
+        assert estimate_tokens(compacted) <= 20
+        assert compacted.startswith("if x0:")
+        assert compacted.endswith("    return 99")
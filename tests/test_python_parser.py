@@ -0,0 +1,41 @@
+import textwrap
+from pathlib import Path
+
+from code_doc_gen.config import Config
+from code_doc_gen.parsers.python_parser import PythonParser
+
+
+def test_python_parser_function_spans(tmp_path: Path):
+    src = tmp_path / "shapes.py"
+    text = textwrap.dedent(
+        '''
+        class Square:
+            def __init__(self, side):
+                self.side = side
+
+            @property
+            def area(self):
+                return self.side ** 2
+
+
+        def describe(shape):
+            """Already documented."""
+            return f"{shape.area}"
+        '''
+    )
+    src.write_text(text)
+    functions = {f.name: f for f in PythonParser(Config()).parse_file(src).functions}
+
+    init = functions["__init__"]
+    assert (init.line_number, init.end_line) == (3, 4)
+    assert init.source_code == "    def __init__(self, side):\n        self.side = side"
+    assert text[init.start_offset:init.end_offset] == init.source_code
+
+    # A method's source ends with the method, not at the next top-level statement
+    area = functions["area"]
+    assert (area.line_number, area.end_line) == (7, 8)
+    assert "describe" not in area.source_code
+
+    describe = functions["describe"]
+    assert (describe.line_number, describe.end_line) == (11, 13)
+    assert text[describe.start_offset:describe.end_offset] == describe.source_code
@@ -0,0 +1,110 @@
+"""
+Tests for the repository scanner.
+"""
+
+import pytest
+from pathlib import Path
+
+from code_doc_gen.config import Config
+from code_doc_gen.scanner import RepositoryScanner
+
+
+class TestRepositoryScanner:
+    """Test cases for RepositoryScanner."""
+    
+    @pytest.fixture
+    def config(self):
+        """Create a test configuration."""
+        return Config()
+    
+    @pytest.fixture
+    def scanner(self, config):
+        """Create a test scanner."""
+        return RepositoryScanner(config)
+    
+    @pytest.fixture
+    def python_files(self, tmp_path):
+        """Create a few small Python files."""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"module_{i}.py"
+            path.write_text(f"def func_{i}(value: int) -> int:\n    return value + {i}\n")
+            paths.append(path)
+        return paths
+    
+    def test_parse_files_parallel_preserves_input_order(self, scanner, python_files):
+        """Results are keyed by path in the order the paths were given."""
+        results = scanner.parse_files_parallel(python_files, "python", max_workers=2)
+        
+        assert list(results.keys()) == python_files
+        for i, path in enumerate(python_files):
+            assert [f.name for f in results[path]] == [f"func_{i}"]
+    
+    def test_iter_parse_files_parallel_streams_every_file(self, scanner, python_files):
+        """Streaming yields each file exactly once and accepts any iterable."""
+        streamed = dict(scanner.iter_parse_files_parallel(iter(python_files), "python", max_workers=2, chunksize=2))
+        
+        assert set(streamed) == set(python_files)
+        assert all(len(functions) == 1 for functions in streamed.values())
+    
+    def test_iter_parse_files_parallel_empty(self, scanner):
+        """An empty file list does not start a pool."""
+        assert list(scanner.iter_parse_files_parallel([])) == []
+    
+    @pytest.fixture
+    def source_tree(self, tmp_path):
+        """Create a small tree with ignored directories and a symlinked directory."""
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "src" / "pkg" / "core.py").write_text("def core():\n    pass\n")
+        (tmp_path / "src" / "App.java").write_text("class App {}\n")
+        (tmp_path / "src" / "notes.txt").write_text("not code\n")
+        (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+        (tmp_path / "node_modules" / "lib" / "index.js").write_text("function f() {}\n")
+        (tmp_path / "outside").mkdir()
+        (tmp_path / "outside" / "linked.py").write_text("def linked():\n    pass\n")
+        (tmp_path / "src" / "link").symlink_to(tmp_path / "outside", target_is_directory=True)
+        return tmp_path
+    
+    def test_iter_repository_is_lazy(self, scanner, source_tree):
+        """Discovery returns an iterator and yields paths one at a time."""
+        discovered = scanner.iter_repository(source_tree / "src")
+        
+        assert iter(discovered) is discovered
+        assert isinstance(next(discovered), Path)
+    
+    def test_iter_repository_filters_and_prunes(self, scanner, source_tree):
+        """Only parseable files are yielded; ignored and symlinked directories are skipped."""
+        found = {p.relative_to(source_tree).as_posix() for p in scanner.iter_repository(source_tree)}
+        
+        assert "src/pkg/core.py" in found
+        assert "src/App.java" in found
+        assert "outside/linked.py" in found
+        assert "src/notes.txt" not in found
+        assert "src/link/linked.py" not in found
+        assert not any(p.startswith("node_modules") for p in found)
+    
+    def test_iter_repository_language_filter(self, scanner, source_tree):
+        """A language restricts discovery to that language's extensions."""
+        found = list(scanner.iter_repository(source_tree / "src", "java"))
+        
+        assert [p.name for p in found] == ["App.java"]
+    
+    def test_scan_repository_wraps_iter_repository(self, scanner, source_tree):
+        """scan_repository returns the same paths as the streaming walk."""
+        assert scanner.scan_repository(source_tree) == list(scanner.iter_repository(source_tree))
+    
+    def test_iter_repository_missing_path(self, scanner, tmp_path):
+        """A missing repository path raises once iteration starts."""
+        with pytest.raises(ValueError):
+            list(scanner.iter_repository(tmp_path / "missing"))
+    
+    def test_language_dispatch_uses_configured_extensions(self, scanner, config):
+        """Parser and language come from one suffix lookup built from the config."""
+        language, parser = scanner.parser_factory.resolve(Path("Service.JAVA"))
+        
+        assert language == "java"
+        assert parser is scanner.parser_factory.get_parser("java")
+        assert scanner._detect_language_from_file(Path("component.tsx")) == "javascript"
+        assert set(scanner.parser_factory.get_suffixes("python")) == set(config.get_file_extensions("python"))
+        with pytest.raises(ValueError):
+            scanner.parser_factory.get_parser_for_file(Path("notes.txt"))
@@ -0,0 +1,108 @@
+"""
+Tests for compiled documentation templates.
+"""
+
+import pytest
+
+from code_doc_gen.config import Config
+from code_doc_gen.generator import DocumentationGenerator
+from code_doc_gen.models import Function, Parameter, FunctionException
+from code_doc_gen.templates import compile_template, TemplateRenderers
+
+
+class TestTemplates:
+    """Test cases for compile_template, TemplateRenderers and template validation."""
+
+    @pytest.mark.parametrize("template", [
+        " * \\param {name} {description}",
+        '"""\n    {description}\n"""',
+        "{{literal}} {name}: {description!r:>12}",
+        "{name[0]}{description.upper}",
+        "{description:>{name}}",
+        "no fields at all",
+        "",
+    ])
+    def test_renders_like_str_format(self, template):
+        """Compiled templates render exactly what str.format renders."""
+        render = compile_template(template, "param")
+        values = {"name": "30", "description": "Number of 'items'"}
+        assert render(**values) == template.format(**values)
+
+    @pytest.mark.parametrize("template, message", [
+        ("{description} {nmae}", "Unknown field {nmae}"),
+        ("{0}", "Unknown field {0}"),
+        ("{nmae[0]}", "Unknown field {nmae\\[0\\]}"),
+        ("{description", "Invalid"),
+        ("{description:{width}}", "Unknown field {width}"),
+        ("{description:Q}", "Invalid"),
+    ])
+    def test_invalid_templates_are_rejected(self, template, message):
+        """Unknown fields and malformed format strings are reported when compiling."""
+        with pytest.raises(ValueError, match=message):
+            compile_template(template, "brief")
+
+    def test_configured_templates_fall_back_per_type(self):
+        """Languages use their configured templates and the fallbacks for the rest."""
+        renderers = TemplateRenderers({
+            "python": {"brief": "# {description}", "raises": "    !{exception}: {description}"},
+            "rust": {"brief": "/// {description}"},
+        })
+
+        assert renderers.get("python", "brief")(description="Adds") == "# Adds"
+        assert renderers.get("python", "throws")(exception="E", description="d") == "    !E: d"
+        assert renderers.get("python", "return")(description="x") == "    :return: x"
+        assert renderers.get("rust", "brief")(description="Adds") == "/// Adds"
+        assert renderers.get("rust", "param")(name="a", description="d") == " * @param a d"
+        assert renderers.get("go", "brief")(description="Adds") == "/** Adds */"
+        assert renderers.get("javascript", "return")(description="x") == " * @returns x"
+
+    def test_invalid_config_template_fails_at_load(self, tmp_path):
+        """Loading a configuration file with an invalid template raises, naming the template."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "templates:\n"
+            "  java:\n"
+            "    param: ' * @param {name} {descripton}'\n"
+            "file_extensions:\n"
+            "  java: ['.jav']\n"
+        )
+
+        with pytest.raises(ValueError, match=r"config\.yaml: java: Unknown field \{descripton\} in param template"):
+            Config(config_path)
+
+    def test_valid_config_templates_are_loaded_with_the_rest(self, tmp_path):
+        """A configuration file with valid templates is applied in full."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "templates:\n"
+            "  java:\n"
+            "    param: ' * @param {name} {description}.'\n"
+            "file_extensions:\n"
+            "  java: ['.jav']\n"
+        )
+
+        config = Config(config_path)
+
+        assert config.get_template("java", "param") == " * @param {name} {description}."
+        assert config.get_file_extensions("java") == [".jav"]
+
+    def test_generator_uses_configured_templates(self):
+        """Every template type the generator renders comes from the configuration."""
+        config = Config()
+        java = config.config["templates"]["java"]
+        java["brief"] = "// {description}"
+        java["param"] = " * @arg {name} {description}"
+        java["return"] = " * @yields {description}"
+        java["throws"] = " * @fails {exception} {description}"
+        java["detailed"] = "/** {description}\n{params}\n{returns}\n{throws} */"
+        generator = DocumentationGenerator(config)
+        function = Function(
+            name="load", parameters=[Parameter(name="path", type="String", description="File")],
+            return_type="int", brief_description="Loads a file",
+            exceptions=[FunctionException(name="IOException", description="On failure")]
+        )
+
+        assert generator._generate_brief_documentation(function, "java") == "// Loads a file"
+        assert generator._generate_detailed_documentation(function, "java") == (
+            "/** Loads a file\n * @arg path File\n * @yields Integer value\n * @fails IOException On failure */"
+        )
@@ -0,0 +1,108 @@
+"""
+Tests for the transactional in-place writer.
+"""
+
+import os
+import pytest
+
+from code_doc_gen.config import Config
+from code_doc_gen.writer import TransactionalWriter, rollback_last_run, journal_directory, TEMP_SUFFIX
+
+
+class TestTransactionalWriter:
+    """Test cases for TransactionalWriter and rollback_last_run."""
+
+    @pytest.fixture
+    def config(self):
+        """Create a test configuration."""
+        return Config()
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Create a repository with a few undocumented files."""
+        (tmp_path / "pkg").mkdir()
+        for i in range(5):
+            (tmp_path / "pkg" / f"mod_{i}.py").write_text(f"def func_{i}(x):\n    return x + {i}\n")
+        return tmp_path
+
+    def _stage_all(self, writer, repo):
+        for i in range(5):
+            writer.stage(repo / "pkg" / f"mod_{i}.py", {f"func_{i}": f'"""Adds {i}."""'}, "python")
+
+    def _temp_files(self, repo):
+        return list(repo.rglob(f"*{TEMP_SUFFIX}"))
+
+    def test_commit_writes_all_files_without_backups(self, config, repo):
+        """Every staged file is replaced, with no .bak or temporary files left behind."""
+        writer = TransactionalWriter(config, repo, jobs=3)
+        self._stage_all(writer, repo)
+
+        written = writer.commit()
+
+        assert sorted(p.name for p in written) == [f"mod_{i}.py" for i in range(5)]
+        for i in range(5):
+            assert f'"""Adds {i}."""' in (repo / "pkg" / f"mod_{i}.py").read_text()
+        assert not list(repo.rglob("*.bak"))
+        assert not self._temp_files(repo)
+        assert writer.stats['written'] == 5
+        assert writer.stats['bytes'] > 0
+        assert writer.throughput()['files_per_second'] > 0
+        assert writer.journal_path.exists()
+
+    def test_files_are_untouched_until_commit(self, config, repo):
+        """Staging only writes temporary files; abort discards them."""
+        original = (repo / "pkg" / "mod_0.py").read_text()
+        writer = TransactionalWriter(config, repo)
+        self._stage_all(writer, repo)
+        for future in writer._futures:
+            future.result()
+
+        assert (repo / "pkg" / "mod_0.py").read_text() == original
+        writer.abort()
+        assert (repo / "pkg" / "mod_0.py").read_text() == original
+        assert not self._temp_files(repo)
+        assert not list(journal_directory(config, repo).iterdir())
+
+    def test_rollback_restores_last_run(self, config, repo):
+        """Rollback restores the originals of the last run, except files edited since."""
+        originals = {p: p.read_bytes() for p in (repo / "pkg").iterdir()}
+        writer = TransactionalWriter(config, repo)
+        self._stage_all(writer, repo)
+        writer.commit()
+        (repo / "pkg" / "mod_4.py").write_text("def edited():\n    pass\n")
+
+        restored = rollback_last_run(config, repo)
+
+        assert len(restored) == 4
+        for path, content in originals.items():
+            if path.name != "mod_4.py":
+                assert path.read_bytes() == content
+        assert (repo / "pkg" / "mod_4.py").read_text() == "def edited():\n    pass\n"
+        with pytest.raises(FileNotFoundError):
+            rollback_last_run(config, repo)
+
+    def test_file_changed_during_run_is_skipped(self, config, repo):
+        """A file modified after it was staged is not overwritten."""
+        writer = TransactionalWriter(config, repo, jobs=1)
+        self._stage_all(writer, repo)
+        for future in writer._futures:
+            future.result()
+        target = repo / "pkg" / "mod_2.py"
+        target.write_text("def func_2(x):\n    return x\n")
+        os.utime(target, ns=(1, 1))
+
+        written = writer.commit()
+
+        assert target not in written
+        assert target.read_text() == "def func_2(x):\n    return x\n"
+        assert writer.stats['conflicts'] == 1
+        assert not self._temp_files(repo)
+
+    def test_journal_can_be_disabled(self, config, repo):
+        """Without a journal nothing is recorded."""
+        writer = TransactionalWriter(config, repo, journal=False)
+        self._stage_all(writer, repo)
+        writer.commit()
+
+        assert writer.journal_path is None
+        assert not journal_directory(config, repo).exists()